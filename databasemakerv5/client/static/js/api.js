@@ -127,14 +127,29 @@ const API = {
      * Get options data for a symbol
      * @param {string} symbol - Stock symbol
      * @param {boolean} requireGreeks - Whether to include Greeks values
+     * @param {Object} filters - Optional server-side filters (expiration, expiration_from, expiration_to,
+     *     strike_min, strike_max, moneyness_min, moneyness_max, contract_type, min_volume,
+     *     min_open_interest, delta_min, delta_max)
      * @returns {Promise<Object[]>} - Promise resolving to options data
      */
-    async getOptionsData(symbol, requireGreeks = false) {
+    async getOptionsData(symbol, requireGreeks = false, filters = {}) {
         return this.get(`/api/options/${symbol}`, {
-            require_greeks: requireGreeks
+            require_greeks: requireGreeks,
+            ...filters
         });
     },
 
+    /**
+     * Get the implied volatility surface of a symbol on a fixed grid
+     * @param {string} symbol - Stock symbol
+     * @param {Object} options - Optional grid settings (moneyness_points, tenor_points,
+     *     moneyness_min, moneyness_max, stock_price)
+     * @returns {Promise<Object>} - Promise resolving to axes and an IV grid (one row per tenor)
+     */
+    async getVolatilitySurface(symbol, options = {}) {
+        return this.get(`/api/options/${symbol}/surface`, options);
+    },
+
     /**
      * Get options suggestions from database
      * @param {string} symbol - Stock symbol
@@ -162,14 +177,16 @@ const API = {
      * @param {string[]} indicators - Indicator names
      * @param {string} startDate - Start date in YYYY-MM-DD format
      * @param {string} endDate - End date in YYYY-MM-DD format
+     * @param {boolean} cluster - Whether to order the matrix by hierarchical clustering
      * @returns {Promise<Object>} - Promise resolving to correlation data
      */
-    async getCorrelation(stocks, indicators, startDate, endDate) {
+    async getCorrelation(stocks, indicators, startDate, endDate, cluster = false) {
         return this.get('/api/correlation', {
             stocks: stocks,
             indicators: indicators,
             start_date: startDate,
-            end_date: endDate
+            end_date: endDate,
+            cluster: cluster
         });
     },
 
@@ -132,9 +132,10 @@ const CorrelationView = {
         document.getElementById('correlation-matrix').innerHTML =
             '<p class="text-center"><i class="bi bi-hourglass-split"></i> Calculating correlation...</p>';
 
-        API.getCorrelation(stocks, indicators, startDate, endDate)
+        // Cluster on the server so related series are adjacent in the heatmap
+        API.getCorrelation(stocks, indicators, startDate, endDate, true)
             .then(data => {
-                // Render correlation matrix
+                // Render correlation matrix (already in cluster order)
                 this.renderCorrelationMatrix(data);
             })
             .catch(error => {
@@ -189,10 +190,13 @@ const CorrelationView = {
             // Add cells with correlation values
             data.matrix[rowIndex].forEach((value, colIndex) => {
                 const td = document.createElement('td');
-                td.textContent = value.toFixed(2);
+                // null: too few overlapping observations for a correlation
+                td.textContent = value === null ? '–' : value.toFixed(2);
 
                 // Color coding for correlation strength
-                if (rowIndex !== colIndex) { // Skip self-correlation (diagonal)
+                if (value === null) {
+                    td.className = 'text-muted';
+                } else if (rowIndex !== colIndex) { // Skip self-correlation (diagonal)
                     const absValue = Math.abs(value);
                     if (absValue >= 0.7) {
                         td.className = value > 0 ? 'bg-success text-white' : 'bg-danger text-white';
@@ -0,0 +1,42 @@
+# server/api/routes/backtest.py
+from fastapi import APIRouter, HTTPException, Depends, Body
+from typing import List, Optional
+from pydantic import BaseModel
+from server.services.backtest_service import BacktestService
+from server.models.response_models import BacktestResponse
+
+router = APIRouter(prefix="/api/backtest", tags=["backtest"])
+
+
+class BacktestRequest(BaseModel):
+    """Request model for a rule backtest"""
+    entry: str
+    exit: Optional[str] = None
+    symbols: List[str]
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    cost_bps: float = 0.0
+    refresh: bool = False
+
+
+@router.post("", response_model=BacktestResponse)
+async def run_backtest(
+        request: BacktestRequest = Body(...),
+        backtest_service: BacktestService = Depends()
+):
+    """
+    Backtest a long/flat rule over stored daily bars
+
+    Rules use the screener expression syntax, e.g. entry
+    "SMA(50) crosses_above SMA(200)" with exit "SMA(50) crosses_below SMA(200)",
+    or a single threshold condition such as "RSI(14) < 30".
+    """
+    try:
+        return await backtest_service.run_backtest(
+            request.entry, request.symbols, request.exit,
+            request.start_date, request.end_date, request.cost_bps, request.refresh
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,17 +1,49 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Body
 from typing import List, Optional
+from pydantic import BaseModel
 from server.services.correlation_service import CorrelationService
-from server.models.response_models import CorrelationResponse
+from server.models.response_models import (CorrelationResponse, RollingCorrelationResponse, CorrelationPairsResponse,
+                                           CorrelationViewResponse, CorrelationViewSummary, LeadLagResponse)
 
 router = APIRouter(prefix="/api/correlation", tags=["correlation"])
 
 
+class CorrelationPairsRequest(BaseModel):
+    """Request model for large-universe correlation analysis"""
+    stocks: Optional[List[str]] = None
+    indicators: Optional[List[str]] = None
+    frequency: str = "daily"
+    top_k: int = 5
+    threshold: Optional[float] = None
+    max_pairs: int = 1000
+    min_periods: int = 20
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+
+
+class CorrelationViewRequest(BaseModel):
+    """Request model for creating a named correlation view"""
+    name: str
+    stocks: Optional[List[str]] = None
+    indicators: Optional[List[str]] = None
+    frequency: str = "monthly"
+    transform: str = "level"
+    start_date: Optional[str] = None
+    overwrite: bool = False
+
+
 @router.get("", response_model=CorrelationResponse)
 async def get_correlation(
         stocks: List[str] = Query(None),
         indicators: List[str] = Query(None),
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
+        method: str = Query("pearson", regex="^(pearson|spearman|kendall)$"),
+        transform: str = Query("level", regex="^(level|pct_change|log_return)$",
+                               description="Correlate price levels, percent changes or log returns"),
+        frequency: str = Query("monthly", regex="^(daily|weekly|monthly)$"),
+        cluster: bool = Query(False, description="Order the matrix by hierarchical clustering"),
+        linkage: str = Query("average", regex="^(average|complete|single)$"),
         correlation_service: CorrelationService = Depends()
 ):
     """
@@ -22,10 +54,174 @@ async def get_correlation(
             raise ValueError("At least one stock or indicator must be specified")
 
         corr_data = await correlation_service.calculate_correlation(
-            stocks, indicators, start_date, end_date
+            stocks, indicators, start_date, end_date, method, transform, frequency, cluster, linkage
         )
         return corr_data
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/rolling", response_model=RollingCorrelationResponse)
+async def get_rolling_correlation(
+        window: int = Query(..., ge=2, description="Window length in periods of the chosen frequency"),
+        stocks: List[str] = Query(None),
+        indicators: List[str] = Query(None),
+        frequency: str = Query("monthly", regex="^(daily|weekly|monthly)$"),
+        pairs: List[str] = Query(None, description="Pairs to return instead of full matrices, e.g. AAPL:CPI"),
+        max_points: int = Query(250, ge=1, le=2000, description="Maximum number of windows returned"),
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        correlation_service: CorrelationService = Depends()
+):
+    """
+    Get a time series of rolling correlation matrices (or selected pairs)
+    """
+    try:
+        return await correlation_service.calculate_rolling_correlation(
+            stocks, indicators, window, frequency, pairs, start_date, end_date, max_points
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/pairs", response_model=CorrelationPairsResponse)
+async def get_correlation_pairs(
+        stocks: List[str] = Query(None),
+        indicators: List[str] = Query(None),
+        frequency: str = Query("daily", regex="^(daily|weekly|monthly)$"),
+        top_k: int = Query(5, ge=1, le=100, description="Most and least correlated partners per series"),
+        threshold: Optional[float] = Query(None, ge=0, le=1, description="Return all pairs with |r| >= threshold"),
+        max_pairs: int = Query(1000, ge=1, le=100000),
+        min_periods: int = Query(20, ge=3),
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        correlation_service: CorrelationService = Depends()
+):
+    """
+    Get the most and least correlated partners of every series, or all pairs above a threshold
+    """
+    try:
+        return await correlation_service.calculate_correlation_pairs(
+            stocks, indicators, frequency, top_k, threshold, max_pairs, min_periods, start_date, end_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/pairs", response_model=CorrelationPairsResponse)
+async def get_correlation_pairs_for_universe(
+        request: CorrelationPairsRequest = Body(...),
+        correlation_service: CorrelationService = Depends()
+):
+    """
+    Same as GET /pairs, for universes too large for a query string
+    """
+    try:
+        if request.frequency not in ("daily", "weekly", "monthly"):
+            raise ValueError("frequency must be daily, weekly or monthly")
+        if request.threshold is not None and not 0 <= request.threshold <= 1:
+            raise ValueError("threshold must be between 0 and 1")
+        return await correlation_service.calculate_correlation_pairs(
+            request.stocks, request.indicators, request.frequency, request.top_k, request.threshold,
+            request.max_pairs, request.min_periods, request.start_date, request.end_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/leadlag", response_model=LeadLagResponse)
+async def get_lead_lag(
+        stocks: List[str] = Query(...),
+        indicators: List[str] = Query(None, description="Defaults to all economic indicators"),
+        max_lag: int = Query(12, ge=1, le=120, description="Largest lead or lag in periods of the frequency"),
+        frequency: str = Query("monthly", regex="^(daily|weekly|monthly)$"),
+        transform: str = Query("pct_change", regex="^(level|pct_change|log_return)$"),
+        include_curve: bool = Query(False, description="Return the correlation at every lag"),
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        correlation_service: CorrelationService = Depends()
+):
+    """
+    Get the lag at which each indicator is most correlated with each stock
+    """
+    try:
+        return await correlation_service.calculate_lead_lag(
+            stocks, indicators, max_lag, frequency, transform, include_curve, start_date, end_date
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/views", response_model=CorrelationViewResponse)
+async def create_correlation_view(
+        request: CorrelationViewRequest = Body(...),
+        correlation_service: CorrelationService = Depends()
+):
+    """
+    Create a named correlation view whose statistics are maintained incrementally
+    """
+    try:
+        return await correlation_service.create_view(
+            request.name, request.stocks, request.indicators, request.frequency,
+            request.transform, request.start_date, request.overwrite
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/views", response_model=List[CorrelationViewSummary])
+async def list_correlation_views(correlation_service: CorrelationService = Depends()):
+    """
+    List stored correlation views
+    """
+    try:
+        return correlation_service.list_views()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/views/{name}", response_model=CorrelationViewResponse)
+async def get_correlation_view(
+        name: str,
+        refresh: bool = Query(True, description="Add periods completed since the last update first"),
+        correlation_service: CorrelationService = Depends()
+):
+    """
+    Get the correlation matrix of a stored view
+    """
+    try:
+        return await correlation_service.get_view(name, refresh)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/views/{name}")
+async def delete_correlation_view(name: str, correlation_service: CorrelationService = Depends()):
+    """
+    Delete a stored correlation view
+    """
+    try:
+        correlation_service.delete_view(name)
+        return {"deleted": name}
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,10 +1,45 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
 from server.services.indicators_service import IndicatorsService
-from server.models.response_models import IndicatorDataResponse
+from server.models.response_models import IndicatorDataResponse, YieldCurveResponse, IndicatorPanelResponse
 
 router = APIRouter(prefix="/api/indicator", tags=["indicators"])
 
+# Fixed paths are declared before /{indicator_name} so they are not captured by it
+@router.get("/yield-curve", response_model=YieldCurveResponse)
+async def get_yield_curve(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    indicators_service: IndicatorsService = Depends()
+):
+    """
+    Get treasury yields for all maturities on a common date index, with 2s10s and 3m10y spreads
+    """
+    try:
+        return await indicators_service.get_yield_curve(start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/panel", response_model=IndicatorPanelResponse)
+async def get_indicator_panel(
+    names: List[str] = Query(..., description="Indicator names, e.g. CPI or Treasury Yield:2year"),
+    freq: str = Query("M", regex="^(D|W|M|Q|A)$", description="Calendar frequency (period-end dates)"),
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    indicators_service: IndicatorsService = Depends()
+):
+    """
+    Get several indicators aligned on a common calendar with as-of (forward-fill) semantics
+    """
+    try:
+        return await indicators_service.get_panel(names, freq, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{indicator_name}", response_model=List[IndicatorDataResponse])
 async def get_indicator_data(
     indicator_name: str,
@@ -1,21 +1,145 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Depends, BackgroundTasks
+from typing import List, Optional
+from pydantic import BaseModel
 from server.services.options_service import OptionsService
-from server.models.response_models import OptionsContractResponse
+from server.models.response_models import (OptionsContractResponse, OptionsAnalyticsResponse,
+                                           OptionsVolatilityHistoryResponse, OptionsBackfillResponse,
+                                           VolatilitySurfaceResponse)
 
 router = APIRouter(prefix="/api/options", tags=["options"])
 
+
+class OptionsBackfillRequest(BaseModel):
+    """Request model for backfilling end-of-day options chains"""
+    symbols: List[str]
+    start_date: str
+    end_date: Optional[str] = None
+
+
+@router.post("/backfill", response_model=OptionsBackfillResponse)
+async def backfill_options_history(
+    request: OptionsBackfillRequest,
+    background_tasks: BackgroundTasks,
+    options_service: OptionsService = Depends()
+):
+    """
+    Start backfilling end-of-day options chains for symbols over a date range
+
+    Days already stored are skipped, so the same request resumes an interrupted
+    backfill.
+    """
+    try:
+        store = options_service.history_store
+        symbols = [symbol.upper() for symbol in request.symbols]
+        days = store.trading_days(request.start_date, request.end_date)
+        pending = {symbol: len(store.pending_dates(symbol, request.start_date, request.end_date))
+                   for symbol in symbols}
+        background_tasks.add_task(store.backfill, symbols, request.start_date, request.end_date)
+        return {
+            "symbols": symbols,
+            "start_date": request.start_date,
+            "end_date": request.end_date,
+            "trading_days": len(days),
+            "pending": pending
+        }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/{symbol}", response_model=List[OptionsContractResponse])
 async def get_options_data(
     symbol: str,
     require_greeks: bool = False,
+    compute_greeks: bool = Query(True, description="Fill missing implied volatility and Greeks locally"),
+    expiration: Optional[List[str]] = Query(None, description="Expiration dates (YYYY-MM-DD) to include"),
+    expiration_from: Optional[str] = Query(None, description="First expiration date (YYYY-MM-DD)"),
+    expiration_to: Optional[str] = Query(None, description="Last expiration date (YYYY-MM-DD)"),
+    strike_min: Optional[float] = None,
+    strike_max: Optional[float] = None,
+    moneyness_min: Optional[float] = Query(None, gt=0, description="Lowest strike / underlying price"),
+    moneyness_max: Optional[float] = Query(None, gt=0, description="Highest strike / underlying price"),
+    contract_type: Optional[str] = Query(None, regex="^(call|put)$"),
+    min_volume: int = Query(0, ge=0),
+    min_open_interest: int = Query(0, ge=0),
+    delta_min: Optional[float] = Query(None, ge=-1, le=1),
+    delta_max: Optional[float] = Query(None, ge=-1, le=1),
+    options_service: OptionsService = Depends()
+):
+    """
+    Get options chain data for a given symbol, optionally filtered by expiration,
+    strike or moneyness, type, liquidity and delta
+    """
+    try:
+        filters = (expiration, expiration_from, expiration_to, strike_min, strike_max, moneyness_min,
+                   moneyness_max, contract_type, delta_min, delta_max)
+        if all(f is None for f in filters) and not min_volume and not min_open_interest:
+            return await options_service.get_options_data(symbol, require_greeks, compute_greeks)
+
+        return await options_service.query_options_data(
+            symbol, require_greeks, compute_greeks, expiration, expiration_from, expiration_to, strike_min, strike_max,
+            moneyness_min, moneyness_max, contract_type, min_volume, min_open_interest, delta_min, delta_max
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get("/{symbol}/analytics", response_model=OptionsAnalyticsResponse)
+async def get_options_analytics(
+    symbol: str,
+    expiration: Optional[str] = Query(None, description="Expiration date (YYYY-MM-DD); nearest if omitted"),
+    stock_price: Optional[float] = Query(None, gt=0, description="Underlying price; latest close if omitted"),
+    rate: float = Query(0.05, description="Risk-free rate for parity checks"),
+    dividend_yield: float = Query(0.0, description="Dividend yield for parity checks"),
+    options_service: OptionsService = Depends()
+):
+    """
+    Get max pain, volatility skew, put/call ratios, covered call and cash-secured put
+    rankings and put-call parity checks for one expiration
+    """
+    try:
+        return await options_service.get_options_analytics(symbol, expiration, stock_price, rate, dividend_yield)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{symbol}/history", response_model=OptionsVolatilityHistoryResponse)
+async def get_volatility_history(
+    symbol: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    min_days: int = Query(7, ge=0, description="Track the nearest expiration at least this many days out"),
+    options_service: OptionsService = Depends()
+):
+    """
+    Get daily ATM implied volatility, skew and put/call ratios from backfilled chains
+    """
+    try:
+        return await options_service.get_volatility_history(symbol, start_date, end_date, min_days)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/{symbol}/surface", response_model=VolatilitySurfaceResponse)
+async def get_volatility_surface(
+    symbol: str,
+    moneyness_points: int = Query(25, ge=2, le=200),
+    tenor_points: int = Query(20, ge=2, le=200),
+    moneyness_min: float = Query(0.7, gt=0),
+    moneyness_max: float = Query(1.3, gt=0),
+    stock_price: Optional[float] = Query(None, gt=0, description="Underlying price; latest close if omitted"),
     options_service: OptionsService = Depends()
 ):
     """
-    Get options chain data for a given symbol
+    Get the implied volatility surface over moneyness and time to expiry on a fixed grid
     """
+    if moneyness_min >= moneyness_max:
+        raise HTTPException(status_code=400, detail="moneyness_min must be below moneyness_max")
     try:
-        options_data = await options_service.get_options_data(symbol, require_greeks)
-        return options_data
+        return await options_service.get_volatility_surface(symbol, moneyness_points, tenor_points,
+                                                            moneyness_min, moneyness_max, stock_price)
     except ValueError as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
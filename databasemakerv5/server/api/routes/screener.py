@@ -0,0 +1,62 @@
+# server/api/routes/screener.py
+from fastapi import APIRouter, HTTPException, Query, Depends, Body
+from typing import List, Optional
+from pydantic import BaseModel
+from server.services.screener_service import ScreenerService
+from server.models.response_models import ScreenerResponse
+
+router = APIRouter(prefix="/api/screener", tags=["screener"])
+
+
+class ScreenerRequest(BaseModel):
+    """Request model for screening a large universe"""
+    expression: str
+    symbols: Optional[List[str]] = None
+    sort_by: Optional[str] = None
+    ascending: Optional[bool] = None
+    limit: int = 50
+    refresh: bool = False
+
+
+@router.get("", response_model=ScreenerResponse)
+async def run_screen(
+        expression: str = Query(..., description="Condition, e.g. RSI(14) < 30 and close > SMA(200)"),
+        symbols: List[str] = Query(None, description="Symbols to screen (defaults to all locally stored symbols)"),
+        sort_by: Optional[str] = Query(None, description="Term to rank matches by, e.g. RSI(14)"),
+        ascending: Optional[bool] = None,
+        limit: int = Query(50, ge=1, le=5000),
+        refresh: bool = Query(False, description="Fetch missing or stale bars before screening"),
+        screener_service: ScreenerService = Depends()
+):
+    """
+    Screen a universe of symbols against a technical condition
+
+    Supported terms: open, high, low, close, adjusted_close, volume, SMA, EMA,
+    WMA, RSI, MACD(.macd/.signal/.hist), BBANDS(.upper/.middle/.lower), ATR,
+    ROC, MOM, WILLR, STOCH(.k/.d), OBV
+    """
+    try:
+        return await screener_service.screen(expression, symbols, sort_by, ascending, limit, refresh)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("", response_model=ScreenerResponse)
+async def run_screen_for_universe(
+        request: ScreenerRequest = Body(...),
+        screener_service: ScreenerService = Depends()
+):
+    """
+    Screen a universe passed in the request body (for universes too large for a query string)
+    """
+    try:
+        return await screener_service.screen(
+            request.expression, request.symbols, request.sort_by,
+            request.ascending, request.limit, request.refresh
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -7,6 +7,16 @@ from server.models.response_models import IndicatorDataResponse
 router = APIRouter(prefix="/api/technical", tags=["technical_indicators"])
 
 
+@router.get("/cache/stats", response_model=Dict[str, Any])
+async def get_indicator_cache_stats(
+        technical_indicators_service: TechnicalIndicatorsService = Depends()
+):
+    """
+    Get hit ratio and memory usage of the indicator result cache
+    """
+    return await technical_indicators_service.get_cache_stats()
+
+
 @router.get("/{symbol}/{indicator}", response_model=List[IndicatorDataResponse])
 async def get_technical_indicator(
         symbol: str,
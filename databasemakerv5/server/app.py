@@ -5,16 +5,40 @@ from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 import uvicorn
 import os
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
 from server.services.openai_options import router as openai_options_router
-from server.api.routes import stocks, indicators, options, correlation, transcripts, settings, binance, ibkr
+from server.api.routes import stocks, indicators, options, correlation, transcripts, settings, binance, ibkr, screener, backtest
 from server.config.settings import get_settings
+from server.database.client import connect_mongo, close_mongo
+from server.database.migrations import run_migrations, apply_retention
+from server.database.write_behind import get_write_behind
+from server.utils.parallel import shutdown_process_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Connect the shared MongoDB client, apply pending migrations and start
+    background workers; on shutdown flush queued writes and stop them
+    """
+    write_behind = get_write_behind()
+    db = await connect_mongo()
+    if db is not None:
+        await run_migrations(db)
+        await apply_retention(db)
+        await write_behind.start(db)
+    yield
+    await write_behind.stop()
+    await close_mongo()
+    shutdown_process_pool()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Financial Intelligence Hub API",
     description="API for financial market data analysis",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Define API key response model
@@ -43,6 +67,8 @@ app.include_router(settings.router)
 app.include_router(openai_options_router)
 app.include_router(binance.router)  # Add the new Binance router
 app.include_router(ibkr.router)  # Added IBKR router
+app.include_router(screener.router)
+app.include_router(backtest.router)
 
 
 
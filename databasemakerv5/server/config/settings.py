@@ -19,6 +19,17 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = Field(..., env="OPENAI_API_KEY")
     MONGODB_PASSWORD: str = Field(..., env="MONGODB_PASSWORD")
 
+    # MongoDB settings: connection pool of the shared MongoDB client
+    MONGODB_MAX_POOL_SIZE: int = Field(50, env="MONGODB_MAX_POOL_SIZE")
+    MONGODB_MIN_POOL_SIZE: int = Field(2, env="MONGODB_MIN_POOL_SIZE")
+    MONGODB_MAX_IDLE_MS: int = Field(300000, env="MONGODB_MAX_IDLE_MS")
+    # Server selection and connect timeout, so an unreachable server fails fast
+    MONGODB_TIMEOUT_MS: int = Field(5000, env="MONGODB_TIMEOUT_MS")
+    # Retention of the time-series collections in days (0 = keep forever)
+    TIMESERIES_DAILY_TTL_DAYS: int = Field(0, env="TIMESERIES_DAILY_TTL_DAYS")
+    TIMESERIES_INTRADAY_TTL_DAYS: int = Field(90, env="TIMESERIES_INTRADAY_TTL_DAYS")
+    TIMESERIES_ACCOUNT_TTL_DAYS: int = Field(0, env="TIMESERIES_ACCOUNT_TTL_DAYS")
+
     # IBKR API Settings
     IBKR_API_KEY: str = Field("", env="IBKR_API_KEY")
     IBKR_API_URL: str = Field("https://api.ibkr.com/v1/api", env="IBKR_API_URL")
@@ -29,6 +40,42 @@ class Settings(BaseSettings):
     TWS_PORT: int = Field(7496, env="TWS_PORT")
     TWS_CLIENT_ID: int = Field(1, env="TWS_CLIENT_ID")
 
+    # Local data store settings
+    DATA_DIR: str = Field("data", env="DATA_DIR")
+    BAR_STORE_MAX_AGE_MINUTES: int = Field(360, env="BAR_STORE_MAX_AGE_MINUTES")
+    # Once a new macro release is due, how often to check for it, and the age after
+    # which a series is re-downloaded regardless (to pick up revisions)
+    MACRO_RECHECK_MINUTES: int = Field(360, env="MACRO_RECHECK_MINUTES")
+    MACRO_STORE_MAX_AGE_DAYS: int = Field(30, env="MACRO_STORE_MAX_AGE_DAYS")
+    # Options snapshots store the full chain every N captures and only changed contracts in between
+    OPTIONS_KEYFRAME_INTERVAL: int = Field(24, env="OPTIONS_KEYFRAME_INTERVAL")
+    # Memory budget for the contract hashes each capture is diffed against
+    OPTIONS_DIFF_CACHE_MAX_MB: int = Field(16, env="OPTIONS_DIFF_CACHE_MAX_MB")
+    # Memory budget for the latest stored timestamp of each bars/indicator time series
+    SERIES_LATEST_CACHE_MAX_MB: int = Field(4, env="SERIES_LATEST_CACHE_MAX_MB")
+
+    # Cache settings
+    INDICATOR_CACHE_MAX_MB: int = Field(64, env="INDICATOR_CACHE_MAX_MB")
+    CORRELATION_CACHE_MAX_MB: int = Field(32, env="CORRELATION_CACHE_MAX_MB")
+    MACRO_CACHE_MAX_MB: int = Field(16, env="MACRO_CACHE_MAX_MB")
+    OPTIONS_CACHE_MAX_MB: int = Field(32, env="OPTIONS_CACHE_MAX_MB")
+    # How long options quotes stay current during the regular session (outside it: until the next open)
+    OPTIONS_CHAIN_TTL_SECONDS: int = Field(60, env="OPTIONS_CHAIN_TTL_SECONDS")
+
+    # Maximum number of concurrent Alpha Vantage requests per operation
+    UPSTREAM_MAX_CONCURRENCY: int = Field(8, env="UPSTREAM_MAX_CONCURRENCY")
+    # Request budget of the Alpha Vantage key, shared by all requests (0 = unlimited)
+    ALPHA_VANTAGE_REQUESTS_PER_MINUTE: int = Field(75, env="ALPHA_VANTAGE_REQUESTS_PER_MINUTE")
+
+    # MongoDB writes queued off the request path: maximum queued writes (writers wait
+    # beyond it), writes per bulk_write, and how long to gather a batch
+    WRITE_BEHIND_MAX_PENDING: int = Field(50000, env="WRITE_BEHIND_MAX_PENDING")
+    WRITE_BEHIND_BATCH_SIZE: int = Field(1000, env="WRITE_BEHIND_BATCH_SIZE")
+    WRITE_BEHIND_FLUSH_SECONDS: float = Field(0.5, env="WRITE_BEHIND_FLUSH_SECONDS")
+
+    # Compute settings (0 = use all available cores)
+    COMPUTE_MAX_WORKERS: int = Field(0, env="COMPUTE_MAX_WORKERS")
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,76 @@
+# server/database/client.py
+from typing import Optional
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.server_api import ServerApi
+from server.config import get_settings, get_logger
+
+logger = get_logger(__name__)
+
+DATABASE_NAME = "financial_intelligence_hub"
+
+# One client per process: it owns the connection pool shared by every request
+_client: Optional[AsyncMongoClient] = None
+_available = True
+
+
+def _create_client() -> AsyncMongoClient:
+    settings = get_settings()
+    uri = "mongodb+srv://financial_intelligence_hub:<db_password>@financialintelligencehu.mqr2tur.mongodb.net/?appName=financialintelligencehub"
+    # Replace password placeholder with actual password from settings
+    uri = uri.replace("<db_password>", settings.MONGODB_PASSWORD)
+    return AsyncMongoClient(
+        uri,
+        server_api=ServerApi('1'),
+        maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGODB_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGODB_MAX_IDLE_MS,
+        serverSelectionTimeoutMS=settings.MONGODB_TIMEOUT_MS,
+        connectTimeoutMS=settings.MONGODB_TIMEOUT_MS
+    )
+
+
+async def connect_mongo() -> Optional[AsyncDatabase]:
+    """
+    Create the shared MongoDB client and check the server is reachable
+
+    Called once at app start-up. If the server can't be reached, MongoDB is
+    treated as unavailable for the life of the process and get_database
+    returns None.
+    """
+    global _client, _available
+    if _client is None:
+        _client = _create_client()
+    try:
+        await _client.admin.command('ping')
+        logger.info("Successfully connected to MongoDB!")
+        _available = True
+        return _client[DATABASE_NAME]
+    except Exception as e:
+        logger.error(f"Failed to connect to MongoDB: {e}")
+        await close_mongo()
+        _available = False
+        return None
+
+
+def get_database() -> Optional[AsyncDatabase]:
+    """
+    Get the app's MongoDB database, or None if MongoDB is unavailable
+
+    Outside the app (scripts, tests) the client is created on first use;
+    it connects lazily, so this never blocks.
+    """
+    global _client
+    if not _available:
+        return None
+    if _client is None:
+        _client = _create_client()
+    return _client[DATABASE_NAME]
+
+
+async def close_mongo() -> None:
+    """Close the shared client and its connection pool"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,134 @@
+# server/database/migrations.py
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Tuple
+from pymongo.asynchronous.database import AsyncDatabase
+from server.database.mongodb_helper import account_document, position_document
+from server.config import get_settings, get_logger
+
+logger = get_logger(__name__)
+
+
+async def _create_options_indexes(db: AsyncDatabase) -> None:
+    # Contract history, and finding the latest capture of a symbol
+    await db.options_snapshots.create_index([
+        ("symbol", 1),
+        ("expiration_date", 1),
+        ("strike_price", 1),
+        ("captured_at", -1)
+    ])
+    await db.options_snapshots.create_index([
+        ("symbol", 1),
+        ("require_greeks", 1),
+        ("captured_at", -1)
+    ])
+    await db.options_captures.create_index([
+        ("symbol", 1),
+        ("require_greeks", 1),
+        ("keyframe", 1),
+        ("captured_at", -1)
+    ])
+    await db.options_captures.create_index([
+        ("symbol", 1),
+        ("require_greeks", 1),
+        ("captured_at", -1)
+    ])
+    await db.options_suggestions.create_index([
+        ("symbol", 1),
+        ("expiration_date", 1),
+        ("created_at", -1)
+    ])
+
+
+async def _create_ibkr_indexes(db: AsyncDatabase) -> None:
+    await db.ibkr_account_summaries.create_index([("captured_at", -1)])
+    await db.ibkr_positions.create_index([("symbol", 1), ("captured_at", -1)])
+
+
+# Time-series collections: bucket granularity, retention setting (days, 0 = keep
+# forever) and the meta fields range queries filter on
+TIME_SERIES_COLLECTIONS: Dict[str, Tuple[str, str, List[str]]] = {
+    "bars_daily": ("hours", "TIMESERIES_DAILY_TTL_DAYS", ["symbol", "interval"]),
+    "bars_intraday": ("minutes", "TIMESERIES_INTRADAY_TTL_DAYS", ["symbol", "interval"]),
+    "indicators_daily": ("hours", "TIMESERIES_DAILY_TTL_DAYS", ["symbol", "interval", "indicator"]),
+    "indicators_intraday": ("minutes", "TIMESERIES_INTRADAY_TTL_DAYS", ["symbol", "interval", "indicator"]),
+    "ibkr_account_history": ("minutes", "TIMESERIES_ACCOUNT_TTL_DAYS", ["account_id"]),
+    "ibkr_position_history": ("minutes", "TIMESERIES_ACCOUNT_TTL_DAYS", ["symbol"]),
+}
+
+
+def _ttl_seconds(setting: str) -> int:
+    return getattr(get_settings(), setting) * 86400
+
+
+async def _create_time_series(db: AsyncDatabase) -> None:
+    existing = set(await db.list_collection_names())
+    for name, (granularity, ttl_setting, meta_fields) in TIME_SERIES_COLLECTIONS.items():
+        if name not in existing:
+            options = {}
+            if _ttl_seconds(ttl_setting):
+                options["expireAfterSeconds"] = _ttl_seconds(ttl_setting)
+            await db.create_collection(name, timeseries={
+                "timeField": "timestamp",
+                "metaField": "meta",
+                "granularity": granularity
+            }, **options)
+        await db[name].create_index([(f"meta.{field}", 1) for field in meta_fields] + [("timestamp", 1)])
+
+    # Move IBKR snapshots out of the plain collections they were first stored in
+    for old, new, to_document in [("ibkr_account_summaries", "ibkr_account_history", account_document),
+                                  ("ibkr_positions", "ibkr_position_history", position_document)]:
+        if old not in existing:
+            continue
+        docs = [to_document({k: v for k, v in doc.items() if k not in ("_id", "captured_at")}, doc["captured_at"])
+                async for doc in db[old].find({"captured_at": {"$exists": True}})]
+        if docs:
+            await db[new].insert_many(docs)
+        await db.drop_collection(old)
+
+
+# Applied in order, each once per database; append new steps, never edit applied ones
+MIGRATIONS: List[Tuple[str, Callable[[AsyncDatabase], Awaitable[None]]]] = [
+    ("0001_options_indexes", _create_options_indexes),
+    ("0002_ibkr_indexes", _create_ibkr_indexes),
+    ("0003_time_series", _create_time_series),
+]
+
+
+async def run_migrations(db: AsyncDatabase) -> List[str]:
+    """
+    Apply the migrations not yet recorded in the database's migrations collection
+
+    Steps must be safe to re-run (create_index is), since two processes
+    starting together may both apply one before either records it.
+
+    Returns:
+        Names of the migrations applied
+    """
+    applied = {doc["_id"] async for doc in db.migrations.find({}, {"_id": 1})}
+    ran = []
+    for name, migrate in MIGRATIONS:
+        if name in applied:
+            continue
+        logger.info(f"Applying MongoDB migration {name}")
+        await migrate(db)
+        await db.migrations.update_one({"_id": name}, {"$set": {"applied_at": datetime.now()}}, upsert=True)
+        ran.append(name)
+    return ran
+
+
+async def apply_retention(db: AsyncDatabase) -> None:
+    """
+    Bring the TTL of the time-series collections in line with settings
+
+    Run on every start-up, so retention settings apply to collections that
+    already exist, not only to ones created afterwards.
+    """
+    existing = set(await db.list_collection_names())
+    for name, (_, ttl_setting, _) in TIME_SERIES_COLLECTIONS.items():
+        if name not in existing:
+            continue
+        ttl = _ttl_seconds(ttl_setting)
+        try:
+            await db.command("collMod", name, expireAfterSeconds=ttl if ttl else "off")
+        except Exception as e:
+            logger.error(f"Failed to set retention of {name}: {e}")
@@ -1,135 +1,532 @@
 # server/database/mongodb_helper.py
-from pymongo.mongo_client import MongoClient
-from pymongo.server_api import ServerApi
+import pandas as pd
+from pymongo import DeleteMany, InsertOne
+from pymongo.asynchronous.database import AsyncDatabase
+from server.database.client import get_database
+from server.database.write_behind import get_write_behind
+from server.utils.cache import LRUCache
 from server.config import get_settings, get_logger
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
 logger = get_logger(__name__)
 
+# Latest chain this process stored per (symbol, require_greeks), as one hash per
+# contract, so each capture can be diffed without reading the chain back
+_latest_chains: Optional[LRUCache] = None
+
+
+def _get_latest_chains() -> LRUCache:
+    global _latest_chains
+    if _latest_chains is None:
+        _latest_chains = LRUCache(get_settings().OPTIONS_DIFF_CACHE_MAX_MB * 1024 * 1024)
+    return _latest_chains
+
+
+def _contract_hashes(contracts: Dict[str, Dict[str, Any]]) -> Dict[str, int]:
+    """Hash every contract's fields, so changed contracts can be found without keeping them"""
+    return {key: hash(tuple(sorted(contract.items()))) for key, contract in contracts.items()}
+
+
+# Timestamp of the latest final point stored per time series (collection, meta), so
+# only newer points are written without reading the series back every time
+_series_latest: Optional[LRUCache] = None
+
+
+def _get_series_latest() -> LRUCache:
+    global _series_latest
+    if _series_latest is None:
+        _series_latest = LRUCache(get_settings().SERIES_LATEST_CACHE_MAX_MB * 1024 * 1024)
+    return _series_latest
+
+
+def series_collection(kind: str, interval: str) -> str:
+    """Get the time-series collection of bars or indicators of an interval"""
+    return f"{kind}_{'intraday' if interval.endswith('min') else 'daily'}"
+
+
+def _has_corporate_action(bars: pd.DataFrame) -> bool:
+    """Whether daily adjusted bars include a dividend or split"""
+    events = pd.Series(False, index=bars.index)
+    if "dividend_amount" in bars:
+        events |= bars["dividend_amount"].fillna(0) != 0
+    if "split_coefficient" in bars:
+        events |= bars["split_coefficient"].fillna(1) != 1
+    return bool(events.any())
+
+
+def account_document(summary: Dict[str, Any], timestamp: datetime) -> Dict[str, Any]:
+    """Time-series document of an IBKR account summary"""
+    values = {k: v for k, v in summary.items() if k != "account_id"}
+    return dict(values, timestamp=timestamp, meta={"account_id": summary.get("account_id")})
+
+
+def position_document(position: Dict[str, Any], timestamp: datetime) -> Dict[str, Any]:
+    """Time-series document of an IBKR position"""
+    values = {k: v for k, v in position.items() if k not in ("symbol", "contract_id")}
+    return dict(values, timestamp=timestamp,
+                meta={"symbol": position.get("symbol"), "contract_id": position.get("contract_id")})
+
+
+def _contract_key(contract: Dict[str, Any]) -> str:
+    """Identify a contract across snapshots"""
+    return contract.get("contract_name") or \
+        f"{contract.get('expiration_date')}:{contract.get('contract_type')}:{contract.get('strike_price')}"
+
 
 class MongoDBHelper:
-    """Minimal MongoDB helper for options data and suggestions"""
+    """
+    Minimal MongoDB helper for options data and suggestions
 
-    def __init__(self):
+    Helpers are cheap to create per request: they share the app-wide client
+    and its connection pool (see server.database.client), and indexes are
+    created once by server.database.migrations.
+    """
+
+    def __init__(self, db: Optional[AsyncDatabase] = None):
         self.settings = get_settings()
-        self.client = None
-        self.db = None
-        self.options_collection = None
+        self.db = db if db is not None else get_database()
+        self.options_snapshots_collection = None
+        self.options_captures_collection = None
         self.options_suggestions_collection = None
-        self.stocks_collection = None
-        self.indicators_collection = None
-
-    def connect(self):
-        """Connect to MongoDB"""
-        try:
-            uri = "mongodb+srv://financial_intelligence_hub:<db_password>@financialintelligencehu.mqr2tur.mongodb.net/?appName=financialintelligencehub"
-            # Replace password placeholder with actual password from settings
-            uri = uri.replace("<db_password>", self.settings.MONGODB_PASSWORD)
-
-            self.client = MongoClient(uri, server_api=ServerApi('1'))
-            # Ping to confirm connection
-            self.client.admin.command('ping')
-            logger.info("Successfully connected to MongoDB!")
-
-            # Set up database and collections
-            self.db = self.client.financial_intelligence_hub
-            self.options_collection = self.db.options_data
+        if self.db is not None:
+            self.options_snapshots_collection = self.db.options_snapshots
+            self.options_captures_collection = self.db.options_captures
             self.options_suggestions_collection = self.db.options_suggestions
 
-            # Create indexes for efficient lookups
-            self.options_collection.create_index([("symbol", 1), ("require_greeks", 1)])
-            self.options_suggestions_collection.create_index([
-                ("symbol", 1),
-                ("expiration_date", 1),
-                ("created_at", -1)
-            ])
+    @property
+    def connected(self) -> bool:
+        """Whether MongoDB is available"""
+        return self.db is not None
 
-            return True
-        except Exception as e:
-            logger.error(f"Failed to connect to MongoDB: {e}")
-            return False
+    async def store_options_data(self, symbol: str, require_greeks: bool, data: List[Dict[str, Any]],
+                                 captured_at: Optional[datetime] = None) -> bool:
+        """
+        Queue a snapshot of an options chain for MongoDB
+
+        Each contract is its own document stamped with the capture time, but
+        only contracts that changed since the previous capture are written;
+        every OPTIONS_KEYFRAME_INTERVAL captures the full chain is stored as a
+        keyframe, bounding how far back a rebuild has to read. One document
+        per capture in options_captures records the keyframes and the
+        contracts that disappeared.
+
+        The chain is handed to the write-behind writer, which diffs it and
+        writes it, so this returns without reading or writing MongoDB.
+        """
+        captured_at = captured_at or datetime.now()
+        # Copies, so neither later changes to the caller's contracts nor the _id
+        # pymongo assigns cross between the two
+        contracts = {_contract_key(contract): dict(contract) for contract in data}
 
-    def close(self):
-        """Close MongoDB connection"""
-        if self.client:
-            self.client.close()
-            logger.info("MongoDB connection closed")
+        async def store(db: AsyncDatabase) -> None:
+            await self._store_capture(symbol, require_greeks, contracts, captured_at)
+
+        queued = await get_write_behind().put_job(store)
+        if queued:
+            logger.info(f"Options snapshot queued for {symbol} (greeks: {require_greeks}): {len(contracts)} contracts")
+        return queued
+
+    async def _store_capture(self, symbol: str, require_greeks: bool, contracts: Dict[str, Dict[str, Any]],
+                             captured_at: datetime) -> None:
+        """
+        Diff a chain against the previous capture and write it; run by the writer
 
-    def store_options_data(self, symbol: str, require_greeks: bool, data: List[Dict[str, Any]]) -> bool:
-        """Store options data in MongoDB"""
+        The capture document is only written once every changed contract is,
+        so a rebuild never reads a capture whose contracts are partly missing.
+        """
+        key = (symbol, require_greeks)
+        latest_chains = _get_latest_chains()
         try:
-            # Store document
-            doc = {
+            previous = await self._previous_chain(symbol, require_greeks)
+            hashes = _contract_hashes(contracts)
+
+            keyframe = previous is None or previous["since_keyframe"] + 1 >= self.settings.OPTIONS_KEYFRAME_INTERVAL
+            if keyframe:
+                changed = list(contracts.values())
+                removed = []
+            else:
+                changed = [contracts[k] for k, h in hashes.items() if previous["contracts"].get(k) != h]
+                removed = [k for k in previous["contracts"] if k not in contracts]
+
+            if changed:
+                await self.options_snapshots_collection.bulk_write([
+                    InsertOne(dict(contract, symbol=symbol, require_greeks=require_greeks, captured_at=captured_at))
+                    for contract in changed
+                ], ordered=True)
+            since_keyframe = 0 if keyframe else previous["since_keyframe"] + 1
+            await self.options_captures_collection.insert_one({
                 "symbol": symbol,
                 "require_greeks": require_greeks,
-                "data": data
-            }
-
-            # Use upsert to update if exists or insert if not
-            result = self.options_collection.update_one(
-                {
-                    "symbol": symbol,
-                    "require_greeks": require_greeks
-                },
-                {"$set": doc},
-                upsert=True
-            )
+                "captured_at": captured_at,
+                "keyframe": keyframe,
+                "since_keyframe": since_keyframe,
+                "contracts": len(contracts),
+                "changed": len(changed),
+                "removed": removed
+            })
+            latest_chains.set(key, {"captured_at": captured_at, "since_keyframe": since_keyframe, "contracts": hashes})
 
-            logger.info(f"Options data stored for {symbol} (greeks: {require_greeks})")
-            return True
+            logger.info(f"Options snapshot stored for {symbol} (greeks: {require_greeks}): "
+                        f"{len(changed)} of {len(contracts)} contracts{' (keyframe)' if keyframe else ''}")
         except Exception as e:
             logger.error(f"Error storing options data in MongoDB: {e}")
-            return False
+            # Later captures can't be diffed against a chain that may not be stored
+            latest_chains.delete(key)
+
+    async def _previous_chain(self, symbol: str, require_greeks: bool) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest chain to diff against, or None if a keyframe is needed
 
-    def get_options_data(self, symbol: str, require_greeks: bool) -> Optional[List[Dict[str, Any]]]:
-        """Get options data from MongoDB"""
+        This process's own latest capture is used unless MongoDB holds a newer
+        one, stored by another process; that one is rebuilt instead.
+        """
+        if not self.connected:
+            return None
+
+        latest = await self.options_captures_collection.find_one(
+            {"symbol": symbol, "require_greeks": require_greeks}, {"captured_at": 1, "since_keyframe": 1},
+            sort=[("captured_at", -1)]
+        )
+        cached = _get_latest_chains().get((symbol, require_greeks))
+        if cached and (latest is None or cached["captured_at"] >= latest["captured_at"]):
+            return cached
+        if latest is None:
+            return None
+
+        contracts = await self._rebuild_chain(symbol, require_greeks, latest["captured_at"])
+        if contracts is None:
+            return None
+        return {
+            "captured_at": latest["captured_at"],
+            "since_keyframe": latest["since_keyframe"],
+            "contracts": _contract_hashes({_contract_key(contract): contract for contract in contracts})
+        }
+
+    async def _rebuild_chain(self, symbol: str, require_greeks: bool, as_of: Optional[datetime] = None,
+                             expiration_date: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Rebuild the chain as of a point in time: the latest keyframe at or before
+        it, with every later change applied in capture order
+
+        Contracts of captures that were never recorded (their writes failed
+        part-way) are ignored, and a full chain that doesn't add up to the
+        recorded contract count is rejected.
+        """
+        query = {"symbol": symbol, "require_greeks": require_greeks}
+        if as_of:
+            query["captured_at"] = {"$lte": as_of}
+
+        keyframe = await self.options_captures_collection.find_one(
+            dict(query, keyframe=True), {"captured_at": 1}, sort=[("captured_at", -1)]
+        )
+        if not keyframe:
+            return None
+
+        window = {"$gte": keyframe["captured_at"]}
+        if as_of:
+            window["$lte"] = as_of
+        query["captured_at"] = window
+
+        # Time each contract last disappeared from the chain
+        removed_at: Dict[str, datetime] = {}
+        captures: Dict[datetime, Dict[str, Any]] = {}
+        async for capture in self.options_captures_collection.find(query, {"captured_at": 1, "removed": 1,
+                                                                            "contracts": 1}):
+            captures[capture["captured_at"]] = capture
+            for key in capture.get("removed", []):
+                removed_at[key] = max(removed_at.get(key, capture["captured_at"]), capture["captured_at"])
+
+        if expiration_date:
+            query["expiration_date"] = expiration_date
+        contracts: Dict[str, Dict[str, Any]] = {}
+        cursor = self.options_snapshots_collection.find(
+            query, {"_id": 0, "symbol": 0, "require_greeks": 0}
+        ).sort("captured_at", 1)
+        async for doc in cursor:
+            if doc["captured_at"] in captures:
+                contracts[_contract_key(doc)] = doc
+
+        chain = []
+        for key, doc in contracts.items():
+            stored_at = doc.pop("captured_at")
+            if key in removed_at and removed_at[key] > stored_at:
+                continue
+            chain.append(doc)
+
+        expected = captures[max(captures)].get("contracts")
+        if not expiration_date and expected is not None and len(chain) != expected:
+            logger.warning(f"Stored options chain of {symbol} (greeks: {require_greeks}) is incomplete: "
+                           f"{len(chain)} of {expected} contracts")
+            return None
+        return chain
+
+    async def get_latest_capture_time(self, symbol: str, require_greeks: bool) -> Optional[datetime]:
+        """Get when the latest options snapshot of a symbol was captured"""
+        if not self.connected:
+            return None
         try:
-            # Find document
-            doc = self.options_collection.find_one({
-                "symbol": symbol,
-                "require_greeks": require_greeks
-            })
+            latest = await self.options_captures_collection.find_one(
+                {"symbol": symbol, "require_greeks": require_greeks}, {"captured_at": 1}, sort=[("captured_at", -1)]
+            )
+            return latest["captured_at"] if latest else None
+        except Exception as e:
+            logger.error(f"Error retrieving latest options capture: {e}")
+            return None
 
-            if doc and "data" in doc:
-                logger.info(f"Retrieved options data for {symbol} (greeks: {require_greeks})")
-                return doc["data"]
+    async def get_options_data(self, symbol: str, require_greeks: bool, expiration_date: Optional[str] = None,
+                               as_of: Optional[datetime] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get a stored options chain from MongoDB
 
-            logger.info(f"No options data found for {symbol} (greeks: {require_greeks})")
+        Args:
+            symbol: Stock symbol
+            require_greeks: Whether the snapshot was fetched with Greeks
+            expiration_date: Only return contracts of this expiration
+            as_of: Rebuild the chain as it was at this time (defaults to the latest capture)
+        """
+        if not self.connected:
             return None
+        try:
+            data = await self._rebuild_chain(symbol, require_greeks, as_of, expiration_date)
+            if data is None:
+                logger.info(f"No options data found for {symbol} (greeks: {require_greeks})")
+                return None
+
+            logger.info(f"Retrieved {len(data)} contracts for {symbol} (greeks: {require_greeks})")
+            return data
         except Exception as e:
             logger.error(f"Error retrieving options data: {e}")
             return None
 
-    def store_options_suggestion(self, symbol: str, expiration_date: str, stock_price: float,
-                                 analysis: Dict[str, Any]) -> bool:
-        """Store options analysis suggestion in MongoDB"""
+    async def get_contract_history(self, symbol: str, expiration_date: str, strike_price: float,
+                                   contract_type: Optional[str] = None, start: Optional[datetime] = None,
+                                   end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get the stored snapshots of one strike, oldest first (one per change of its quote)"""
+        if not self.connected:
+            return []
         try:
-            # Create document
-            doc = {
-                "symbol": symbol,
-                "expiration_date": expiration_date,
-                "stock_price": stock_price,
-                "analysis": analysis,
-                "created_at": datetime.now()
-            }
+            query = {"symbol": symbol, "expiration_date": expiration_date, "strike_price": strike_price}
+            if contract_type:
+                query["contract_type"] = contract_type
+            if start or end:
+                query["captured_at"] = {}
+                if start:
+                    query["captured_at"]["$gte"] = start
+                if end:
+                    query["captured_at"]["$lte"] = end
+
+            cursor = self.options_snapshots_collection.find(query, {"_id": 0}).sort("captured_at", 1)
+            return await cursor.to_list()
+        except Exception as e:
+            logger.error(f"Error retrieving contract history: {e}")
+            return []
+
+    async def store_options_suggestion(self, symbol: str, expiration_date: str, stock_price: float,
+                                       analysis: Dict[str, Any]) -> bool:
+        """Queue an options analysis suggestion for MongoDB"""
+        doc = {
+            "symbol": symbol,
+            "expiration_date": expiration_date,
+            "stock_price": stock_price,
+            "analysis": analysis,
+            "created_at": datetime.now()
+        }
+        return await get_write_behind().put("options_suggestions", InsertOne(doc))
+
+    async def store_ibkr_summary(self, summary: Dict[str, Any]) -> bool:
+        """Queue an IBKR account summary snapshot for the ibkr_account_history time series"""
+        return await get_write_behind().put("ibkr_account_history", InsertOne(account_document(summary, datetime.now())))
+
+    async def store_ibkr_positions(self, positions: List[Dict[str, Any]]) -> bool:
+        """Queue a snapshot of IBKR positions for the ibkr_position_history time series"""
+        timestamp = datetime.now()
+        writes = [("ibkr_position_history", InsertOne(position_document(position, timestamp)))
+                  for position in positions]
+        return await get_write_behind().put_many(writes)
 
-            # Insert document
-            result = self.options_suggestions_collection.insert_one(doc)
+    async def _append_series(self, collection: str, meta: Dict[str, Any], frame: pd.DataFrame,
+                             revises_history: Optional[Callable[[pd.DataFrame], bool]] = None) -> int:
+        """
+        Queue the rows of a frame after the latest stored point of a time series
+
+        Time-series collections have no unique indexes, so points are
+        de-duplicated by position: only rows after the latest final point are
+        written. The last row may be a bar (or a value computed from it) that
+        is still forming, so it is stored as provisional (meta.provisional)
+        and deleted again by the next write. Deletes filter on the metaField
+        only, which time-series collections support from MongoDB 5.0 on.
+
+        Args:
+            revises_history: Given the new rows, whether they revise every
+                earlier point too (e.g. a split adjusting past prices), in
+                which case the whole series is rewritten
+
+        Returns:
+            Number of points queued
+        """
+        if not self.connected or frame.empty:
+            return 0
+
+        key = (collection, tuple(sorted(meta.items())))
+        series = {f"meta.{field}": value for field, value in meta.items()}
+        series_latest = _get_series_latest()
+        cached = series_latest.get(key)
+        if cached is None:
+            latest = await self.db[collection].find_one(dict(series, **{"meta.provisional": {"$ne": True}}),
+                                                        {"timestamp": 1}, sort=[("timestamp", -1)])
+            cached = {"timestamp": latest["timestamp"] if latest else None}
+        latest = cached["timestamp"]
+
+        if latest is not None and revises_history and revises_history(frame[frame.index > latest]):
+            writes = [(collection, DeleteMany(series))]
+            latest = None
+        else:
+            writes = [(collection, DeleteMany(dict(series, **{"meta.provisional": True})))]
+            if latest is not None:
+                frame = frame[frame.index > latest]
+        if frame.empty:
+            return 0
+
+        # Deletes and inserts of a collection are flushed in order, so the provisional point is replaced
+        provisional = dict(meta, provisional=True)
+        writes.extend(
+            (collection, InsertOne(dict(values, timestamp=timestamp.to_pydatetime(),
+                                        meta=provisional if timestamp == frame.index[-1] else meta)))
+            for timestamp, values in zip(frame.index, frame.to_dict(orient="records"))
+        )
+        series_latest.set(key, {"timestamp": frame.index[-2].to_pydatetime() if len(frame) > 1 else latest})
+        # After a failed write, find out what did get stored before appending again
+        if not await get_write_behind().put_many(writes, on_failure=lambda: series_latest.delete(key)):
+            series_latest.delete(key)
+            return 0
+        return len(frame)
 
-            logger.info(f"Options suggestion stored for {symbol} (expiration: {expiration_date})")
-            return True
+    async def store_bars(self, symbol: str, interval: str, bars: pd.DataFrame) -> int:
+        """
+        Queue OHLCV bars from the latest stored one on for the bars time series
+
+        A dividend or split among the new bars revises the adjusted close of
+        every earlier bar, so the whole series is rewritten then.
+
+        Returns:
+            Number of bars queued
+        """
+        meta = {"symbol": symbol.upper(), "interval": interval}
+        try:
+            return await self._append_series(series_collection("bars", interval), meta, bars, _has_corporate_action)
         except Exception as e:
-            logger.error(f"Error storing options suggestion in MongoDB: {e}")
-            return False
+            logger.error(f"Error storing bars for {symbol} ({interval}) in MongoDB: {e}")
+            return 0
+
+    async def store_indicator_values(self, symbol: str, interval: str, indicator: str, time_period: int,
+                                     series_type: str, values: pd.DataFrame) -> int:
+        """
+        Queue computed indicator values from the latest stored one on for the indicators time series
 
-    def get_options_suggestions(self, symbol: str, expiration_date: Optional[str] = None, limit: int = 1) -> List[
+        Returns:
+            Number of points queued
+        """
+        meta = {"symbol": symbol.upper(), "interval": interval, "indicator": indicator,
+                "time_period": time_period, "series_type": series_type}
+        try:
+            return await self._append_series(series_collection("indicators", interval), meta, values)
+        except Exception as e:
+            logger.error(f"Error storing {indicator} values for {symbol} ({interval}) in MongoDB: {e}")
+            return 0
+
+    async def _series_range(self, collection: str, meta: Dict[str, Any], start: Optional[datetime] = None,
+                            end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get the points of a time series in a time range, oldest first"""
+        query: Dict[str, Any] = {f"meta.{field}": value for field, value in meta.items() if value is not None}
+        if start or end:
+            query["timestamp"] = {}
+            if start:
+                query["timestamp"]["$gte"] = start
+            if end:
+                query["timestamp"]["$lte"] = end
+        cursor = self.db[collection].find(query, {"_id": 0}).sort("timestamp", 1)
+        return await cursor.to_list()
+
+    async def _series_frame(self, collection: str, meta: Dict[str, Any], start: Optional[datetime],
+                            end: Optional[datetime]) -> pd.DataFrame:
+        """Get the points of one time series in a time range as a frame indexed by timestamp"""
+        docs = await self._series_range(collection, meta, start, end)
+        if not docs:
+            return pd.DataFrame()
+        frame = pd.DataFrame.from_records(docs, exclude=["meta"]).set_index("timestamp")
+        frame.index.name = None
+        return frame
+
+    async def get_bars(self, symbol: str, interval: str = "daily", start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Get stored OHLCV bars of a symbol in a time range
+
+        Returns:
+            DataFrame of bars indexed by timestamp (empty if none are stored)
+        """
+        if not self.connected:
+            return pd.DataFrame()
+        try:
+            meta = {"symbol": symbol.upper(), "interval": interval}
+            return await self._series_frame(series_collection("bars", interval), meta, start, end)
+        except Exception as e:
+            logger.error(f"Error retrieving bars for {symbol} ({interval}): {e}")
+            return pd.DataFrame()
+
+    async def get_indicator_values(self, symbol: str, indicator: str, time_period: int = 14,
+                                   series_type: str = "close", interval: str = "daily",
+                                   start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Get stored values of a technical indicator for a symbol in a time range
+
+        Returns:
+            DataFrame of indicator values indexed by timestamp (empty if none are stored)
+        """
+        if not self.connected:
+            return pd.DataFrame()
+        try:
+            meta = {"symbol": symbol.upper(), "interval": interval, "indicator": indicator.upper(),
+                    "time_period": time_period, "series_type": series_type}
+            return await self._series_frame(series_collection("indicators", interval), meta, start, end)
+        except Exception as e:
+            logger.error(f"Error retrieving {indicator} values for {symbol} ({interval}): {e}")
+            return pd.DataFrame()
+
+    async def get_account_history(self, account_id: Optional[str] = None, start: Optional[datetime] = None,
+                                  end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get stored IBKR account summary snapshots in a time range, oldest first"""
+        if not self.connected:
+            return []
+        try:
+            docs = await self._series_range("ibkr_account_history", {"account_id": account_id}, start, end)
+            return [dict(doc.pop("meta"), **doc) for doc in docs]
+        except Exception as e:
+            logger.error(f"Error retrieving IBKR account history: {e}")
+            return []
+
+    async def get_position_history(self, symbol: Optional[str] = None, start: Optional[datetime] = None,
+                                   end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Get stored IBKR position snapshots in a time range, oldest first"""
+        if not self.connected:
+            return []
+        try:
+            docs = await self._series_range("ibkr_position_history", {"symbol": symbol}, start, end)
+            return [dict(doc.pop("meta"), **doc) for doc in docs]
+        except Exception as e:
+            logger.error(f"Error retrieving IBKR position history: {e}")
+            return []
+
+    async def get_options_suggestions(self, symbol: str, expiration_date: Optional[str] = None, limit: int = 1) -> List[
         Dict[str, Any]]:
         """Get options suggestions from MongoDB
 
         If expiration_date is provided, get suggestions for that specific date.
         Otherwise, get the most recent suggestions for the symbol.
         """
+        if not self.connected:
+            return []
         try:
             # Build query
             query = {"symbol": symbol}
@@ -142,7 +539,7 @@ class MongoDBHelper:
             ).sort("created_at", -1).limit(limit)
 
             # Convert cursor to list
-            suggestions = list(cursor)
+            suggestions = await cursor.to_list()
 
             if suggestions:
                 logger.info(f"Retrieved {len(suggestions)} options suggestions for {symbol}")
@@ -0,0 +1,196 @@
+# server/database/write_behind.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from pymongo.asynchronous.database import AsyncDatabase
+from server.database.client import get_database
+from server.config import get_settings, get_logger
+
+logger = get_logger(__name__)
+
+# A queued write: collection name, pymongo write operation (InsertOne, UpdateOne, ...)
+# and an optional callback run if the write fails
+Write = Tuple[str, Any, Optional[Callable[[], None]]]
+# A queued job: run by the writer with the database, for writes that depend on
+# what is already stored or must only follow other writes that succeeded
+Job = Callable[[AsyncDatabase], Awaitable[None]]
+
+
+class WriteBehindQueue:
+    """
+    Background writer batching MongoDB writes off the request path
+
+    Requests hand their writes to a bounded queue and return; one task
+    drains it, groups the writes by collection and flushes each group with a
+    single bulk_write. When the queue is full, writers wait for room, so a
+    slow database slows requests down instead of growing memory. Writes of a
+    collection are applied in the order they were queued, and a job runs
+    only after every write queued before it has been flushed.
+    """
+
+    def __init__(self, max_pending: int, batch_size: int, flush_interval: float):
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._db = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self, db: Optional[AsyncDatabase] = None) -> bool:
+        """
+        Start the writer task
+
+        Args:
+            db: Database to write to (defaults to the app's shared one)
+
+        Returns:
+            Whether writes will be stored; without MongoDB they are dropped
+        """
+        if self.running:
+            return True
+
+        self._db = db if db is not None else get_database()
+        if self._db is None:
+            return False
+
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._task = asyncio.create_task(self._run())
+        return True
+
+    async def put(self, collection: str, operation: Any, on_failure: Optional[Callable[[], None]] = None) -> bool:
+        """Queue one write, waiting while the queue is full"""
+        return await self.put_many([(collection, operation)], on_failure)
+
+    async def put_many(self, writes: Iterable[Tuple[str, Any]],
+                       on_failure: Optional[Callable[[], None]] = None) -> bool:
+        """
+        Queue writes, waiting while the queue is full
+
+        The writer is started on first use if the app didn't start it.
+
+        Args:
+            writes: (collection name, write operation) pairs
+            on_failure: Called once if any of these writes fails
+
+        Returns:
+            Whether the writes were queued
+        """
+        if not self.running:
+            if not await self.start():
+                logger.warning("MongoDB unavailable, dropping writes")
+                return False
+
+        failed = _once(on_failure) if on_failure else None
+        for collection, operation in writes:
+            await self._queue.put((collection, operation, failed))
+        return True
+
+    async def put_job(self, job: Job) -> bool:
+        """
+        Queue a job for the writer task, waiting while the queue is full
+
+        The job's reads and writes happen in the writer, off the request
+        path; it handles its own errors.
+
+        Returns:
+            Whether the job was queued
+        """
+        if not self.running:
+            if not await self.start():
+                logger.warning("MongoDB unavailable, dropping writes")
+                return False
+
+        await self._queue.put(job)
+        return True
+
+    async def stop(self) -> None:
+        """Flush every queued write, then stop the writer task"""
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self._db = None
+
+    async def _run(self) -> None:
+        closing = False
+        while not closing:
+            item = await self._queue.get()
+            if item is None:
+                break
+
+            batch: List[Union[Write, Job]] = [item]
+            # Gather whatever arrives shortly after, up to a batch
+            deadline = asyncio.get_running_loop().time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                try:
+                    item = self._queue.get_nowait() if timeout <= 0 else \
+                        await asyncio.wait_for(self._queue.get(), timeout)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if item is None:
+                    closing = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Union[Write, Job]]) -> None:
+        writes: List[Write] = []
+        for item in batch:
+            if not callable(item):
+                writes.append(item)
+                continue
+            await self._flush_writes(writes)
+            writes = []
+            try:
+                await item(self._db)
+            except Exception as e:
+                logger.error(f"Error in write-behind job: {e}")
+        await self._flush_writes(writes)
+
+    async def _flush_writes(self, batch: List[Write]) -> None:
+        groups: Dict[str, List[Write]] = {}
+        for write in batch:
+            groups.setdefault(write[0], []).append(write)
+
+        for collection, writes in groups.items():
+            try:
+                await self._db[collection].bulk_write([operation for _, operation, _ in writes], ordered=True)
+            except Exception as e:
+                logger.error(f"Error flushing {len(writes)} writes to {collection}: {e}")
+                for callback in {on_failure for _, _, on_failure in writes if on_failure}:
+                    callback()
+
+
+def _once(callback: Callable[[], None]) -> Callable[[], None]:
+    """Wrap a callback so it only runs the first time it is called"""
+    called = False
+
+    def wrapper():
+        nonlocal called
+        if not called:
+            called = True
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in write failure callback: {e}")
+
+    return wrapper
+
+
+_write_behind: Optional[WriteBehindQueue] = None
+
+
+def get_write_behind() -> WriteBehindQueue:
+    """Get the process-wide write-behind queue"""
+    global _write_behind
+    if _write_behind is None:
+        settings = get_settings()
+        _write_behind = WriteBehindQueue(settings.WRITE_BEHIND_MAX_PENDING, settings.WRITE_BEHIND_BATCH_SIZE,
+                                         settings.WRITE_BEHIND_FLUSH_SECONDS)
+    return _write_behind
@@ -0,0 +1,167 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+GREEK_FIELDS = ("implied_volatility", "delta", "gamma", "theta", "vega", "rho")
+
+# Quote fields, as named in responses and as named by Alpha Vantage
+QUOTE_FIELDS = {
+    "strike_price": "strike",
+    "last_price": "last",
+    "bid": "bid",
+    "ask": "ask",
+    "volume": "volume",
+    "open_interest": "open_interest"
+}
+
+
+class OptionsChain:
+    """
+    Options chain stored as one NumPy array per field
+
+    Expirations are kept as integer codes into the sorted array of distinct
+    expiration dates, and the contract type as a boolean is_call column, so a
+    chain costs a few bytes per field per contract instead of one Python dict
+    per contract. Greeks are NaN where unknown.
+    """
+
+    def __init__(self, contract_names: np.ndarray, is_call: np.ndarray, expiration_codes: np.ndarray,
+                 expirations: np.ndarray, columns: Dict[str, np.ndarray]):
+        self.contract_names = contract_names
+        self.is_call = is_call
+        self.expiration_codes = expiration_codes
+        self.expirations = expirations
+        self.columns = columns
+
+    @classmethod
+    def _parse(cls, rows: List[Dict[str, Any]], names: Dict[str, str], include_greeks: bool) -> "OptionsChain":
+        n = len(rows)
+
+        def numeric(key: str, default: float) -> np.ndarray:
+            values = [row.get(key) for row in rows]
+            try:
+                # NumPy parses numeric strings and maps None to NaN in a single C pass
+                column = np.array(values, dtype=float)
+            except (TypeError, ValueError):
+                column = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=float)
+            if not np.isnan(default):
+                column[np.isnan(column)] = default
+            return column
+
+        def text(key: str) -> np.ndarray:
+            return np.array(["" if row.get(key) is None else str(row.get(key)) for row in rows], dtype=str)
+
+        columns = {field: numeric(names[field], 0.0) for field in QUOTE_FIELDS}
+        for field in GREEK_FIELDS:
+            columns[field] = numeric(field, np.nan) if include_greeks else np.full(n, np.nan)
+
+        expirations, codes = np.unique(text(names["expiration_date"]), return_inverse=True)
+        return cls(
+            contract_names=text(names["contract_name"]),
+            is_call=np.char.lower(text(names["contract_type"])) == "call",
+            expiration_codes=codes.astype(np.int32).reshape(n),
+            expirations=expirations,
+            columns=columns
+        )
+
+    @classmethod
+    def from_alpha_vantage(cls, rows: List[Dict[str, Any]], include_greeks: bool = False) -> "OptionsChain":
+        """
+        Parse the contracts of an Alpha Vantage options response column by column
+
+        Args:
+            rows: The response's data array
+            include_greeks: Keep implied volatility and Greeks if present
+        """
+        names = dict(QUOTE_FIELDS, contract_name="contractID", contract_type="type",
+                     expiration_date="expiration")
+        return cls._parse(rows, names, include_greeks)
+
+    @classmethod
+    def from_records(cls, contracts: List[Dict[str, Any]]) -> "OptionsChain":
+        """Build a chain from contracts in the response format (see to_records)"""
+        names = {field: field for field in QUOTE_FIELDS}
+        names.update(contract_name="contract_name", contract_type="contract_type", expiration_date="expiration_date")
+        return cls._parse(contracts, names, True)
+
+    def __len__(self) -> int:
+        return len(self.is_call)
+
+    def __sizeof__(self) -> int:
+        arrays = [self.contract_names, self.is_call, self.expiration_codes, self.expirations]
+        return sum(a.nbytes for a in arrays) + sum(a.nbytes for a in self.columns.values())
+
+    @property
+    def expiration(self) -> np.ndarray:
+        """Expiration date of every contract"""
+        return self.expirations[self.expiration_codes]
+
+    def copy(self) -> "OptionsChain":
+        """Copy the chain, so its columns can be changed without touching this one"""
+        return OptionsChain(self.contract_names, self.is_call, self.expiration_codes, self.expirations,
+                            {key: values.copy() for key, values in self.columns.items()})
+
+    def take(self, rows: np.ndarray) -> "OptionsChain":
+        """Select contracts by position (or boolean mask)"""
+        return OptionsChain(self.contract_names[rows], self.is_call[rows], self.expiration_codes[rows],
+                            self.expirations, {key: values[rows] for key, values in self.columns.items()})
+
+    def fill_missing(self, values: Dict[str, np.ndarray]) -> None:
+        """Fill unknown (NaN) entries of columns from same-length arrays"""
+        for field, filled in values.items():
+            column = self.columns[field]
+            missing = np.isnan(column)
+            column[missing] = filled[missing]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Column arrays in the layout used by server.utils.options_analytics:
+        strike, is_call, bid, ask, last, volume, open_interest, implied_volatility,
+        the Greeks and expiration
+        """
+        arrays = {
+            "strike": self.columns["strike_price"],
+            "is_call": self.is_call,
+            "bid": self.columns["bid"],
+            "ask": self.columns["ask"],
+            "last": self.columns["last_price"],
+            "volume": self.columns["volume"],
+            "open_interest": self.columns["open_interest"]
+        }
+        arrays.update((field, self.columns[field]) for field in GREEK_FIELDS)
+        arrays["expiration"] = self.expiration
+        return arrays
+
+    def to_records(self, digits: Optional[int] = 6) -> List[Dict[str, Any]]:
+        """
+        Convert to one dict per contract, in the OptionsContractResponse layout
+
+        Args:
+            digits: Round Greeks to this many digits (None keeps full precision)
+        """
+        n = len(self)
+        greeks = {}
+        for field in GREEK_FIELDS:
+            values = self.columns[field]
+            if digits is not None:
+                values = np.round(values, digits)
+            greeks[field] = [None if v != v else v for v in values.tolist()]
+
+        types = np.where(self.is_call, "call", "put").tolist()
+        columns = [
+            ("contract_name", self.contract_names.tolist()),
+            ("contract_type", types),
+            ("expiration_date", self.expiration.tolist()),
+            ("strike_price", self.columns["strike_price"].tolist()),
+            ("last_price", self.columns["last_price"].tolist()),
+            ("bid", self.columns["bid"].tolist()),
+            ("ask", self.columns["ask"].tolist()),
+            ("change", [0.0] * n),
+            ("change_percentage", [0.0] * n),
+            ("volume", self.columns["volume"].astype(np.int64).tolist()),
+            ("open_interest", self.columns["open_interest"].astype(np.int64).tolist())
+        ]
+        columns.extend(greeks.items())
+
+        keys = [key for key, _ in columns]
+        return [dict(zip(keys, row)) for row in zip(*(values for _, values in columns))]
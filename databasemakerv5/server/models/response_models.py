@@ -19,6 +19,29 @@ class IndicatorDataResponse(BaseModel):
     date: str
     value: float
 
+class YieldCurvePoint(BaseModel):
+    """Yields and spreads on a single date"""
+    date: str
+    yields: Dict[str, float]
+    spreads: Dict[str, float]
+
+class YieldCurveResponse(BaseModel):
+    """Response model for the treasury yield curve (columnar)"""
+    dates: List[str]
+    maturities: List[str]
+    yields: Dict[str, List[Optional[float]]]
+    spreads: Dict[str, List[Optional[float]]]
+    latest: Optional[YieldCurvePoint] = None
+    errors: Dict[str, str] = {}
+
+class IndicatorPanelResponse(BaseModel):
+    """Response model for indicators aligned on a common calendar (columnar)"""
+    freq: str
+    dates: List[str]
+    columns: Dict[str, List[Optional[float]]]
+    last_observation: Dict[str, str]
+    errors: Dict[str, str] = {}
+
 class OptionsContractResponse(BaseModel):
     """Response model for options contract"""
     contract_name: str
@@ -37,6 +60,59 @@ class OptionsContractResponse(BaseModel):
     gamma: Optional[float] = None
     theta: Optional[float] = None
     vega: Optional[float] = None
+    rho: Optional[float] = None
+
+class OptionsAnalyticsResponse(BaseModel):
+    """Response model for server-side options analytics of one expiration"""
+    symbol: str
+    expiration: str
+    expirations: List[str]
+    stock_price: float
+    days_to_expiration: int
+    contracts: int
+    volatility_skew: Optional[Dict[str, Any]] = None
+    covered_calls: Optional[Dict[str, Any]] = None
+    cash_secured_puts: Optional[Dict[str, Any]] = None
+    max_pain: Optional[Dict[str, Any]] = None
+    put_call_parity: Optional[Dict[str, Any]] = None
+    arbitrage: List[Dict[str, Any]] = []
+    put_call_ratio: Optional[Dict[str, Any]] = None
+    notable_activity: Dict[str, List[Dict[str, Any]]] = {}
+    summary: Dict[str, Any] = {}
+    # The same results condensed to the title/label/value cards the options view renders
+    calculation_results: List[Dict[str, Any]] = []
+
+class VolatilitySurfaceResponse(BaseModel):
+    """Response model for an implied volatility surface on a fixed grid"""
+    symbol: str
+    stock_price: float
+    moneyness: List[float]
+    strikes: List[float]
+    tenors: List[float]
+    expirations: List[str]
+    # One row per tenor, one column per moneyness point
+    iv: List[List[Optional[float]]]
+
+class OptionsVolatilityHistoryResponse(BaseModel):
+    """Response model for daily implied volatility history (columnar)"""
+    symbol: str
+    dates: List[str]
+    expirations: List[str]
+    stock_price: List[float]
+    atm_iv: List[Optional[float]]
+    otm_call_iv: List[Optional[float]]
+    otm_put_iv: List[Optional[float]]
+    skew: List[Optional[float]]
+    volume_ratio: List[Optional[float]]
+    open_interest_ratio: List[Optional[float]]
+
+class OptionsBackfillResponse(BaseModel):
+    """Response model for a started options history backfill"""
+    symbols: List[str]
+    start_date: str
+    end_date: Optional[str] = None
+    trading_days: int
+    pending: Dict[str, int]
 
 class MarketMoversResponse(BaseModel):
     """Response model for market movers"""
@@ -48,7 +124,106 @@ class MarketMoversResponse(BaseModel):
 class CorrelationResponse(BaseModel):
     """Response model for correlation analysis"""
     labels: List[str]
-    matrix: List[List[float]]
+    matrix: List[List[Optional[float]]]
+    method: str = "pearson"
+    transform: str = "level"
+    frequency: str = "monthly"
+    observations: Optional[int] = None
+    # With clustering: original request position of each returned label, and the
+    # dendrogram as [left, right, height, size] merges (leaf ids = returned positions)
+    order: Optional[List[int]] = None
+    dendrogram: Optional[List[List[float]]] = None
+    errors: Dict[str, str] = {}
+
+class RollingCorrelationPair(BaseModel):
+    """Response model for the rolling correlation of a single pair"""
+    pair: List[str]
+    values: List[Optional[float]]
+
+class RollingCorrelationResponse(BaseModel):
+    """Response model for rolling correlation analysis"""
+    labels: List[str]
+    window: int
+    frequency: str
+    dates: List[str]
+    matrices: Optional[List[List[List[Optional[float]]]]] = None
+    pairs: Optional[List[RollingCorrelationPair]] = None
+    errors: Dict[str, str] = {}
+
+class CorrelationPartner(BaseModel):
+    """Response model for a correlated partner of a series"""
+    symbol: str
+    correlation: float
+    observations: int
+
+class CorrelationTopPartners(BaseModel):
+    """Response model for the most and least correlated partners of a series"""
+    symbol: str
+    most: List[CorrelationPartner]
+    least: List[CorrelationPartner]
+
+class CorrelationPair(BaseModel):
+    """Response model for a correlated pair"""
+    a: str
+    b: str
+    correlation: float
+    observations: int
+
+class CorrelationPairsResponse(BaseModel):
+    """Response model for large-universe correlation analysis"""
+    frequency: str
+    series: int
+    observations: int
+    mode: str
+    top: Optional[List[CorrelationTopPartners]] = None
+    pairs: Optional[List[CorrelationPair]] = None
+    errors: Dict[str, str] = {}
+
+class LeadLagPair(BaseModel):
+    """Best lead or lag between an indicator and a stock"""
+    indicator: str
+    stock: str
+    best_lag: int
+    correlation: float
+    lag0_correlation: Optional[float]
+    observations: int
+    curve: Optional[List[Optional[float]]] = None
+
+class LeadLagResponse(BaseModel):
+    """Response model for lead-lag cross-correlation"""
+    frequency: str
+    transform: str
+    max_lag: int
+    observations: int
+    pairs: List[LeadLagPair]
+    errors: Dict[str, str] = {}
+
+class CorrelationViewResponse(BaseModel):
+    """Response model for a stored correlation view"""
+    name: str
+    labels: List[str]
+    matrix: List[List[Optional[float]]]
+    frequency: str
+    transform: str
+    observations: int
+    start_date: Optional[str] = None
+    first_date: str
+    last_date: str
+    created_at: str
+    updated_at: str
+    added: int = 0
+    errors: Dict[str, str] = {}
+
+class CorrelationViewSummary(BaseModel):
+    """Summary of a stored correlation view"""
+    name: str
+    stocks: List[str]
+    indicators: List[str]
+    frequency: str
+    transform: str
+    observations: int
+    last_date: str
+    updated_at: str
 
 class TranscriptAnalysisResponse(BaseModel):
     """Response model for transcript analysis"""
@@ -201,4 +376,60 @@ class TechnicalIndicatorResponse(BaseModel):
 
 class TechnicalIndicatorsListResponse(BaseModel):
     """Response model for the list of available technical indicators"""
-    indicators: Dict[str, str]
\ No newline at end of file
+    indicators: Dict[str, str]
+
+class ScreenerResultItem(BaseModel):
+    """Response model for a single screener match"""
+    rank: int
+    symbol: str
+    date: str
+    close: Optional[float] = None
+    score: Optional[float] = None
+    values: Dict[str, Optional[float]]
+
+class ScreenerResponse(BaseModel):
+    """Response model for a universe screen"""
+    expression: str
+    sort_by: str
+    ascending: bool
+    universe_size: int
+    evaluated: int
+    matched: int
+    results: List[ScreenerResultItem]
+    missing: List[str] = []
+    errors: Dict[str, str] = {}
+
+class BacktestMetrics(BaseModel):
+    """Response model for backtest performance statistics"""
+    total_return: float
+    cagr: float
+    volatility: float
+    sharpe: float
+    max_drawdown: float
+    turnover: float
+    exposure: float
+    trades: int
+
+class BacktestSymbolResult(BacktestMetrics):
+    """Response model for the backtest of a single symbol"""
+    symbol: str
+    start_date: str
+    end_date: str
+    benchmark_return: float
+
+class BacktestPortfolioResult(BacktestMetrics):
+    """Response model for the equal-weight portfolio of a backtest"""
+    equity_curve: List[Dict[str, Any]]
+
+class BacktestResponse(BaseModel):
+    """Response model for a rule backtest"""
+    entry: str
+    exit: Optional[str] = None
+    start_date: str
+    end_date: str
+    cost_bps: float
+    symbols_tested: int
+    portfolio: BacktestPortfolioResult
+    results: List[BacktestSymbolResult]
+    missing: List[str] = []
+    errors: Dict[str, str] = {}
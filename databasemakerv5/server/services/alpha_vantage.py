@@ -3,10 +3,23 @@ import pandas as pd
 from typing import Dict, List, Optional, Any
 import datetime
 import aiohttp
+from server.models.options_chain import OptionsChain
+from server.utils.rate_limit import RateLimiter
 from server.config import get_settings, get_logger
 
 logger = get_logger(__name__)
 
+# One request budget per API key, shared by every client instance
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide Alpha Vantage rate limiter"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = RateLimiter(get_settings().ALPHA_VANTAGE_REQUESTS_PER_MINUTE)
+    return _rate_limiter
+
 
 class AlphaVantageClient:
     """Client for interacting with Alpha Vantage API"""
@@ -50,6 +63,7 @@ class AlphaVantageClient:
     async def _make_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Make a request to Alpha Vantage API"""
         params['apikey'] = self.api_key
+        await get_rate_limiter().acquire()
 
         try:
             async with aiohttp.ClientSession() as session:
@@ -175,15 +189,21 @@ class AlphaVantageClient:
         return df
 
 
-    async def get_economic_data(self, indicator_name: str) -> pd.DataFrame:
-        """Get economic indicator data"""
+    async def get_economic_data(self, indicator_name: str, maturity: Optional[str] = None) -> pd.DataFrame:
+        """
+        Get economic indicator data
+
+        Args:
+            indicator_name: Indicator name (a key of macro_functions)
+            maturity: Optional maturity overriding indicator_maturity (Treasury Yield only)
+        """
         if indicator_name not in self.macro_functions:
             logger.warning(f"Unknown indicator: {indicator_name}")
             return pd.DataFrame()
 
         fn = self.macro_functions[indicator_name]
         interval = self.indicator_intervals.get(indicator_name, '')
-        maturity = self.indicator_maturity.get(indicator_name, '')
+        maturity = maturity or self.indicator_maturity.get(indicator_name, '')
 
         params = {
             'function': fn,
@@ -216,8 +236,8 @@ class AlphaVantageClient:
 
         return df
 
-    async def get_options_data(self, symbol: str, require_greeks: bool = False) -> List[Dict[str, Any]]:
-        """Get options data for a symbol"""
+    async def get_options_chain(self, symbol: str, require_greeks: bool = False) -> OptionsChain:
+        """Get the options chain of a symbol as column arrays (empty if unavailable)"""
         # Set up the request parameters
         params = {
             'function': 'REALTIME_OPTIONS',
@@ -234,49 +254,55 @@ class AlphaVantageClient:
 
             # Check if the response contains a data array
             if isinstance(data, dict) and 'data' in data and isinstance(data['data'], list):
-                # Map the Alpha Vantage response keys to our expected format
-                mapped_options = []
-                for option in data['data']:
-                    # Map fields to match your application's expected model
-                    mapped_option = {
-                        'contract_name': option.get('contractID', ''),
-                        'contract_type': option.get('type', ''),  # 'call' or 'put'
-                        'expiration_date': option.get('expiration', ''),
-                        'strike_price': float(option.get('strike', 0)),
-                        'last_price': float(option.get('last', 0)),
-                        'bid': float(option.get('bid', 0)),
-                        'ask': float(option.get('ask', 0)),
-                        'change': 0.0,  # Not provided by Alpha Vantage, set a default
-                        'change_percentage': 0.0,  # Not provided by Alpha Vantage, set a default
-                        'volume': int(option.get('volume', 0)),
-                        'open_interest': int(option.get('open_interest', 0)),
-                    }
-
-                    # Add Greeks if they exist and are requested
-                    if require_greeks and 'implied_volatility' in option:
-                        mapped_option.update({
-                            'implied_volatility': float(option.get('implied_volatility', 0)),
-                            'delta': float(option.get('delta', 0)),
-                            'gamma': float(option.get('gamma', 0)),
-                            'theta': float(option.get('theta', 0)),
-                            'vega': float(option.get('vega', 0)),
-                        })
-
-                    mapped_options.append(mapped_option)
-
-                return mapped_options
+                # Parse the contracts column by column
+                return OptionsChain.from_alpha_vantage(data['data'], require_greeks)
 
             # Check if there's a message about premium endpoint
             if isinstance(data, dict) and 'message' in data and 'premium' in data['message'].lower():
                 logger.warning("The REALTIME_OPTIONS endpoint requires a premium subscription to Alpha Vantage.")
-                return []
+                return OptionsChain.from_alpha_vantage([])
 
             logger.warning(
                 f"Unexpected response format for options data: {data.keys() if isinstance(data, dict) else type(data)}")
-            return []
+            return OptionsChain.from_alpha_vantage([])
         except Exception as e:
             logger.error(f"Error fetching options data from Alpha Vantage: {str(e)}")
-            return []
+            return OptionsChain.from_alpha_vantage([])
+
+    async def get_options_data(self, symbol: str, require_greeks: bool = False) -> List[Dict[str, Any]]:
+        """Get options data for a symbol"""
+        chain = await self.get_options_chain(symbol, require_greeks)
+        return chain.to_records(digits=None)
+
+    async def get_historical_options(self, symbol: str, date: str) -> OptionsChain:
+        """
+        Get the end-of-day options chain of a symbol on a past trading day
+
+        Args:
+            symbol: Stock symbol
+            date: Trading day in YYYY-MM-DD format
+
+        Returns:
+            Chain with implied volatility and Greeks (empty if there was no trading)
+        """
+        params = {
+            'function': 'HISTORICAL_OPTIONS',
+            'symbol': symbol,
+            'date': date
+        }
+
+        data = await self._make_request(params)
+
+        if isinstance(data, dict) and isinstance(data.get('data'), list):
+            return OptionsChain.from_alpha_vantage(data['data'], include_greeks=True)
+
+        # Premium and rate limit notices come back as a message instead of data
+        message = (data.get('Information') or data.get('message')) if isinstance(data, dict) else None
+        if message:
+            raise ValueError(str(message))
+
+        raise ValueError(f"Unexpected response format for historical options: "
+                         f"{list(data.keys()) if isinstance(data, dict) else type(data)}")
 
     async def get_market_movers(self) -> Dict[str, Any]:
         """Get market movers (gainers, losers, most active)"""
@@ -0,0 +1,218 @@
+# server/services/backtest_service.py
+import asyncio
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Optional, Any
+from server.services.bar_store import BarStore
+from server.utils.parallel import get_process_pool, get_worker_count, partition
+from server.utils.performance import signal_positions, performance_metrics
+from server.utils.technical import parse_expression, evaluate_expression
+from server.config import get_logger
+from server.config import get_settings
+
+logger = get_logger(__name__)
+
+MAX_SYMBOLS = 5000
+MAX_CURVE_POINTS = 500
+
+
+def _backtest_chunk(root: str, symbols: List[str], entry_text: str, exit_text: Optional[str],
+                    start_date: Optional[str], end_date: Optional[str], cost_bps: float) -> Dict[str, Any]:
+    """
+    Backtest a rule over a chunk of symbols (runs in a worker process)
+
+    Indicators are computed on the full stored history so the warm-up period
+    lies before the requested range, then everything is sliced to the range.
+    """
+    entry_expr = parse_expression(entry_text)
+    exit_expr = parse_expression(exit_text) if exit_text else None
+    start = pd.Timestamp(start_date) if start_date else None
+    end = pd.Timestamp(end_date) if end_date else None
+    cost = cost_bps / 10000.0
+
+    results = []
+    missing = []
+    errors = {}
+    returns_sum = None
+    exposure_sum = None
+    counts = None
+
+    for symbol in symbols:
+        try:
+            record = BarStore.read_local(root, symbol)
+            if not record or record["bars"].empty:
+                missing.append(symbol)
+                continue
+
+            df = record["bars"]
+            memo = {}
+            entry = evaluate_expression(df, entry_expr, memo)
+            exit = evaluate_expression(df, exit_expr, memo) if exit_expr else None
+
+            # A signal at the close of bar t is held over bar t + 1
+            positions = signal_positions(entry, exit)
+            held = np.concatenate(([0.0], positions[:-1]))
+
+            price_column = "adjusted_close" if "adjusted_close" in df.columns else "close"
+            prices = df[price_column].to_numpy(dtype=float)
+            asset_returns = np.zeros(len(prices))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                asset_returns[1:] = prices[1:] / prices[:-1] - 1.0
+            asset_returns = np.nan_to_num(asset_returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+            trades = np.abs(np.diff(positions, prepend=0.0))
+            strategy_returns = held * asset_returns - trades * cost
+
+            mask = np.ones(len(df), dtype=bool)
+            if start is not None:
+                mask &= df.index >= start
+            if end is not None:
+                mask &= df.index <= end
+            if not mask.any():
+                missing.append(symbol)
+                continue
+
+            dates = df.index[mask]
+            metrics = performance_metrics(strategy_returns[mask], held[mask])
+            metrics.update({
+                "symbol": symbol,
+                "start_date": dates[0].strftime('%Y-%m-%d'),
+                "end_date": dates[-1].strftime('%Y-%m-%d'),
+                "benchmark_return": round(float(np.prod(1.0 + asset_returns[mask]) - 1.0), 6)
+            })
+            results.append(metrics)
+
+            # Accumulate equal-weight portfolio sums on the union of dates
+            daily = pd.DataFrame({"returns": strategy_returns[mask], "exposure": held[mask], "count": 1.0},
+                                 index=dates)
+            if returns_sum is None:
+                returns_sum, exposure_sum, counts = daily["returns"], daily["exposure"], daily["count"]
+            else:
+                returns_sum = returns_sum.add(daily["returns"], fill_value=0.0)
+                exposure_sum = exposure_sum.add(daily["exposure"], fill_value=0.0)
+                counts = counts.add(daily["count"], fill_value=0.0)
+        except Exception as e:
+            errors[symbol] = str(e)
+
+    return {
+        "results": results,
+        "missing": missing,
+        "errors": errors,
+        "returns_sum": returns_sum,
+        "exposure_sum": exposure_sum,
+        "counts": counts
+    }
+
+
+class BacktestService:
+    """Service for vectorized backtesting of indicator rules over stored daily bars"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.bar_store = BarStore()
+
+    async def run_backtest(self,
+                           entry: str,
+                           symbols: List[str],
+                           exit: Optional[str] = None,
+                           start_date: Optional[str] = None,
+                           end_date: Optional[str] = None,
+                           cost_bps: float = 0.0,
+                           refresh: bool = False) -> Dict[str, Any]:
+        """
+        Backtest a long/flat rule on a list of symbols
+
+        Args:
+            entry: Entry condition, e.g. "SMA(50) crosses_above SMA(200)"
+            symbols: Symbols to test
+            exit: Optional exit condition; without it the position is held
+                  while the entry condition is true
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            cost_bps: Transaction cost in basis points per unit of turnover
+            refresh: Fetch missing or stale bars from the API first
+
+        Returns:
+            Per-symbol metrics and an equal-weight portfolio summary
+        """
+        # Validate up front so bad input is reported before any work is scheduled
+        parse_expression(entry)
+        if exit:
+            parse_expression(exit)
+
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols or [] if s.strip()))
+        if not symbols:
+            raise ValueError("At least one symbol must be specified")
+        if len(symbols) > MAX_SYMBOLS:
+            raise ValueError(f"Backtests are limited to {MAX_SYMBOLS} symbols")
+        if cost_bps < 0:
+            raise ValueError("cost_bps must not be negative")
+
+        try:
+            errors: Dict[str, str] = {}
+            if refresh:
+                errors.update(await self.bar_store.ensure_bars(symbols))
+
+            workers = get_worker_count(self.settings.COMPUTE_MAX_WORKERS)
+            pool = get_process_pool(self.settings.COMPUTE_MAX_WORKERS)
+            loop = asyncio.get_running_loop()
+
+            chunk_results = await asyncio.gather(*(
+                loop.run_in_executor(pool, _backtest_chunk, self.bar_store.root, chunk,
+                                     entry, exit, start_date, end_date, cost_bps)
+                for chunk in partition(symbols, workers * 4)
+            ))
+
+            results = []
+            missing = []
+            returns_sum = exposure_sum = counts = None
+            for chunk in chunk_results:
+                results.extend(chunk["results"])
+                missing.extend(chunk["missing"])
+                errors.update(chunk["errors"])
+                if chunk["counts"] is None:
+                    continue
+                if counts is None:
+                    returns_sum, exposure_sum, counts = chunk["returns_sum"], chunk["exposure_sum"], chunk["counts"]
+                else:
+                    returns_sum = returns_sum.add(chunk["returns_sum"], fill_value=0.0)
+                    exposure_sum = exposure_sum.add(chunk["exposure_sum"], fill_value=0.0)
+                    counts = counts.add(chunk["counts"], fill_value=0.0)
+
+            if not results:
+                raise ValueError("No stored data available for the requested symbols and date range")
+
+            # Equal-weight portfolio of all tested symbols, rebalanced daily
+            portfolio_returns = (returns_sum / counts).to_numpy()
+            portfolio_exposure = (exposure_sum / counts).to_numpy()
+            portfolio = performance_metrics(portfolio_returns, portfolio_exposure)
+            portfolio["trades"] = sum(r["trades"] for r in results)
+
+            equity = np.cumprod(1.0 + portfolio_returns)
+            step = max(1, int(np.ceil(len(equity) / MAX_CURVE_POINTS)))
+            points = np.unique(np.append(np.arange(0, len(equity), step), len(equity) - 1))
+            portfolio["equity_curve"] = [
+                {"date": counts.index[i].strftime('%Y-%m-%d'), "equity": round(float(equity[i]), 6)}
+                for i in points
+            ]
+
+            results.sort(key=lambda r: r["sharpe"], reverse=True)
+
+            return {
+                "entry": entry,
+                "exit": exit,
+                "start_date": counts.index[0].strftime('%Y-%m-%d'),
+                "end_date": counts.index[-1].strftime('%Y-%m-%d'),
+                "cost_bps": cost_bps,
+                "symbols_tested": len(results),
+                "portfolio": portfolio,
+                "results": results,
+                "missing": missing,
+                "errors": errors
+            }
+        except ValueError:
+            raise
+        except Exception as e:
+            # Internal failures, not bad input: let the route answer 500
+            logger.error(f"Error running backtest for '{entry}': {e}")
+            raise
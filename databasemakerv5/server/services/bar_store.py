@@ -0,0 +1,143 @@
+# server/services/bar_store.py
+import asyncio
+import os
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any
+from server.services.alpha_vantage import AlphaVantageClient
+from server.database.mongodb_helper import MongoDBHelper
+from server.utils.market_hours import quote_ttl
+from server.utils.storage import safe_filename, read_pickle, write_pickle
+from server.config import get_settings, get_logger
+
+logger = get_logger(__name__)
+
+INTRADAY_INTERVALS = ["1min", "5min", "15min", "30min", "60min"]
+
+
+class BarStore:
+    """Local on-disk store of OHLCV bars, refreshed from Alpha Vantage when stale"""
+
+    def __init__(self, client: Optional[AlphaVantageClient] = None):
+        self.client = client or AlphaVantageClient()
+        self.settings = get_settings()
+        self.root = os.path.join(self.settings.DATA_DIR, "bars")
+        self.max_age = timedelta(minutes=self.settings.BAR_STORE_MAX_AGE_MINUTES)
+
+    @staticmethod
+    def bar_path(root: str, symbol: str, interval: str = "daily") -> str:
+        """Get the file path holding the bars of a symbol"""
+        return os.path.join(root, interval, f"{safe_filename(symbol.upper())}.pkl")
+
+    @staticmethod
+    def read_local(root: str, symbol: str, interval: str = "daily") -> Optional[Dict[str, Any]]:
+        """
+        Read a stored bar record without touching the network
+
+        This is a plain function of its arguments so it can be called from
+        worker processes, which must not build the settings object.
+
+        Returns:
+            Dict with 'bars' (DataFrame) and 'fetched_at' (datetime), or None
+        """
+        return read_pickle(BarStore.bar_path(root, symbol, interval))
+
+    def list_symbols(self, interval: str = "daily") -> List[str]:
+        """List all symbols with locally stored bars"""
+        directory = os.path.join(self.root, interval)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".pkl"))
+
+    def max_age_for(self, interval: str, fetched_at: datetime) -> timedelta:
+        """
+        How long bars fetched at a given time stay current
+
+        Daily bars live BAR_STORE_MAX_AGE_MINUTES. Intraday bars live one bar
+        interval during the regular session, so every new bar is picked up,
+        and until the next open outside it.
+        """
+        if interval in INTRADAY_INTERVALS:
+            return timedelta(seconds=quote_ttl(int(interval[:-3]) * 60, fetched_at))
+        return self.max_age
+
+    def is_stale(self, record: Optional[Dict[str, Any]], interval: str = "daily") -> bool:
+        """Check whether a stored bar record needs to be refreshed"""
+        if not record or record.get("bars") is None or record["bars"].empty:
+            return True
+        return datetime.now() - record["fetched_at"] > self.max_age_for(interval, record["fetched_at"])
+
+    def last_bar_timestamp(self, symbol: str, interval: str = "daily") -> Optional[pd.Timestamp]:
+        """Get the timestamp of the last stored bar for a symbol"""
+        record = self.read_local(self.root, symbol, interval)
+        if not record or record["bars"].empty:
+            return None
+        return record["bars"].index[-1]
+
+    async def _fetch(self, symbol: str, interval: str) -> pd.DataFrame:
+        """Fetch bars for a symbol from Alpha Vantage"""
+        if interval in INTRADAY_INTERVALS:
+            return await self.client.get_time_series_intraday(symbol, interval)
+        return await self.client.get_time_series_daily(symbol)
+
+    async def get_bars(self, symbol: str, interval: str = "daily", refresh: bool = True) -> pd.DataFrame:
+        """
+        Get bars for a symbol, fetching from the API only when the local copy is stale
+
+        Args:
+            symbol: Stock symbol
+            interval: 'daily' or an intraday interval (1min, 5min, 15min, 30min, 60min)
+            refresh: If False, only the local copy is used
+
+        Returns:
+            DataFrame of bars indexed by timestamp (empty if unavailable)
+        """
+        symbol = symbol.upper()
+        record = self.read_local(self.root, symbol, interval)
+
+        if refresh and self.is_stale(record, interval):
+            try:
+                bars = await self._fetch(symbol, interval)
+                if not bars.empty:
+                    record = {"bars": bars, "fetched_at": datetime.now()}
+                    write_pickle(self.bar_path(self.root, symbol, interval), record)
+                    # Persist the new bars in the MongoDB time series, written behind the response
+                    await MongoDBHelper().store_bars(symbol, interval, bars)
+            except Exception as e:
+                # Serve the stale local copy if there is one
+                logger.error(f"Error refreshing bars for {symbol} ({interval}): {e}")
+                if not record:
+                    raise
+
+        if not record:
+            return pd.DataFrame()
+
+        return record["bars"]
+
+    async def ensure_bars(self, symbols: List[str], interval: str = "daily",
+                          max_concurrency: int = 5) -> Dict[str, str]:
+        """
+        Make sure fresh bars are stored locally for all symbols
+
+        Args:
+            symbols: Stock symbols
+            interval: Bar interval
+            max_concurrency: Maximum number of concurrent upstream requests
+
+        Returns:
+            Dict of symbol -> error message for symbols that could not be loaded
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        errors: Dict[str, str] = {}
+
+        async def load(symbol: str):
+            async with semaphore:
+                try:
+                    bars = await self.get_bars(symbol, interval)
+                    if bars.empty:
+                        errors[symbol] = "No data returned"
+                except Exception as e:
+                    errors[symbol] = str(e)
+
+        await asyncio.gather(*(load(symbol) for symbol in symbols))
+        return errors
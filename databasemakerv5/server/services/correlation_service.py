@@ -1,13 +1,59 @@
+import asyncio
+import hashlib
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Optional, Any
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Tuple
 from server.services.alpha_vantage import AlphaVantageClient
+from server.services.bar_store import BarStore
+from server.services.correlation_view_store import CorrelationViewStore
+from server.services.macro_store import MacroStore
+from server.utils.correlation import (output_points, rolling_correlation, pairwise_correlation,
+                                      top_k_pairs, threshold_pairs, correlation_matrix,
+                                      moment_sums, correlation_from_moments, LINKAGE_METHODS,
+                                      correlation_distance, linkage_matrix, leaf_order,
+                                      lagged_cross_correlation, to_json_list)
+from server.utils.cache import LRUCache
 from server.utils.data_processing import apply_date_filter
 from server.config import get_logger
 from server.config import get_settings
 
 logger = get_logger(__name__)
 
+# Resampling rule per supported frequency (None = keep daily observations)
+FREQUENCY_RULES = {
+    'daily': None,
+    'weekly': 'W-FRI',
+    'monthly': 'M'
+}
+
+TRANSFORMS = ('level', 'pct_change', 'log_return')
+METHODS = ('pearson', 'spearman', 'kendall')
+
+MAX_ROLLING_POINTS = 2000
+MAX_ROLLING_CELLS = 2_000_000
+MAX_UNIVERSE_SIZE = 5000
+
+# Shared across requests, since services are created per request
+_correlation_cache: Optional[LRUCache] = None
+
+
+def get_correlation_cache() -> LRUCache:
+    """Get the process-wide cache of correlation matrices and their clusterings"""
+    global _correlation_cache
+    if _correlation_cache is None:
+        _correlation_cache = LRUCache(get_settings().CORRELATION_CACHE_MAX_MB * 1024 * 1024)
+    return _correlation_cache
+
+
+def _fingerprint(df: pd.DataFrame) -> str:
+    """Hash the labels, dates and values of a frame, so cached results follow data revisions"""
+    digest = hashlib.sha1()
+    digest.update("|".join(map(str, df.columns)).encode())
+    digest.update(df.index.asi8.tobytes())
+    digest.update(np.ascontiguousarray(df.to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
 
 class CorrelationService:
     """Service for correlation analysis operations"""
@@ -15,67 +61,682 @@ class CorrelationService:
     def __init__(self):
         self.client = AlphaVantageClient()
         self.settings = get_settings()
+        self.bar_store = BarStore(self.client)
+        self.macro_store = MacroStore(self.client)
+        self.view_store = CorrelationViewStore()
+        self.cache = get_correlation_cache()
+
+    @staticmethod
+    def _resample(series: pd.Series, frequency: str) -> pd.Series:
+        """Resample a series to the end of each period of the given frequency"""
+        rule = FREQUENCY_RULES[frequency]
+        return series.resample(rule).last() if rule else series
+
+    async def _fetch_stock_series(self, symbol: str, start_date: Optional[str],
+                                  end_date: Optional[str], frequency: str = 'monthly') -> pd.Series:
+        """Fetch the period-end closing prices of a stock from the local bar store"""
+        df = await self.bar_store.get_bars(symbol)
+        if df.empty:
+            raise ValueError("No data returned")
+
+        df = apply_date_filter(df, start_date, end_date)
+        price_series = self._resample(df['close'], frequency)
+        price_series.name = symbol
+        return price_series
+
+    async def _fetch_indicator_series(self, indicator: str, start_date: Optional[str],
+                                      end_date: Optional[str], frequency: str = 'monthly') -> pd.Series:
+        """Fetch the period-end values of an economic indicator"""
+        if indicator not in self.client.macro_functions:
+            raise ValueError("Unknown indicator")
+
+        df = await self.macro_store.get_series(indicator)
+        if df.empty:
+            raise ValueError("No data returned")
+
+        df = apply_date_filter(df, start_date, end_date)
+        value_series = self._resample(df['value'], frequency)
+        value_series.name = indicator
+        return value_series
+
+    @staticmethod
+    def _combine(series: List[pd.Series], indicators: List[str], frequency: str = 'monthly',
+                 fill_indicators: Optional[bool] = None) -> pd.DataFrame:
+        """
+        Align series on a common index, keeping only complete rows
+
+        At daily and weekly frequency, indicator values are carried forward
+        until the next observation, since they are published far less often
+        than prices. fill_indicators forces this on or off at any frequency.
+        """
+        combined_df = pd.concat(series, axis=1)
+        if fill_indicators is None:
+            fill_indicators = frequency != 'monthly'
+        if fill_indicators:
+            indicator_columns = [c for c in combined_df.columns if c in indicators]
+            combined_df[indicator_columns] = combined_df[indicator_columns].ffill()
+        return combined_df.dropna()
+
+    @staticmethod
+    def _transform(combined_df: pd.DataFrame, transform: str) -> pd.DataFrame:
+        """Turn aligned levels into the values to correlate (levels, percent changes or log returns)"""
+        if transform == 'level':
+            return combined_df
+        if transform == 'pct_change':
+            changes = combined_df.pct_change(fill_method=None)
+        else:
+            non_positive = [c for c in combined_df.columns if (combined_df[c] <= 0).any()]
+            if non_positive:
+                raise ValueError(f"Log returns need positive values ({', '.join(non_positive)}); use pct_change")
+            changes = np.log(combined_df).diff()
+        return changes.replace([np.inf, -np.inf], np.nan).dropna()
+
+    async def _load_series(self,
+                           stocks: List[str],
+                           indicators: List[str],
+                           start_date: Optional[str] = None,
+                           end_date: Optional[str] = None,
+                           frequency: str = 'monthly') -> Tuple[List[pd.Series], Dict[str, str]]:
+        """
+        Fetch all stock and indicator series concurrently
+
+        Requests are issued together under a bounded semaphore, so the total
+        latency approaches that of the slowest single fetch. A failing series
+        is left out and reported instead of failing the whole request.
+
+        Returns:
+            Tuple of (series in request order, dict of name -> error message)
+        """
+        semaphore = asyncio.Semaphore(self.settings.UPSTREAM_MAX_CONCURRENCY)
+
+        async def fetch(fetcher, name: str) -> pd.Series:
+            async with semaphore:
+                return await fetcher(name, start_date, end_date, frequency)
+
+        names = list(stocks) + list(indicators)
+        results = await asyncio.gather(
+            *(fetch(self._fetch_stock_series, symbol) for symbol in stocks),
+            *(fetch(self._fetch_indicator_series, indicator) for indicator in indicators),
+            return_exceptions=True
+        )
+
+        series = []
+        errors = {}
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Skipping {name} in correlation analysis: {result}")
+                errors[name] = str(result)
+            else:
+                series.append(result)
+
+        return series, errors
 
     async def calculate_correlation(self,
                                     stocks: Optional[List[str]] = None,
                                     indicators: Optional[List[str]] = None,
                                     start_date: Optional[str] = None,
-                                    end_date: Optional[str] = None) -> Dict[str, Any]:
-        """Calculate correlation between stocks and/or indicators"""
+                                    end_date: Optional[str] = None,
+                                    method: str = 'pearson',
+                                    transform: str = 'level',
+                                    frequency: str = 'monthly',
+                                    cluster: bool = False,
+                                    linkage: str = 'average') -> Dict[str, Any]:
+        """
+        Calculate correlation between stocks and/or indicators
+
+        Matrices and clusterings are cached by a fingerprint of the aligned
+        input data, so repeated requests over unchanged data skip the
+        computation.
+
+        Args:
+            stocks: Stock symbols
+            indicators: Economic indicator names
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            method: 'pearson', 'spearman' or 'kendall'
+            transform: Correlate 'level' values, 'pct_change' or 'log_return'
+            frequency: 'daily', 'weekly' or 'monthly'
+            cluster: Return labels and matrix in hierarchical cluster order,
+                     with the dendrogram
+            linkage: Linkage method for clustering ('average', 'complete' or 'single')
+        """
         stocks = stocks or []
         indicators = indicators or []
 
         if not stocks and not indicators:
             raise ValueError("At least one stock or indicator must be specified")
+        if linkage not in LINKAGE_METHODS:
+            raise ValueError(f"Unsupported linkage: {linkage} (use {', '.join(LINKAGE_METHODS)})")
+        if method not in METHODS:
+            raise ValueError(f"Unsupported method: {method} (use {', '.join(METHODS)})")
+        if transform not in TRANSFORMS:
+            raise ValueError(f"Unsupported transform: {transform} (use {', '.join(TRANSFORMS)})")
+        if frequency not in FREQUENCY_RULES:
+            raise ValueError(f"Unsupported frequency: {frequency} (use {', '.join(FREQUENCY_RULES)})")
 
         try:
-            # Build combined dataframe
-            dfs = []
-
-            # Get stock data
-            for symbol in stocks:
-                df = await self.client.get_time_series_daily(symbol)
-                if df.empty:
-                    continue
-
-                df = apply_date_filter(df, start_date, end_date)
-                price_series = df['close'].resample('M').last()  # Monthly data for correlation
-                price_series.name = symbol
-                dfs.append(price_series)
-
-            # Get indicator data
-            for indicator in indicators:
-                if indicator not in self.client.macro_functions:
-                    continue
-
-                df = await self.client.get_economic_data(indicator)
-                if df.empty:
-                    continue
-
-                df = apply_date_filter(df, start_date, end_date)
-                value_series = df['value'].resample('M').last()  # Monthly data for correlation
-                value_series.name = indicator
-                dfs.append(value_series)
+            # Fetch all stock and indicator data concurrently
+            dfs, errors = await self._load_series(stocks, indicators, start_date, end_date, frequency)
 
             # Combine and calculate correlation
             if len(dfs) < 2:
                 raise ValueError("Insufficient data for correlation analysis")
 
-            combined_df = pd.concat(dfs, axis=1)
-            combined_df.dropna(inplace=True)
+            combined_df = self._transform(self._combine(dfs, indicators, frequency), transform)
 
-            if combined_df.empty or combined_df.shape[1] < 2:
+            if len(combined_df) < 3 or combined_df.shape[1] < 2:
                 raise ValueError("No overlapping data available for correlation analysis")
 
-            corr_matrix = combined_df.corr(method='pearson').round(2)
+            key = _fingerprint(combined_df)
+            matrix = self.cache.get(("matrix", key, method))
+            if matrix is None:
+                matrix = correlation_matrix(combined_df.to_numpy(dtype=float), method)
+                self.cache.set(("matrix", key, method), matrix)
+
+            labels = list(combined_df.columns)
+            order = dendrogram = None
+            if cluster:
+                tree = self.cache.get(("linkage", key, method, linkage))
+                if tree is None:
+                    tree = linkage_matrix(correlation_distance(matrix), linkage)
+                    self.cache.set(("linkage", key, method, linkage), tree)
+                order = leaf_order(tree)
+                # Renumber leaves to their position in the reordered output
+                position = np.empty(len(order), dtype=int)
+                position[order] = np.arange(len(order))
+                dendrogram = tree.copy()
+                leaves = dendrogram[:, :2] < len(order)
+                dendrogram[:, :2][leaves] = position[dendrogram[:, :2][leaves].astype(int)]
+                dendrogram[:, :2].sort(axis=1)
+                labels = [labels[i] for i in order]
+                matrix = matrix[np.ix_(order, order)]
 
             # Convert correlation matrix to a format suitable for JSON response
             corr_data = {
-                "labels": list(corr_matrix.columns),
-                "matrix": corr_matrix.values.tolist()
+                "labels": labels,
+                "matrix": to_json_list(matrix, 2),
+                "method": method,
+                "transform": transform,
+                "frequency": frequency,
+                "observations": len(combined_df),
+                "order": order,
+                "dendrogram": None if dendrogram is None else [
+                    [int(a), int(b), round(float(height), 6), int(size)] for a, b, height, size in dendrogram
+                ],
+                "errors": errors
             }
 
             return corr_data
         except Exception as e:
             logger.error(f"Error calculating correlation: {e}")
-            raise ValueError(f"Failed to calculate correlation: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Failed to calculate correlation: {str(e)}")
+
+    async def calculate_rolling_correlation(self,
+                                            stocks: Optional[List[str]] = None,
+                                            indicators: Optional[List[str]] = None,
+                                            window: int = 12,
+                                            frequency: str = 'monthly',
+                                            pairs: Optional[List[str]] = None,
+                                            start_date: Optional[str] = None,
+                                            end_date: Optional[str] = None,
+                                            max_points: int = 250) -> Dict[str, Any]:
+        """
+        Calculate a time series of rolling correlation matrices
+
+        Args:
+            stocks: Stock symbols
+            indicators: Economic indicator names
+            window: Window length in periods of the chosen frequency
+            frequency: 'daily', 'weekly' or 'monthly'
+            pairs: Optional pairs to return instead of full matrices, as "A:B"
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            max_points: Maximum number of windows to return (evenly spaced, latest included)
+
+        Returns:
+            Dates of each window end and either matrices or per-pair series
+        """
+        stocks = stocks or []
+        indicators = indicators or []
+
+        if len(stocks) + len(indicators) < 2:
+            raise ValueError("At least two stocks or indicators must be specified")
+        if frequency not in FREQUENCY_RULES:
+            raise ValueError(f"Unsupported frequency: {frequency} (use {', '.join(FREQUENCY_RULES)})")
+        if window < 2:
+            raise ValueError("Window must be at least 2 periods")
+        max_points = max(1, min(max_points, MAX_ROLLING_POINTS))
+
+        try:
+            dfs, errors = await self._load_series(stocks, indicators, start_date, end_date, frequency)
+            if len(dfs) < 2:
+                raise ValueError("Insufficient data for correlation analysis")
+
+            combined_df = self._combine(dfs, indicators, frequency)
+            labels = list(combined_df.columns)
+
+            if len(combined_df) < window:
+                raise ValueError(f"Only {len(combined_df)} overlapping periods available for a window of {window}")
+
+            pair_indices = None
+            if pairs:
+                pair_indices = []
+                for pair in pairs:
+                    parts = pair.split(':')
+                    if len(parts) != 2 or parts[0] not in labels or parts[1] not in labels:
+                        raise ValueError(f"Invalid pair '{pair}': use A:B with names from the request")
+                    pair_indices.append((labels.index(parts[0]), labels.index(parts[1])))
+            else:
+                # Keep the payload bounded for large matrices
+                max_points = max(1, min(max_points, MAX_ROLLING_CELLS // (len(labels) ** 2)))
+
+            windows = len(combined_df) - window + 1
+            ends = output_points(windows, max_points) + window - 1
+            values = rolling_correlation(combined_df.to_numpy(dtype=float), window, ends, pair_indices)
+
+            result = {
+                "labels": labels,
+                "window": window,
+                "frequency": frequency,
+                "dates": combined_df.index[ends].strftime('%Y-%m-%d').tolist(),
+                "errors": errors
+            }
+
+            if pair_indices is not None:
+                result["pairs"] = [
+                    {"pair": [labels[i], labels[j]], "values": to_json_list(values[:, k], 4)}
+                    for k, (i, j) in enumerate(pair_indices)
+                ]
+            else:
+                result["matrices"] = to_json_list(values, 4)
+
+            return result
+        except Exception as e:
+            logger.error(f"Error calculating rolling correlation: {e}")
+            raise ValueError(f"Failed to calculate rolling correlation: {str(e)}")
+
+
+    async def calculate_correlation_pairs(self,
+                                          stocks: Optional[List[str]] = None,
+                                          indicators: Optional[List[str]] = None,
+                                          frequency: str = 'daily',
+                                          top_k: int = 5,
+                                          threshold: Optional[float] = None,
+                                          max_pairs: int = 1000,
+                                          min_periods: int = 20,
+                                          start_date: Optional[str] = None,
+                                          end_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Find the most strongly related pairs in a large universe
+
+        Correlations are computed on period returns, with missing data
+        handled pairwise, and only the strongest relationships are returned
+        instead of the full N x N matrix.
+
+        Args:
+            stocks: Stock symbols
+            indicators: Economic indicator names
+            frequency: 'daily', 'weekly' or 'monthly'
+            top_k: Number of most and least correlated partners per series
+            threshold: If given, return all pairs with |correlation| >= threshold instead
+            max_pairs: Maximum number of pairs in threshold mode
+            min_periods: Minimum number of shared observations per pair
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+
+        Returns:
+            Per-series top-k partners, or a sparse list of pairs
+        """
+        stocks = list(dict.fromkeys(s.strip().upper() for s in stocks or [] if s.strip()))
+        indicators = indicators or []
+
+        if len(stocks) + len(indicators) < 2:
+            raise ValueError("At least two stocks or indicators must be specified")
+        if len(stocks) + len(indicators) > MAX_UNIVERSE_SIZE:
+            raise ValueError(f"Universe is limited to {MAX_UNIVERSE_SIZE} series")
+        if frequency not in FREQUENCY_RULES:
+            raise ValueError(f"Unsupported frequency: {frequency} (use {', '.join(FREQUENCY_RULES)})")
+
+        try:
+            dfs, errors = await self._load_series(stocks, indicators, start_date, end_date, frequency)
+            if len(dfs) < 2:
+                raise ValueError("Insufficient data for correlation analysis")
+
+            # Keep all rows; gaps are handled pairwise rather than by dropping dates
+            levels = pd.concat(dfs, axis=1)
+            if FREQUENCY_RULES[frequency] is None:
+                indicator_columns = [c for c in levels.columns if c in indicators]
+                levels[indicator_columns] = levels[indicator_columns].ffill()
+            returns = levels.pct_change(fill_method=None).iloc[1:]
+            returns = returns.replace([np.inf, -np.inf], np.nan)
+
+            labels = list(returns.columns)
+            corr, counts = pairwise_correlation(returns.to_numpy(dtype=float), min_periods)
+
+            result = {
+                "frequency": frequency,
+                "series": len(labels),
+                "observations": len(returns),
+                "mode": "threshold" if threshold is not None else "top_k",
+                "errors": errors
+            }
+
+            if threshold is not None:
+                rows, cols = threshold_pairs(corr, threshold, max_pairs)
+                result["pairs"] = [
+                    {"a": labels[i], "b": labels[j], "correlation": round(float(corr[i, j]), 4),
+                     "observations": int(counts[i, j])}
+                    for i, j in zip(rows, cols)
+                ]
+                return result
+
+            def partners(i: int, indices: np.ndarray) -> List[Dict[str, Any]]:
+                return [
+                    {"symbol": labels[j], "correlation": round(float(corr[i, j]), 4),
+                     "observations": int(counts[i, j])}
+                    for j in indices if not np.isnan(corr[i, j])
+                ]
+
+            most, least = top_k_pairs(corr, top_k)
+            result["top"] = [
+                {"symbol": label, "most": partners(i, most[i]), "least": partners(i, least[i])}
+                for i, label in enumerate(labels)
+            ]
+            return result
+        except Exception as e:
+            logger.error(f"Error calculating correlation pairs: {e}")
+            raise ValueError(f"Failed to calculate correlation pairs: {str(e)}")
+
+    async def calculate_lead_lag(self,
+                                 stocks: List[str],
+                                 indicators: Optional[List[str]] = None,
+                                 max_lag: int = 12,
+                                 frequency: str = 'monthly',
+                                 transform: str = 'pct_change',
+                                 include_curve: bool = False,
+                                 start_date: Optional[str] = None,
+                                 end_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Find the lag at which each indicator is most correlated with each stock
+
+        Args:
+            stocks: Stock symbols
+            indicators: Economic indicator names (all known indicators if omitted)
+            max_lag: Largest lead or lag tested, in periods of the frequency
+            frequency: 'daily', 'weekly' or 'monthly'
+            transform: Correlate 'level' values, 'pct_change' or 'log_return'
+            include_curve: Also return the correlation at every lag
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+
+        Returns:
+            One entry per (indicator, stock) pair, strongest first. A positive
+            best_lag means the indicator leads the stock by that many periods.
+        """
+        stocks = list(dict.fromkeys(stocks or []))
+        indicators = list(dict.fromkeys(indicators or self.client.macro_functions))
+
+        if not stocks:
+            raise ValueError("At least one stock must be specified")
+        if len(stocks) > MAX_UNIVERSE_SIZE:
+            raise ValueError(f"Lead-lag analysis is limited to {MAX_UNIVERSE_SIZE} stocks")
+        if max_lag < 1:
+            raise ValueError("max_lag must be at least 1")
+        if transform not in TRANSFORMS:
+            raise ValueError(f"Unsupported transform: {transform} (use {', '.join(TRANSFORMS)})")
+        if frequency not in FREQUENCY_RULES:
+            raise ValueError(f"Unsupported frequency: {frequency} (use {', '.join(FREQUENCY_RULES)})")
+
+        try:
+            series, errors = await self._load_series(stocks, indicators, start_date, end_date, frequency)
+
+            # Indicators published less often than the frequency keep their last value
+            combined_df = self._combine(series, indicators, frequency, fill_indicators=True)
+            values = self._transform(combined_df, transform)
+
+            leaders = [c for c in values.columns if c in indicators]
+            followers = [c for c in values.columns if c not in indicators]
+            if not leaders or not followers:
+                raise ValueError("Need data for at least one indicator and one stock")
+            if len(values) < 2 * max_lag + 3:
+                raise ValueError(f"Only {len(values)} overlapping observations; reduce max_lag "
+                                 f"or widen the date range")
+
+            corr = lagged_cross_correlation(values[leaders].to_numpy(dtype=float),
+                                            values[followers].to_numpy(dtype=float), max_lag)
+            strength = np.nan_to_num(np.abs(corr), nan=-1.0)
+            best = strength.argmax(axis=0)
+
+            pairs = []
+            for i, indicator in enumerate(leaders):
+                for j, stock in enumerate(followers):
+                    k = best[i, j]
+                    if np.isnan(corr[k, i, j]):
+                        continue
+                    pair = {
+                        "indicator": indicator,
+                        "stock": stock,
+                        "best_lag": int(k - max_lag),
+                        "correlation": round(float(corr[k, i, j]), 4),
+                        "lag0_correlation": None if np.isnan(corr[max_lag, i, j])
+                        else round(float(corr[max_lag, i, j]), 4),
+                        "observations": len(values) - abs(int(k - max_lag))
+                    }
+                    if include_curve:
+                        pair["curve"] = to_json_list(corr[:, i, j], 4)
+                    pairs.append(pair)
+
+            pairs.sort(key=lambda p: abs(p["correlation"]), reverse=True)
+
+            return {
+                "frequency": frequency,
+                "transform": transform,
+                "max_lag": max_lag,
+                "observations": len(values),
+                "pairs": pairs,
+                "errors": errors
+            }
+        except Exception as e:
+            logger.error(f"Error calculating lead-lag correlation: {e}")
+            raise ValueError(f"Failed to calculate lead-lag correlation: {str(e)}")
+
+    @staticmethod
+    def _completed_periods(combined_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Keep only rows whose period has ended
+
+        Rows are labelled with the last day of their period, so the current
+        day, week or month is still open until that label lies in the past.
+        Open periods must not be folded into a view, since their values can
+        still change.
+        """
+        return combined_df[combined_df.index < pd.Timestamp.now().normalize()]
+
+    async def _load_view_frame(self, record: Dict[str, Any],
+                               since: Optional[pd.Timestamp] = None) -> Tuple[pd.DataFrame, Dict[str, str]]:
+        """
+        Load the aligned levels of all series in a view
+
+        With since, only the periods after it are loaded. Each series is
+        seeded with its last folded level at since, so indicators published
+        less often than the view's frequency carry their value forward
+        without their history being read.
+        """
+        start = since.strftime('%Y-%m-%d') if since is not None else record["start_date"]
+        series, errors = await self._load_series(record["stocks"], record["indicators"],
+                                                 start, None, record["frequency"])
+        if errors:
+            return pd.DataFrame(), errors
+        if since is not None:
+            last_levels = dict(zip(record["labels"], record["last_levels"]))
+            series = [pd.concat([pd.Series([last_levels[s.name]], index=[since], name=s.name), s[s.index > since]])
+                      for s in series]
+        combined_df = self._combine(series, record["indicators"], record["frequency"])
+        return self._completed_periods(combined_df)[record["labels"]], errors
+
+    @staticmethod
+    def _view_response(record: Dict[str, Any], added: int = 0,
+                       errors: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Build the correlation matrix of a view from its stored sums"""
+        matrix = correlation_from_moments(record["count"], record["sums"], record["cross"])
+        return {
+            "name": record["name"],
+            "labels": record["labels"],
+            "matrix": to_json_list(matrix, 2),
+            "frequency": record["frequency"],
+            "transform": record["transform"],
+            "observations": record["count"],
+            "start_date": record["start_date"],
+            "first_date": record["first_date"].strftime('%Y-%m-%d'),
+            "last_date": record["last_date"].strftime('%Y-%m-%d'),
+            "created_at": record["created_at"].isoformat(),
+            "updated_at": record["updated_at"].isoformat(),
+            "added": added,
+            "errors": errors or {}
+        }
+
+    async def create_view(self,
+                          name: str,
+                          stocks: Optional[List[str]] = None,
+                          indicators: Optional[List[str]] = None,
+                          frequency: str = 'monthly',
+                          transform: str = 'level',
+                          start_date: Optional[str] = None,
+                          overwrite: bool = False) -> Dict[str, Any]:
+        """
+        Create a named correlation view and store its sufficient statistics
+
+        The full history is read once here; afterwards the view is only
+        extended with new periods (see get_view).
+
+        Args:
+            name: View name (letters, digits, '-' and '_')
+            stocks: Stock symbols
+            indicators: Economic indicator names
+            frequency: 'daily', 'weekly' or 'monthly'
+            transform: Correlate 'level' values, 'pct_change' or 'log_return'
+            start_date: Optional start date in YYYY-MM-DD format
+            overwrite: Replace an existing view with the same name
+        """
+        stocks = list(dict.fromkeys(stocks or []))
+        indicators = list(dict.fromkeys(indicators or []))
+
+        self.view_store.validate_name(name)
+        if len(stocks) + len(indicators) < 2:
+            raise ValueError("A view needs at least two stocks or indicators")
+        if transform not in TRANSFORMS:
+            raise ValueError(f"Unsupported transform: {transform} (use {', '.join(TRANSFORMS)})")
+        if frequency not in FREQUENCY_RULES:
+            raise ValueError(f"Unsupported frequency: {frequency} (use {', '.join(FREQUENCY_RULES)})")
+        if not overwrite and self.view_store.exists(name):
+            raise ValueError(f"Correlation view already exists: {name}")
+
+        try:
+            record = {
+                "name": name,
+                "stocks": stocks,
+                "indicators": indicators,
+                "labels": stocks + indicators,
+                "frequency": frequency,
+                "transform": transform,
+                "start_date": start_date
+            }
+
+            levels, errors = await self._load_view_frame(record)
+            if errors:
+                raise ValueError("Could not load " + "; ".join(f"{k}: {v}" for k, v in errors.items()))
+
+            values = self._transform(levels, transform)
+            if len(values) < 3:
+                raise ValueError("No overlapping data available for correlation analysis")
+
+            shift = values.iloc[0].to_numpy(dtype=float)
+            count, sums, cross = moment_sums(values.to_numpy(dtype=float), shift)
+            now = datetime.now()
+            record.update({
+                "count": count,
+                "shift": shift,
+                "sums": sums,
+                "cross": cross,
+                "first_date": values.index[0],
+                "last_date": levels.index[-1],
+                "last_levels": levels.iloc[-1].to_numpy(dtype=float),
+                "created_at": now,
+                "updated_at": now
+            })
+            self.view_store.write(record)
+
+            return self._view_response(record, added=count)
+        except Exception as e:
+            logger.error(f"Error creating correlation view {name}: {e}")
+            raise ValueError(f"Failed to create correlation view: {str(e)}")
+
+    async def get_view(self, name: str, refresh: bool = True) -> Dict[str, Any]:
+        """
+        Get the correlation matrix of a stored view
+
+        With refresh, periods completed since the last update are loaded,
+        transformed and added to the stored sums; history is never re-read,
+        so an update costs O(new periods * N^2) and serving the matrix costs
+        O(N^2). If a series cannot be loaded the stored matrix is served
+        unchanged and the failure is reported.
+
+        Args:
+            name: View name
+            refresh: Fold in newly completed periods before answering
+        """
+        record = self.view_store.read(name)
+        if record is None:
+            raise LookupError(f"Correlation view not found: {name}")
+
+        try:
+            if not refresh:
+                return self._view_response(record)
+
+            levels, errors = await self._load_view_frame(record, since=record["last_date"])
+            new_levels = levels[levels.index > record["last_date"]]
+            if new_levels.empty:
+                return self._view_response(record, errors=errors)
+
+            # Prepend the last folded row so changes of the first new period are defined
+            previous = pd.DataFrame([record["last_levels"]], columns=record["labels"],
+                                    index=[record["last_date"]])
+            values = self._transform(pd.concat([previous, new_levels]), record["transform"])
+            values = values[values.index > record["last_date"]]
+
+            count, sums, cross = moment_sums(values.to_numpy(dtype=float), record["shift"])
+            record.update({
+                "count": record["count"] + count,
+                "sums": record["sums"] + sums,
+                "cross": record["cross"] + cross,
+                "last_date": new_levels.index[-1],
+                "last_levels": new_levels.iloc[-1].to_numpy(dtype=float),
+                "updated_at": datetime.now()
+            })
+            self.view_store.write(record)
+
+            return self._view_response(record, added=count)
+        except Exception as e:
+            logger.error(f"Error updating correlation view {name}: {e}")
+            raise ValueError(f"Failed to update correlation view: {str(e)}")
+
+    def list_views(self) -> List[Dict[str, Any]]:
+        """List stored correlation views"""
+        return [
+            {
+                "name": record["name"],
+                "stocks": record["stocks"],
+                "indicators": record["indicators"],
+                "frequency": record["frequency"],
+                "transform": record["transform"],
+                "observations": record["count"],
+                "last_date": record["last_date"].strftime('%Y-%m-%d'),
+                "updated_at": record["updated_at"].isoformat()
+            }
+            for record in self.view_store.list_views()
+        ]
+
+    def delete_view(self, name: str) -> None:
+        """Delete a stored correlation view"""
+        if not self.view_store.delete(name):
+            raise LookupError(f"Correlation view not found: {name}")
@@ -0,0 +1,67 @@
+# server/services/correlation_view_store.py
+import os
+import re
+from typing import Dict, List, Optional, Any
+from server.utils.storage import read_pickle, write_pickle
+from server.config import get_settings
+
+VIEW_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class CorrelationViewStore:
+    """
+    Local on-disk store of named correlation views
+
+    A view record holds its definition (stocks, indicators, frequency,
+    transform) and the sufficient statistics of everything folded in so far:
+    observation count, shift row, column sums and cross-product sums, plus the
+    date and values of the last folded row.
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.root = os.path.join(self.settings.DATA_DIR, "correlation_views")
+
+    @staticmethod
+    def validate_name(name: str) -> str:
+        """Check that a view name is usable as a file name"""
+        if not VIEW_NAME_PATTERN.match(name or ""):
+            raise ValueError("View names must be 1-64 letters, digits, '-' or '_'")
+        return name
+
+    def view_path(self, name: str) -> str:
+        """Get the file path holding a view"""
+        return os.path.join(self.root, f"{self.validate_name(name)}.pkl")
+
+    def exists(self, name: str) -> bool:
+        """Check whether a view is stored"""
+        return os.path.exists(self.view_path(name))
+
+    def read(self, name: str) -> Optional[Dict[str, Any]]:
+        """Read a stored view record, or None if it does not exist"""
+        return read_pickle(self.view_path(name))
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Store a view record"""
+        write_pickle(self.view_path(record["name"]), record)
+
+    def delete(self, name: str) -> bool:
+        """
+        Delete a stored view
+
+        Returns:
+            True if the view existed
+        """
+        path = self.view_path(name)
+        if not os.path.exists(path):
+            return False
+        os.remove(path)
+        return True
+
+    def list_views(self) -> List[Dict[str, Any]]:
+        """List all stored view records"""
+        if not os.path.isdir(self.root):
+            return []
+        records = (read_pickle(os.path.join(self.root, name))
+                   for name in sorted(os.listdir(self.root)) if name.endswith(".pkl"))
+        return [record for record in records if record]
@@ -75,14 +75,8 @@ class IBKRService:
         self.client_id: int = settings.TWS_CLIENT_ID
         # timeout in seconds for TWS calls
         self.timeout: int = getattr(settings, "TWS_TIMEOUT", 10)
-        # Initialize MongoDB helper and connect
-        try:
-            self.db_helper = MongoDBHelper()
-            connected = self.db_helper.connect()
-            if not connected:
-                logger.error("Failed to connect to MongoDB in IBKRService")
-        except Exception as e:
-            logger.error(f"Exception initializing MongoDBHelper: {e}")
+        # MongoDB helper on the app's shared client
+        self.db_helper = MongoDBHelper()
 
     def _start_client(self, client: _TWSClient):
         client.run()
@@ -171,8 +165,7 @@ class IBKRService:
         summary = await loop.run_in_executor(None, self._fetch_account_summary)
         # Store summary in MongoDB
         try:
-            if hasattr(self, 'db_helper'):
-                self.db_helper.store_ibkr_summary(summary)
+            await self.db_helper.store_ibkr_summary(summary)
         except Exception as e:
             logger.error(f"Failed to store IBKR summary in MongoDB: {e}")
         return summary
@@ -182,8 +175,7 @@ class IBKRService:
         positions = await loop.run_in_executor(None, self._fetch_positions)
         # Store positions in MongoDB
         try:
-            if hasattr(self, 'db_helper'):
-                self.db_helper.store_ibkr_positions(positions)
+            await self.db_helper.store_ibkr_positions(positions)
         except Exception as e:
             logger.error(f"Failed to store IBKR positions in MongoDB: {e}")
         return positions
@@ -1,12 +1,61 @@
+import asyncio
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Optional, Any
+from pandas.tseries.frequencies import to_offset
+from typing import List, Dict, Optional, Any, Tuple
 from server.services.alpha_vantage import AlphaVantageClient
+from server.services.macro_store import MacroStore
+from server.utils.cache import LRUCache
 from server.utils.data_processing import apply_date_filter
 from server.config import get_logger
 from server.config import get_settings
 
 logger = get_logger(__name__)
 
+YIELD_CURVE_MATURITIES = ['3month', '2year', '5year', '7year', '10year', '30year']
+
+# Spread name -> (long maturity, short maturity), in percentage points
+YIELD_CURVE_SPREADS = {
+    '2s10s': ('10year', '2year'),
+    '3m10y': ('10year', '3month')
+}
+
+# Panel frequency -> calendar of period-end dates
+PANEL_FREQUENCIES = {
+    'D': 'D',
+    'W': 'W-FRI',
+    'M': 'M',
+    'Q': 'Q',
+    'A': 'A'
+}
+
+MAX_PANEL_SERIES = 30
+# Calendar dates per panel (about 27 years of daily dates), keeping the payload bounded
+MAX_PANEL_DATES = 10_000
+
+# Shared across requests, since services are created per request
+_macro_cache: Optional[LRUCache] = None
+
+
+def get_macro_cache() -> LRUCache:
+    """Get the process-wide cache of aligned macro results"""
+    global _macro_cache
+    if _macro_cache is None:
+        _macro_cache = LRUCache(get_settings().MACRO_CACHE_MAX_MB * 1024 * 1024)
+    return _macro_cache
+
+
+def _series_version(df: pd.DataFrame) -> Tuple:
+    """Identify the stored version of a series, so cached results follow new releases"""
+    if df.empty:
+        return (0,)
+    return (len(df), df.index[-1], float(df['value'].iloc[-1]))
+
+
+def _column_values(values: np.ndarray) -> List[Optional[float]]:
+    """Convert a column to a JSON list, with None for missing values"""
+    return [None if np.isnan(v) else round(float(v), 4) for v in values]
+
 
 class IndicatorsService:
     """Service for economic indicators operations"""
@@ -14,6 +63,8 @@ class IndicatorsService:
     def __init__(self):
         self.client = AlphaVantageClient()
         self.settings = get_settings()
+        self.macro_store = MacroStore(self.client)
+        self.cache = get_macro_cache()
 
     async def get_indicator_data(self, indicator_name: str, start_date: Optional[str] = None,
                                  end_date: Optional[str] = None) -> List[Dict[str, Any]]:
@@ -22,7 +73,7 @@ class IndicatorsService:
             raise ValueError(f"Unknown indicator: {indicator_name}")
 
         try:
-            df = await self.client.get_economic_data(indicator_name)
+            df = await self.macro_store.get_series(indicator_name)
 
             if df.empty:
                 raise ValueError(f"No data found for indicator: {indicator_name}")
@@ -40,6 +91,181 @@ class IndicatorsService:
             logger.error(f"Error getting indicator data for {indicator_name}: {e}")
             raise ValueError(f"Failed to get indicator data: {str(e)}")
 
+    async def get_yield_curve(self, start_date: Optional[str] = None,
+                              end_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get treasury yields for all maturities on a common date index, with spreads
+
+        All maturities are loaded concurrently through the macro store. Dates
+        are the union of all series; a maturity without an observation on a
+        date (e.g. the 30-year during its 2002-2006 suspension) is None there,
+        and so are the spreads that depend on it.
+
+        Args:
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+
+        Returns:
+            Columnar dict of dates, yields per maturity, spreads and the latest curve
+        """
+        try:
+            results = await asyncio.gather(
+                *(self.macro_store.get_series('Treasury Yield', maturity) for maturity in YIELD_CURVE_MATURITIES),
+                return_exceptions=True
+            )
+
+            series = {}
+            errors = {}
+            for maturity, result in zip(YIELD_CURVE_MATURITIES, results):
+                if isinstance(result, BaseException):
+                    errors[maturity] = str(result)
+                elif result.empty:
+                    errors[maturity] = "No data returned"
+                else:
+                    series[maturity] = result
+            if not series:
+                raise ValueError("No treasury yield data available")
+
+            key = ("yield_curve", start_date, end_date,
+                   tuple((m, _series_version(df)) for m, df in series.items()))
+            cached = self.cache.get(key)
+            if cached is not None:
+                return dict(cached, errors=errors)
+
+            curve = pd.concat({m: df['value'] for m, df in series.items()}, axis=1)
+            curve = curve.reindex(columns=[m for m in YIELD_CURVE_MATURITIES if m in series])
+            curve = apply_date_filter(curve, start_date, end_date)
+            if curve.empty:
+                raise ValueError("No treasury yield data in the requested date range")
+
+            spreads = {
+                name: curve[long].to_numpy() - curve[short].to_numpy()
+                for name, (long, short) in YIELD_CURVE_SPREADS.items()
+                if long in curve.columns and short in curve.columns
+            }
+
+            # Latest date on which every available maturity has a value
+            complete = curve.dropna()
+            latest = None
+            if not complete.empty:
+                row = complete.iloc[-1]
+                position = curve.index.get_loc(complete.index[-1])
+                latest = {
+                    "date": complete.index[-1].strftime('%Y-%m-%d'),
+                    "yields": {m: round(float(v), 4) for m, v in row.items()},
+                    "spreads": {name: round(float(values[position]), 4) for name, values in spreads.items()}
+                }
+
+            result = {
+                "dates": list(curve.index.strftime('%Y-%m-%d')),
+                "maturities": list(curve.columns),
+                "yields": {m: _column_values(curve[m].to_numpy()) for m in curve.columns},
+                "spreads": {name: _column_values(values) for name, values in spreads.items()},
+                "latest": latest
+            }
+            self.cache.set(key, result)
+
+            return dict(result, errors=errors)
+        except Exception as e:
+            logger.error(f"Error getting yield curve: {e}")
+            raise ValueError(f"Failed to get yield curve: {str(e)}")
+
+    def _parse_panel_name(self, name: str) -> Tuple[str, Optional[str]]:
+        """Split a panel series name into indicator and optional maturity, e.g. 'Treasury Yield:2year'"""
+        indicator, _, maturity = name.partition(':')
+        indicator = indicator.strip()
+        if indicator not in self.client.macro_functions:
+            raise ValueError(f"Unknown indicator: {indicator}")
+        if maturity and indicator != 'Treasury Yield':
+            raise ValueError(f"Only Treasury Yield takes a maturity: {name}")
+        if maturity and maturity not in YIELD_CURVE_MATURITIES:
+            raise ValueError(f"Unknown maturity: {maturity} (use {', '.join(YIELD_CURVE_MATURITIES)})")
+        return indicator, maturity or None
+
+    async def get_panel(self, names: List[str], freq: str = 'M', start_date: Optional[str] = None,
+                        end_date: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get several indicators aligned on a common calendar
+
+        Each column holds, for every calendar date, the latest observation
+        dated on or before it (as-of / forward-fill alignment), so quarterly,
+        monthly and daily series can be used side by side. Dates before a
+        series' first observation are None. Panels are limited to
+        MAX_PANEL_DATES dates.
+
+        Args:
+            names: Indicator names; Treasury Yield accepts a maturity suffix, e.g. 'Treasury Yield:2year'
+            freq: Calendar frequency: 'D', 'W', 'M', 'Q' or 'A' (period-end dates)
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+
+        Returns:
+            Columnar dict of dates and one value list per series
+        """
+        names = list(dict.fromkeys(name.strip() for name in names or [] if name.strip()))
+        if not names:
+            raise ValueError("At least one indicator must be specified")
+        if len(names) > MAX_PANEL_SERIES:
+            raise ValueError(f"Panels are limited to {MAX_PANEL_SERIES} series")
+        if freq not in PANEL_FREQUENCIES:
+            raise ValueError(f"Unsupported frequency: {freq} (use {', '.join(PANEL_FREQUENCIES)})")
+        parsed = [self._parse_panel_name(name) for name in names]
+
+        try:
+            results = await asyncio.gather(
+                *(self.macro_store.get_series(indicator, maturity) for indicator, maturity in parsed),
+                return_exceptions=True
+            )
+
+            series = {}
+            errors = {}
+            for name, result in zip(names, results):
+                if isinstance(result, BaseException):
+                    errors[name] = str(result)
+                elif result.empty:
+                    errors[name] = "No data returned"
+                else:
+                    series[name] = result['value']
+            if not series:
+                raise ValueError("No data available for the requested indicators")
+
+            key = ("panel", tuple(series), freq, start_date, end_date,
+                   tuple(_series_version(s.to_frame()) for s in series.values()))
+            cached = self.cache.get(key)
+            if cached is not None:
+                return dict(cached, errors=errors)
+
+            observations = pd.concat(series, axis=1).sort_index()
+            # Extend to the end of the period holding the last observation
+            offset = to_offset(PANEL_FREQUENCIES[freq])
+            calendar = pd.date_range(observations.index[0], offset.rollforward(observations.index[-1]),
+                                     freq=offset)
+            if start_date:
+                calendar = calendar[calendar >= pd.Timestamp(start_date)]
+            if end_date:
+                calendar = calendar[calendar <= pd.Timestamp(end_date)]
+            if calendar.empty:
+                raise ValueError("No calendar dates in the requested range")
+            if len(calendar) > MAX_PANEL_DATES:
+                raise ValueError(f"Panel would have {len(calendar)} dates, more than {MAX_PANEL_DATES}; "
+                                 f"narrow the range with start_date/end_date or use a lower frequency")
+
+            # As-of alignment: carry every observation forward to the following calendar dates
+            panel = observations.reindex(observations.index.union(calendar)).ffill().reindex(calendar)
+
+            result = {
+                "freq": freq,
+                "dates": list(calendar.strftime('%Y-%m-%d')),
+                "columns": {name: _column_values(panel[name].to_numpy()) for name in panel.columns},
+                "last_observation": {name: s.index[-1].strftime('%Y-%m-%d') for name, s in series.items()}
+            }
+            self.cache.set(key, result)
+
+            return dict(result, errors=errors)
+        except Exception as e:
+            logger.error(f"Error building indicator panel: {e}")
+            raise ValueError(f"Failed to build indicator panel: {str(e)}")
+
     async def get_available_indicators(self) -> Dict[str, Any]:
         """Get list of available economic indicators"""
         return {
@@ -0,0 +1,144 @@
+# server/services/macro_store.py
+import asyncio
+import os
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Any
+from server.services.alpha_vantage import AlphaVantageClient
+from server.utils.storage import safe_filename, read_pickle, write_pickle
+from server.config import get_settings, get_logger
+
+logger = get_logger(__name__)
+
+# Length of one observation period per release interval
+RELEASE_PERIODS = {
+    'daily': pd.DateOffset(days=1),
+    'weekly': pd.DateOffset(weeks=1),
+    'monthly': pd.DateOffset(months=1),
+    'quarterly': pd.DateOffset(months=3),
+    'semiannual': pd.DateOffset(months=6),
+    'annual': pd.DateOffset(years=1)
+}
+
+# One lock per stored series, shared across requests, so concurrent requests
+# for the same series trigger a single upstream fetch
+_fetch_locks: Dict[str, asyncio.Lock] = {}
+
+
+class MacroStore:
+    """
+    Local on-disk store of economic indicator series
+
+    Macro series change at most once per release, so a stored series is only
+    re-fetched once a new observation is plausible: observations are labelled
+    with the start of their period, and the period after the last stored one
+    cannot be published before it has ended. From then on the upstream is
+    checked every MACRO_RECHECK_MINUTES until the release shows up. Series
+    older than MACRO_STORE_MAX_AGE_DAYS are re-fetched regardless, to pick up
+    revisions.
+    """
+
+    def __init__(self, client: Optional[AlphaVantageClient] = None):
+        self.client = client or AlphaVantageClient()
+        self.settings = get_settings()
+        self.root = os.path.join(self.settings.DATA_DIR, "macro")
+        self.recheck = timedelta(minutes=self.settings.MACRO_RECHECK_MINUTES)
+        self.max_age = timedelta(days=self.settings.MACRO_STORE_MAX_AGE_DAYS)
+
+    def series_key(self, indicator_name: str, maturity: Optional[str] = None) -> str:
+        """Get the storage key of an indicator (and maturity)"""
+        maturity = maturity or self.client.indicator_maturity.get(indicator_name, '')
+        function = self.client.macro_functions.get(indicator_name, indicator_name)
+        return safe_filename(f"{function}_{maturity}" if maturity else function)
+
+    def series_path(self, key: str) -> str:
+        """Get the file path holding a stored series"""
+        return os.path.join(self.root, f"{key}.pkl")
+
+    def next_release(self, indicator_name: str, record: Optional[Dict[str, Any]]) -> Optional[datetime]:
+        """
+        Get the earliest time a new observation can be published
+
+        Returns:
+            Datetime, or None if nothing is stored yet
+        """
+        if not record or record["data"].empty:
+            return None
+        interval = self.client.indicator_intervals.get(indicator_name, 'monthly')
+        period = RELEASE_PERIODS.get(interval, RELEASE_PERIODS['monthly'])
+        # The next observation covers the period after the last one and can only
+        # be released once that period is over
+        return (record["last_observation"] + period + period).to_pydatetime()
+
+    def is_stale(self, indicator_name: str, record: Optional[Dict[str, Any]]) -> bool:
+        """Check whether a stored series should be fetched again"""
+        if not record or record["data"].empty:
+            return True
+        now = datetime.now()
+        if now - record["fetched_at"] > self.max_age:
+            return True
+        checked_at = record.get("checked_at", record["fetched_at"])
+        return now >= self.next_release(indicator_name, record) and now - checked_at > self.recheck
+
+    async def get_series(self, indicator_name: str, maturity: Optional[str] = None,
+                         refresh: bool = True) -> pd.DataFrame:
+        """
+        Get an indicator series, fetching from the API only when a new release is plausible
+
+        Args:
+            indicator_name: Indicator name (a key of macro_functions)
+            maturity: Optional maturity (Treasury Yield only)
+            refresh: If False, only the local copy is used
+
+        Returns:
+            DataFrame with a 'value' column indexed by date (empty if unavailable)
+        """
+        if indicator_name not in self.client.macro_functions:
+            raise ValueError(f"Unknown indicator: {indicator_name}")
+
+        key = self.series_key(indicator_name, maturity)
+        path = self.series_path(key)
+        record = read_pickle(path)
+
+        if refresh and self.is_stale(indicator_name, record):
+            lock = _fetch_locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                # Another request may have refreshed the series while we waited
+                record = read_pickle(path)
+                if self.is_stale(indicator_name, record):
+                    record = await self._refresh(indicator_name, maturity, path, record)
+
+        if not record:
+            return pd.DataFrame()
+
+        return record["data"]
+
+    async def _refresh(self, indicator_name: str, maturity: Optional[str], path: str,
+                       record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Fetch a series from the API and store it, keeping the old copy on failure"""
+        try:
+            data = await self.client.get_economic_data(indicator_name, maturity)
+            if data.empty:
+                raise ValueError("No data returned")
+
+            previous = record["last_observation"] if record else None
+            now = datetime.now()
+            record = {
+                "data": data,
+                "fetched_at": now,
+                "checked_at": now,
+                "last_observation": data.index[-1]
+            }
+            write_pickle(path, record)
+            if previous is not None and record["last_observation"] > previous:
+                logger.info(f"New release for {indicator_name}: {record['last_observation']:%Y-%m-%d}")
+            return record
+        except Exception as e:
+            # Serve the stored copy if there is one, and wait a full recheck
+            # interval before trying again
+            logger.error(f"Error refreshing {indicator_name}: {e}")
+            if not record:
+                raise
+            record = dict(record, checked_at=datetime.now())
+            write_pickle(path, record)
+            return record
@@ -9,6 +9,8 @@ import traceback
 import os
 from server.config import get_settings, get_logger
 from server.database.mongodb_helper import MongoDBHelper
+from server.utils.options_analytics import chain_arrays, analyze_chain
+from server.utils.options_analytics import calculation_results as to_calculation_results
 
 # Create a router for the options analysis endpoint
 router = APIRouter(prefix="/api/analyze/options", tags=["analysis"])
@@ -36,11 +38,8 @@ class OptionsAnalysisResponse(BaseModel):
 
 # Dependency to get MongoDB helper instance
 def get_mongodb():
-    """Get MongoDB helper with an initialized connection"""
-    mongo = MongoDBHelper()
-    # Attempt to connect but don't require success
-    mongo.connect()
-    return mongo
+    """Get MongoDB helper on the app's shared client"""
+    return MongoDBHelper()
 
 
 class OpenAIOptionsService:
@@ -101,6 +100,14 @@ class OpenAIOptionsService:
             if put_count > 0:
                 logger.info(f"Sample put option: {json.dumps(options_data['puts'][0], indent=2)}")
 
+            # Compute the analytics server-side when the client did not send any
+            if not calculation_results and (options_data.get('calls') or options_data.get('puts')):
+                chain = chain_arrays([dict(c, contract_type='call') for c in options_data.get('calls', [])] +
+                                     [dict(p, contract_type='put') for p in options_data.get('puts', [])])
+                calculation_results = to_calculation_results(
+                    analyze_chain(chain, stock_price, expiration_date)
+                )
+
             # Format the calculation results for the prompt
             formatted_results = self.format_calculation_results(calculation_results)
 
@@ -234,7 +241,7 @@ class OpenAIOptionsService:
             # Store the analysis in MongoDB if an instance is provided
             try:
                 if self.mongodb:
-                    self.store_options_suggestion(symbol, stock_price, expiration_date, analysis_data)
+                    await self.store_options_suggestion(symbol, stock_price, expiration_date, analysis_data)
             except Exception as storage_error:
                 # Log the error but continue - storage is non-critical
                 logger.error(f"Error storing options suggestion: {storage_error}")
@@ -258,13 +265,13 @@ class OpenAIOptionsService:
                 "contrarian": "No contrarian perspective available"
             }
 
-    def store_options_suggestion(self,
-                                 symbol: str,
-                                 stock_price: float,
-                                 expiration_date: str,
-                                 analysis_data: Dict[str, Any]) -> bool:
+    async def store_options_suggestion(self,
+                                       symbol: str,
+                                       stock_price: float,
+                                       expiration_date: str,
+                                       analysis_data: Dict[str, Any]) -> bool:
         """
-        Store options analysis result in MongoDB
+        Queue options analysis result for MongoDB
 
         Args:
             symbol: Stock symbol
@@ -281,7 +288,7 @@ class OpenAIOptionsService:
 
         try:
             # Store options suggestion
-            success = self.mongodb.store_options_suggestion(
+            success = await self.mongodb.store_options_suggestion(
                 symbol=symbol,
                 expiration_date=expiration_date,
                 stock_price=stock_price,
@@ -289,7 +296,7 @@ class OpenAIOptionsService:
             )
 
             if success:
-                logger.info(f"Stored options suggestion for {symbol} (expiration: {expiration_date})")
+                logger.info(f"Queued options suggestion for {symbol} (expiration: {expiration_date})")
             else:
                 logger.warning(f"Failed to store options suggestion for {symbol}")
 
@@ -503,7 +510,7 @@ async def get_options_suggestions(
         logger.info(f"Getting options suggestions for {symbol}")
 
         # Get suggestions
-        suggestions = mongodb.get_options_suggestions(symbol, expiration_date)
+        suggestions = await mongodb.get_options_suggestions(symbol, expiration_date)
 
         if not suggestions:
             logger.info(f"No suggestions found for {symbol}")
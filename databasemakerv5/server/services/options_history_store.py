@@ -0,0 +1,112 @@
+# server/services/options_history_store.py
+import asyncio
+import os
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+from server.services.alpha_vantage import AlphaVantageClient
+from server.utils.storage import safe_filename, read_npz, write_npz
+from server.config import get_settings, get_logger
+
+logger = get_logger(__name__)
+
+
+class OptionsHistoryStore:
+    """
+    Local on-disk store of end-of-day options chains
+
+    Each trading day of a symbol is one compressed .npz file of column arrays
+    (see OptionsChain.arrays, plus contract_name). A day is only written once its
+    whole chain has been fetched, and days without a chain are stored as
+    empty files, so an interrupted backfill resumes with the days still
+    missing.
+    """
+
+    def __init__(self, client: Optional[AlphaVantageClient] = None):
+        self.client = client or AlphaVantageClient()
+        self.settings = get_settings()
+        self.root = os.path.join(self.settings.DATA_DIR, "options_history")
+
+    def chain_path(self, symbol: str, date: str) -> str:
+        """Get the file path holding the chain of a symbol on a date"""
+        return os.path.join(self.root, safe_filename(symbol.upper()), f"{date}.npz")
+
+    def stored_dates(self, symbol: str) -> List[str]:
+        """Get the dates stored for a symbol, oldest first"""
+        directory = os.path.join(self.root, safe_filename(symbol.upper()))
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-4] for name in os.listdir(directory) if name.endswith(".npz"))
+
+    def read_chain(self, symbol: str, date: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Read the stored chain of a symbol on a date
+
+        Returns:
+            Column arrays (empty if there was no chain that day), or None if not stored
+        """
+        return read_npz(self.chain_path(symbol, date))
+
+    @staticmethod
+    def trading_days(start_date: str, end_date: Optional[str] = None) -> List[str]:
+        """Weekdays in a date range that have closed (holidays come back as empty chains)"""
+        yesterday = pd.Timestamp(datetime.now().date()) - pd.Timedelta(days=1)
+        end = min(pd.Timestamp(end_date), yesterday) if end_date else yesterday
+        return [day.strftime('%Y-%m-%d') for day in pd.bdate_range(start_date, end)]
+
+    def pending_dates(self, symbol: str, start_date: str, end_date: Optional[str] = None) -> List[str]:
+        """Get the trading days in a range that are not stored yet"""
+        stored = set(self.stored_dates(symbol))
+        return [day for day in self.trading_days(start_date, end_date) if day not in stored]
+
+    async def _fetch_day(self, symbol: str, date: str) -> int:
+        """Fetch and store the chain of one day, returning its number of contracts"""
+        chain = await self.client.get_historical_options(symbol, date)
+        arrays = dict(chain.arrays(), contract_name=chain.contract_names)
+        write_npz(self.chain_path(symbol, date), arrays)
+        return len(chain)
+
+    async def backfill(self, symbols: List[str], start_date: str,
+                       end_date: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch and store the end-of-day chains of symbols over a date range
+
+        Days already stored are skipped. Requests run concurrently up to
+        UPSTREAM_MAX_CONCURRENCY, within the client's shared rate budget.
+
+        Args:
+            symbols: Stock symbols
+            start_date: First day in YYYY-MM-DD format
+            end_date: Last day in YYYY-MM-DD format (defaults to the last closed day)
+
+        Returns:
+            Per symbol: days requested, already stored, fetched and empty, plus
+            errors by date for days to retry
+        """
+        semaphore = asyncio.Semaphore(self.settings.UPSTREAM_MAX_CONCURRENCY)
+        days = self.trading_days(start_date, end_date)
+        results: Dict[str, Dict[str, Any]] = {}
+
+        async def load(symbol: str, date: str):
+            async with semaphore:
+                try:
+                    contracts = await self._fetch_day(symbol, date)
+                    results[symbol]["fetched"] += 1
+                    if contracts == 0:
+                        results[symbol]["empty"] += 1
+                except Exception as e:
+                    logger.error(f"Error backfilling options for {symbol} on {date}: {e}")
+                    results[symbol]["errors"][date] = str(e)
+
+        tasks = []
+        for symbol in symbols:
+            symbol = symbol.upper()
+            stored = set(self.stored_dates(symbol))
+            pending = [day for day in days if day not in stored]
+            results[symbol] = {"requested": len(days), "stored": len(days) - len(pending),
+                               "fetched": 0, "empty": 0, "errors": {}}
+            tasks.extend(load(symbol, day) for day in pending)
+
+        await asyncio.gather(*tasks)
+        return results
@@ -1,11 +1,48 @@
 # server/services/options_service.py
-from typing import List, Dict, Any
+import hashlib
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Tuple
 from server.services.alpha_vantage import AlphaVantageClient
+from server.services.bar_store import BarStore
+from server.services.options_history_store import OptionsHistoryStore
 from server.database.mongodb_helper import MongoDBHelper
+from server.models.options_chain import OptionsChain, GREEK_FIELDS
+from server.utils.cache import LRUCache
+from server.utils.market_hours import quote_ttl
+from server.utils.options_analytics import (
+    chain_greeks, select_rows, analyze_chain, calculation_results,
+    volatility_skew, put_call_ratio, days_to_expiration, build_chain_index, query_chain, volatility_surface
+)
 from server.config import get_logger
+from server.config import get_settings
 
 logger = get_logger(__name__)
 
+# Volatility history tracks the nearest expiration at least this many days out,
+# skipping the noisy last week of a contract
+HISTORY_MIN_DAYS = 7
+
+# Shared across requests, since services are created per request
+_options_cache: Optional[LRUCache] = None
+
+
+def get_options_cache() -> LRUCache:
+    """Get the process-wide cache of options chains and analytics"""
+    global _options_cache
+    if _options_cache is None:
+        _options_cache = LRUCache(get_settings().OPTIONS_CACHE_MAX_MB * 1024 * 1024)
+    return _options_cache
+
+
+def _chain_fingerprint(chain: Dict[str, np.ndarray]) -> str:
+    """Hash the columns of a chain, so cached analytics follow every quote change"""
+    digest = hashlib.sha1()
+    for key in sorted(chain):
+        digest.update(np.ascontiguousarray(chain[key]).tobytes())
+    return digest.hexdigest()
+
 
 class OptionsService:
     """Service for options data operations"""
@@ -13,28 +50,347 @@ class OptionsService:
     def __init__(self):
         self.client = AlphaVantageClient()
         self.mongo = MongoDBHelper()
-        self.mongo_connected = self.mongo.connect()
+        self.bar_store = BarStore(self.client)
+        self.history_store = OptionsHistoryStore(self.client)
+        self.settings = get_settings()
+        self.cache = get_options_cache()
+
+    async def get_options_data(self,
+                               symbol: str,
+                               require_greeks: bool = False,
+                               compute_greeks: bool = True,
+                               stock_price: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get options chain data for a given symbol
+
+        Args:
+            symbol: Stock symbol
+            require_greeks: Ask the API for implied volatility and Greeks
+            compute_greeks: Fill implied volatility and Greeks the API left empty locally
+            stock_price: Underlying price for local Greeks (defaults to the latest stored close)
+        """
+        entry = await self._get_chain(symbol, require_greeks, compute_greeks, stock_price)
+        return entry["chain"].to_records()
+
+    async def _get_chain(self,
+                         symbol: str,
+                         require_greeks: bool = False,
+                         compute_greeks: bool = True,
+                         stock_price: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get a chain with its column arrays and index
+
+        The vendor chain is cached on its own (see _get_quotes). Implied
+        volatility and Greeks the API left empty are filled on a copy, cached
+        under the underlying price they were computed at, so callers passing
+        different prices never see each other's Greeks.
+
+        Returns:
+            Dict of chain (OptionsChain), arrays (its analytics layout), index,
+            fetched_at and expires_at
+        """
+        symbol = symbol.upper()
+        quotes = await self._get_quotes(symbol, require_greeks)
+        if not compute_greeks or not quotes["missing_greeks"]:
+            return quotes
+
+        try:
+            spot = stock_price if stock_price is not None else await self._get_stock_price(symbol)
+        except Exception as e:
+            # The chain is still useful without Greeks
+            logger.warning(f"Skipping local Greeks for {symbol}: {e}")
+            return quotes
+
+        key = ("greeks", symbol, require_greeks, spot, quotes["fetched_at"])
+        entry = self.cache.get(key)
+        if entry is None:
+            chain = quotes["chain"].copy()
+            chain.fill_missing(chain_greeks(chain.arrays(), spot))
+            # Greeks don't change the expiration/strike order, so the index is shared
+            entry = dict(quotes, chain=chain, arrays=chain.arrays())
+            self.cache.set(key, entry)
+        return entry
+
+    async def _get_quotes(self, symbol: str, require_greeks: bool) -> Dict[str, Any]:
+        """
+        Get the vendor chain with its column arrays and index
+
+        Quotes stay current for OPTIONS_CHAIN_TTL_SECONDS during the regular
+        session and until the next open outside it. A current chain is served
+        from memory first, then from the latest MongoDB snapshot, and only
+        fetched from the API when neither is current. The cached chain is
+        never modified.
+        """
+        key = ("chain", symbol, require_greeks)
+        entry = self.cache.get(key)
+        if entry and datetime.now() < entry["expires_at"]:
+            return entry
 
-    async def get_options_data(self, symbol: str, require_greeks: bool = False) -> List[Dict[str, Any]]:
-        """Get options chain data for a given symbol"""
         try:
-            # Always fetch from API first, regardless of database status
-            logger.info(f"Fetching options data for {symbol} from API")
-            options_data = await self.client.get_options_data(symbol, require_greeks)
-
-            if not options_data:
-                logger.warning(f"No options data available for {symbol}")
-                raise ValueError(f"No options data found for symbol: {symbol}")
-
-            # Store in MongoDB if connection is available, overwriting any existing data
-            if self.mongo_connected:
-                success = self.mongo.store_options_data(symbol, require_greeks, options_data)
-                if success:
-                    logger.info(f"Saved options data for {symbol} to MongoDB (overwritten if existed)")
-                else:
-                    logger.warning(f"Failed to save options data for {symbol} to MongoDB")
-
-            return options_data
+            chain, fetched_at = await self._get_stored_chain(symbol, require_greeks)
+
+            if chain is None:
+                logger.info(f"Fetching options data for {symbol} from API")
+                chain = await self.client.get_options_chain(symbol, require_greeks)
+                fetched_at = datetime.now()
+
+                if not len(chain):
+                    logger.warning(f"No options data available for {symbol}")
+                    raise ValueError(f"No options data found for symbol: {symbol}")
+
+                # Keep a snapshot in MongoDB, written behind the response
+                success = await self.mongo.store_options_data(symbol, require_greeks, chain.to_records(digits=None),
+                                                              captured_at=fetched_at)
+                if not success:
+                    logger.warning(f"Failed to queue options data for {symbol} for MongoDB")
+
+            arrays = chain.arrays()
+            entry = {
+                "fetched_at": fetched_at,
+                "expires_at": self._quotes_expire_at(fetched_at),
+                "chain": chain,
+                "arrays": arrays,
+                "index": build_chain_index(arrays),
+                "missing_greeks": any(np.isnan(chain.columns[field]).any() for field in GREEK_FIELDS)
+            }
+            self.cache.set(key, entry)
+            return entry
         except Exception as e:
             logger.error(f"Error getting options data for {symbol}: {e}")
-            raise ValueError(f"Failed to get options data: {str(e)}")
\ No newline at end of file
+            raise ValueError(f"Failed to get options data: {str(e)}")
+
+    def _quotes_expire_at(self, fetched_at: datetime) -> datetime:
+        """When quotes fetched at a given time stop being current"""
+        return fetched_at + timedelta(seconds=quote_ttl(self.settings.OPTIONS_CHAIN_TTL_SECONDS, fetched_at))
+
+    async def _get_stored_chain(self, symbol: str, require_greeks: bool) -> Tuple[Optional[OptionsChain], Optional[datetime]]:
+        """Get the latest MongoDB snapshot of a chain if it is still current"""
+        if not self.mongo.connected:
+            return None, None
+
+        captured_at = await self.mongo.get_latest_capture_time(symbol, require_greeks)
+        if captured_at is None or datetime.now() >= self._quotes_expire_at(captured_at):
+            return None, None
+
+        records = await self.mongo.get_options_data(symbol, require_greeks)
+        if not records:
+            return None, None
+
+        logger.info(f"Serving options data for {symbol} from the MongoDB snapshot of {captured_at}")
+        return OptionsChain.from_records(records), captured_at
+
+    async def query_options_data(self,
+                                 symbol: str,
+                                 require_greeks: bool = False,
+                                 compute_greeks: bool = True,
+                                 expirations: Optional[List[str]] = None,
+                                 expiration_from: Optional[str] = None,
+                                 expiration_to: Optional[str] = None,
+                                 strike_min: Optional[float] = None,
+                                 strike_max: Optional[float] = None,
+                                 moneyness_min: Optional[float] = None,
+                                 moneyness_max: Optional[float] = None,
+                                 contract_type: Optional[str] = None,
+                                 min_volume: int = 0,
+                                 min_open_interest: int = 0,
+                                 delta_min: Optional[float] = None,
+                                 delta_max: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Get the contracts of a chain matching a set of filters
+
+        Moneyness bands (strike / underlying price) are turned into strike
+        bounds using the latest stored close; when both are given, the
+        narrower bound applies.
+
+        Returns:
+            Matching contracts ordered by expiration, then strike
+        """
+        entry = await self._get_chain(symbol, require_greeks, compute_greeks)
+
+        if moneyness_min is not None or moneyness_max is not None:
+            spot = await self._get_stock_price(symbol)
+            if moneyness_min is not None:
+                strike_min = max(strike_min or 0.0, moneyness_min * spot)
+            if moneyness_max is not None:
+                bound = moneyness_max * spot
+                strike_max = bound if strike_max is None else min(strike_max, bound)
+
+        rows = query_chain(entry["arrays"], entry["index"], expirations, expiration_from, expiration_to,
+                           strike_min, strike_max, contract_type, min_volume, min_open_interest,
+                           delta_min, delta_max)
+        return entry["chain"].take(rows).to_records()
+
+    async def _get_stock_price(self, symbol: str) -> float:
+        """Get the latest close of the underlying from the bar store"""
+        bars = await self.bar_store.get_bars(symbol)
+        if bars.empty:
+            raise ValueError(f"No price data found for symbol: {symbol}")
+        return float(bars['close'].iloc[-1])
+
+    async def get_options_analytics(self,
+                                    symbol: str,
+                                    expiration: Optional[str] = None,
+                                    stock_price: Optional[float] = None,
+                                    rate: float = 0.05,
+                                    dividend_yield: float = 0.0) -> Dict[str, Any]:
+        """
+        Compute max pain, skew, put/call ratios, income strategy rankings and
+        parity checks for one expiration of a symbol's chain
+
+        Args:
+            symbol: Stock symbol
+            expiration: Expiration date in YYYY-MM-DD format (defaults to the nearest one)
+            stock_price: Underlying price (defaults to the latest stored close)
+            rate: Risk-free rate for parity checks
+            dividend_yield: Dividend yield for parity checks
+
+        Returns:
+            Analytics for the expiration, plus the list of available expirations
+        """
+        symbol = symbol.upper()
+        if stock_price is None:
+            stock_price = await self._get_stock_price(symbol)
+        entry = await self._get_chain(symbol, stock_price=stock_price)
+
+        try:
+            chain = entry["arrays"]
+            expirations = [e for e in entry["index"]["expirations"].tolist() if e]
+            if not expirations:
+                raise ValueError(f"No expirations found for symbol: {symbol}")
+
+            if expiration is None:
+                today = datetime.now().strftime('%Y-%m-%d')
+                upcoming = [e for e in expirations if e >= today]
+                expiration = upcoming[0] if upcoming else expirations[-1]
+            elif expiration not in expirations:
+                raise ValueError(f"No contracts expire on {expiration}")
+
+            if stock_price <= 0:
+                raise ValueError("stock_price must be positive")
+
+            chain = select_rows(chain, chain["expiration"] == expiration)
+            key = ("analytics", symbol, expiration, stock_price, rate, dividend_yield,
+                   datetime.now().date(), _chain_fingerprint(chain))
+            analytics = self.cache.get(key)
+            if analytics is None:
+                analytics = analyze_chain(chain, stock_price, expiration, rate, dividend_yield)
+                analytics["calculation_results"] = calculation_results(analytics)
+                self.cache.set(key, analytics)
+
+            return dict(analytics, symbol=symbol, expirations=expirations)
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error computing options analytics for {symbol}: {e}")
+            raise ValueError(f"Failed to compute options analytics: {str(e)}")
+
+    async def get_volatility_surface(self,
+                                     symbol: str,
+                                     moneyness_points: int = 25,
+                                     tenor_points: int = 20,
+                                     moneyness_min: float = 0.7,
+                                     moneyness_max: float = 1.3,
+                                     stock_price: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Get the implied volatility surface of a symbol's current chain on a fixed grid
+
+        Args:
+            symbol: Stock symbol
+            moneyness_points, tenor_points: Grid size
+            moneyness_min, moneyness_max: Moneyness (strike / underlying price) range
+            stock_price: Underlying price (defaults to the latest stored close)
+
+        Returns:
+            Axes (moneyness, strikes, tenors in days), the expirations used and the
+            IV grid, one row per tenor (None where the quotes don't reach)
+        """
+        symbol = symbol.upper()
+        if stock_price is None:
+            stock_price = await self._get_stock_price(symbol)
+        entry = await self._get_chain(symbol, stock_price=stock_price)
+
+        try:
+            # Keyed on the chain contents, so repeated views of one snapshot are free
+            key = ("surface", symbol, stock_price, moneyness_points, tenor_points, moneyness_min, moneyness_max,
+                   datetime.now().date(), _chain_fingerprint(entry["arrays"]))
+            surface = self.cache.get(key)
+            if surface is None:
+                grid = volatility_surface(entry["arrays"], stock_price, moneyness_points, tenor_points,
+                                          moneyness_min, moneyness_max)
+                if grid is None:
+                    raise ValueError(f"Not enough implied volatility quotes for a surface of {symbol}")
+
+                surface = {
+                    "symbol": symbol,
+                    "stock_price": stock_price,
+                    "moneyness": np.round(grid["moneyness"], 4).tolist(),
+                    "strikes": np.round(grid["strikes"], 2).tolist(),
+                    "tenors": np.round(grid["tenors"], 2).tolist(),
+                    "expirations": grid["expirations"],
+                    "iv": [[None if np.isnan(v) else round(float(v), 4) for v in row] for row in grid["iv"]]
+                }
+                self.cache.set(key, surface)
+
+            return surface
+        except ValueError:
+            raise
+        except Exception as e:
+            logger.error(f"Error computing volatility surface for {symbol}: {e}")
+            raise ValueError(f"Failed to compute volatility surface: {str(e)}")
+
+    async def get_volatility_history(self,
+                                     symbol: str,
+                                     start_date: Optional[str] = None,
+                                     end_date: Optional[str] = None,
+                                     min_days: int = HISTORY_MIN_DAYS) -> Dict[str, Any]:
+        """
+        Get ATM implied volatility, skew and put/call ratio per day from backfilled chains
+
+        Args:
+            symbol: Stock symbol
+            start_date: First day in YYYY-MM-DD format
+            end_date: Last day in YYYY-MM-DD format
+            min_days: Track the nearest expiration at least this many days out
+
+        Returns:
+            Columnar history: dates, tracked expirations and one list per metric
+        """
+        symbol = symbol.upper()
+        dates = [d for d in self.history_store.stored_dates(symbol)
+                 if (not start_date or d >= start_date) and (not end_date or d <= end_date)]
+        if not dates:
+            raise ValueError(f"No options history stored for {symbol}; run a backfill first")
+
+        try:
+            bars = await self.bar_store.get_bars(symbol)
+            closes = bars['close'].asof(pd.DatetimeIndex(dates)) if not bars.empty else None
+
+            history = {key: [] for key in ("dates", "expirations", "stock_price", "atm_iv", "otm_call_iv",
+                                           "otm_put_iv", "skew", "volume_ratio", "open_interest_ratio")}
+            for i, day in enumerate(dates):
+                chain = self.history_store.read_chain(symbol, day)
+                spot = float(closes.iloc[i]) if closes is not None else float("nan")
+                if not chain or len(chain["strike"]) == 0 or not np.isfinite(spot):
+                    continue
+
+                today = datetime.strptime(day, '%Y-%m-%d').date()
+                expirations = sorted(set(chain["expiration"].tolist()) - {""})
+                tracked = [e for e in expirations if days_to_expiration(e, today) >= min_days]
+                if not tracked:
+                    continue
+
+                rows = select_rows(chain, chain["expiration"] == tracked[0])
+                skew = volatility_skew(rows, spot) or {}
+                ratios = put_call_ratio(rows) or {}
+                history["dates"].append(day)
+                history["expirations"].append(tracked[0])
+                history["stock_price"].append(spot)
+                for key in ("atm_iv", "otm_call_iv", "otm_put_iv", "skew"):
+                    history[key].append(skew.get(key))
+                for key in ("volume_ratio", "open_interest_ratio"):
+                    history[key].append(ratios.get(key))
+
+            return dict(history, symbol=symbol)
+        except Exception as e:
+            logger.error(f"Error computing volatility history for {symbol}: {e}")
+            raise ValueError(f"Failed to compute volatility history: {str(e)}")
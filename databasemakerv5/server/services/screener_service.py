@@ -0,0 +1,153 @@
+# server/services/screener_service.py
+import asyncio
+import numpy as np
+from typing import List, Dict, Optional, Any
+from server.services.bar_store import BarStore
+from server.utils.parallel import get_process_pool, get_worker_count, partition
+from server.utils.technical import (parse_expression, parse_term, expression_terms,
+                                    evaluate_expression, term_values)
+from server.config import get_logger
+from server.config import get_settings
+
+logger = get_logger(__name__)
+
+MAX_UNIVERSE_SIZE = 5000
+
+
+def _screen_chunk(root: str, symbols: List[str], expression_text: str, sort_text: str) -> Dict[str, Any]:
+    """
+    Evaluate a screen over a chunk of symbols (runs in a worker process)
+
+    Bars are read straight from the local store so only symbol names and
+    small result rows cross the process boundary.
+    """
+    expression = parse_expression(expression_text)
+    sort_term = parse_term(sort_text)
+    terms = expression_terms(expression)
+    if sort_term.kind != "number" and sort_term not in terms:
+        terms.append(sort_term)
+
+    rows = []
+    missing = []
+    errors = {}
+
+    for symbol in symbols:
+        try:
+            record = BarStore.read_local(root, symbol)
+            if not record or record["bars"].empty:
+                missing.append(symbol)
+                continue
+
+            df = record["bars"]
+            memo = {}
+            if not evaluate_expression(df, expression, memo)[-1]:
+                continue
+
+            values = term_values(df, terms, memo)
+            close = df["close"].iloc[-1]
+            rows.append({
+                "symbol": symbol,
+                "date": df.index[-1].strftime('%Y-%m-%d'),
+                "close": None if np.isnan(close) else float(close),
+                "score": values.get(sort_term.text),
+                "values": values
+            })
+        except Exception as e:
+            errors[symbol] = str(e)
+
+    return {"rows": rows, "missing": missing, "errors": errors, "evaluated": len(symbols) - len(missing)}
+
+
+class ScreenerService:
+    """Service for screening a universe of symbols against technical conditions"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.bar_store = BarStore()
+
+    async def screen(self,
+                     expression: str,
+                     symbols: Optional[List[str]] = None,
+                     sort_by: Optional[str] = None,
+                     ascending: Optional[bool] = None,
+                     limit: int = 50,
+                     refresh: bool = False) -> Dict[str, Any]:
+        """
+        Screen a universe of symbols using locally stored daily bars
+
+        Args:
+            expression: Condition, e.g. "RSI(14) < 30 and close > SMA(200)"
+            symbols: Universe to screen (defaults to every symbol in the local store)
+            sort_by: Term to rank matches by (defaults to the first term of the expression)
+            ascending: Rank order (defaults to ascending for '<' conditions)
+            limit: Maximum number of results
+            refresh: Fetch missing or stale bars from the API before screening
+
+        Returns:
+            Ranked screen results
+        """
+        # Validate up front so bad input is reported before any work is scheduled
+        parsed = parse_expression(expression)
+        first = parsed[0][0]
+
+        if sort_by:
+            sort_term = parse_term(sort_by)
+        else:
+            sort_term = first.left if first.left.kind != "number" else first.right
+        if ascending is None:
+            ascending = first.op in ("<", "<=") if sort_term == first.left else first.op in (">", ">=")
+
+        universe = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip())) if symbols \
+            else self.bar_store.list_symbols()
+        if not universe:
+            raise ValueError("No symbols to screen: pass symbols or load bars into the local store")
+        if len(universe) > MAX_UNIVERSE_SIZE:
+            raise ValueError(f"Universe is limited to {MAX_UNIVERSE_SIZE} symbols")
+
+        try:
+            errors: Dict[str, str] = {}
+            if refresh:
+                errors.update(await self.bar_store.ensure_bars(universe))
+
+            # Several chunks per worker keeps the pool busy when chunk costs differ
+            workers = get_worker_count(self.settings.COMPUTE_MAX_WORKERS)
+            pool = get_process_pool(self.settings.COMPUTE_MAX_WORKERS)
+            loop = asyncio.get_running_loop()
+
+            chunk_results = await asyncio.gather(*(
+                loop.run_in_executor(pool, _screen_chunk, self.bar_store.root, chunk, expression, sort_term.text)
+                for chunk in partition(universe, workers * 4)
+            ))
+
+            rows = []
+            missing = []
+            evaluated = 0
+            for result in chunk_results:
+                rows.extend(result["rows"])
+                missing.extend(result["missing"])
+                errors.update(result["errors"])
+                evaluated += result["evaluated"]
+
+            # Rank matches, keeping rows without a score at the end
+            rows.sort(key=lambda r: (r["score"] is None,
+                                     (r["score"] if ascending else -r["score"]) if r["score"] is not None else 0))
+            for rank, row in enumerate(rows, start=1):
+                row["rank"] = rank
+
+            return {
+                "expression": expression,
+                "sort_by": sort_term.text,
+                "ascending": ascending,
+                "universe_size": len(universe),
+                "evaluated": evaluated,
+                "matched": len(rows),
+                "results": rows[:limit],
+                "missing": missing,
+                "errors": errors
+            }
+        except ValueError:
+            raise
+        except Exception as e:
+            # Internal failures, not bad input: let the route answer 500
+            logger.error(f"Error running screen '{expression}': {e}")
+            raise
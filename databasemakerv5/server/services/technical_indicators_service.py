@@ -1,13 +1,37 @@
 # server/services/technical_indicators_service.py
 import pandas as pd
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Hashable, Set, Tuple
 from server.services.alpha_vantage import AlphaVantageClient
+from server.services.bar_store import BarStore, INTRADAY_INTERVALS
+from server.database.mongodb_helper import MongoDBHelper
+from server.utils.cache import LRUCache
 from server.utils.data_processing import apply_date_filter
 from server.config import get_logger
 from server.config import get_settings
 
 logger = get_logger(__name__)
 
+# Shared across requests, since services are created per request
+_indicator_cache: Optional[LRUCache] = None
+
+
+def get_indicator_cache() -> LRUCache:
+    """Get the process-wide indicator result cache"""
+    global _indicator_cache
+    if _indicator_cache is None:
+        _indicator_cache = LRUCache(get_settings().INDICATOR_CACHE_MAX_MB * 1024 * 1024)
+    return _indicator_cache
+
+
+# Cache keys per (symbol, bar interval), with the last bar they were computed from,
+# so a new bar drops exactly that series' results without scanning the cache
+_indicator_keys: Dict[Tuple[str, str], Tuple[pd.Timestamp, Set[Hashable]]] = {}
+
+
+def _bar_interval(interval: str) -> str:
+    """Get the stored bar interval an indicator interval is derived from"""
+    return interval if interval in INTRADAY_INTERVALS else "daily"
+
 
 class TechnicalIndicatorsService:
     """Service for technical indicators operations"""
@@ -15,6 +39,9 @@ class TechnicalIndicatorsService:
     def __init__(self):
         self.client = AlphaVantageClient()
         self.settings = get_settings()
+        self.bar_store = BarStore(self.client)
+        self.cache = get_indicator_cache()
+        self.mongo = MongoDBHelper()
 
         # Define available technical indicators
         self.technical_indicators = {
@@ -88,15 +115,13 @@ class TechnicalIndicatorsService:
             raise ValueError(f"Unknown indicator: {indicator}")
 
         try:
-            # Use the Alpha Vantage client to fetch technical indicator data
-            data = await self.client.get_technical_indicator(symbol, indicator, time_period, series_type, interval)
+            data = await self._get_indicator_frame(symbol, indicator, time_period, series_type, interval)
 
-            if not data or data.empty:
+            if data.empty:
                 raise ValueError(f"No {indicator} data found for symbol: {symbol}")
 
-            # Apply date filtering if specified
-            if start_date or end_date:
-                data = apply_date_filter(data, start_date, end_date)
+            # Apply date filtering if specified (copies, so the cached frame is never modified)
+            data = apply_date_filter(data, start_date, end_date) if start_date or end_date else data.copy()
 
             # Convert to dictionary for JSON response
             data.index = data.index.strftime('%Y-%m-%d')  # Convert dates to strings
@@ -107,6 +132,56 @@ class TechnicalIndicatorsService:
             logger.error(f"Error getting {indicator} data for {symbol}: {e}")
             raise ValueError(f"Failed to get indicator data: {str(e)}")
 
+    async def _get_last_bar(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        """Get the last stored bar for a symbol, refreshing the local store when stale"""
+        try:
+            bars = await self.bar_store.get_bars(symbol, _bar_interval(interval))
+        except Exception as e:
+            logger.warning(f"Could not determine last bar for {symbol} ({interval}): {e}")
+            return None
+        return bars.index[-1] if not bars.empty else None
+
+    async def _get_indicator_frame(self, symbol: str, indicator: str, time_period: int,
+                                   series_type: str, interval: str) -> pd.DataFrame:
+        """
+        Get indicator values, served from the result cache when possible
+
+        Indicator outputs are deterministic given the symbol, interval,
+        indicator, parameters and the last bar, so results are cached under
+        that key. When a new bar lands for a symbol, all results computed
+        from its older bars are dropped.
+        """
+        symbol = symbol.upper()
+        last_bar = await self._get_last_bar(symbol, interval)
+        if last_bar is None:
+            # Without a known last bar there is no safe cache key
+            return await self.client.get_technical_indicator(symbol, indicator, time_period, series_type, interval)
+
+        series = (symbol, _bar_interval(interval))
+        tracked = _indicator_keys.get(series)
+        if tracked is None or tracked[0] != last_bar:
+            for stale in tracked[1] if tracked else ():
+                self.cache.delete(stale)
+            tracked = _indicator_keys[series] = (last_bar, set())
+
+        key = (symbol, interval, indicator, time_period, series_type, last_bar)
+        data = self.cache.get(key)
+        if data is not None:
+            return data
+
+        data = await self.client.get_technical_indicator(symbol, indicator, time_period, series_type, interval)
+        if not data.empty:
+            # Unless a newer bar landed while fetching, in which case the key would go untracked
+            if _indicator_keys.get(series) is tracked:
+                self.cache.set(key, data)
+                tracked[1].add(key)
+            await self.mongo.store_indicator_values(symbol, interval, indicator, time_period, series_type, data)
+        return data
+
+    async def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit ratio and memory statistics of the indicator result cache"""
+        return self.cache.stats()
+
     async def get_available_indicators(self) -> Dict[str, Any]:
         """Get list of available technical indicators"""
         return {
@@ -0,0 +1,186 @@
+import numpy as np
+from typing import Dict
+
+SQRT_2PI = np.sqrt(2.0 * np.pi)
+
+
+def norm_pdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal density"""
+    return np.exp(-0.5 * np.square(x)) / SQRT_2PI
+
+
+def norm_cdf(x: np.ndarray) -> np.ndarray:
+    """
+    Standard normal cumulative distribution, accurate to double precision
+
+    Hart's rational approximation (as given by West, "Better approximations
+    to cumulative normal functions"), evaluated on whole arrays.
+    """
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x)
+    e = np.exp(-0.5 * z * z)
+
+    num = ((((((3.52624965998911e-02 * z + 0.700383064443688) * z + 6.37396220353165) * z
+              + 33.912866078383) * z + 112.079291497871) * z + 221.213596169931) * z + 220.206867912376)
+    den = (((((((8.83883476483184e-02 * z + 1.75566716318264) * z + 16.064177579207) * z
+               + 86.7807322029461) * z + 296.564248779674) * z + 637.333633378831) * z
+            + 793.826512519948) * z + 440.413735824752)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tail_far = e / (z + 1.0 / (z + 2.0 / (z + 3.0 / (z + 4.0 / (z + 0.65))))) / 2.506628274631
+    tail = np.where(z < 7.07106781186547, e * num / den, tail_far)
+    tail = np.where(z > 37.0, 0.0, tail)
+    return np.where(x > 0, 1.0 - tail, tail)
+
+
+def _d1_d2(spot, strike, t, rate, dividend_yield, sigma):
+    sqrt_t = np.sqrt(t)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(spot / strike) + (rate - dividend_yield + 0.5 * sigma * sigma) * t) / (sigma * sqrt_t)
+    return d1, d1 - sigma * sqrt_t, sqrt_t
+
+
+def bs_price(spot: np.ndarray, strike: np.ndarray, t: np.ndarray, rate: float, dividend_yield: float,
+             sigma: np.ndarray, is_call: np.ndarray) -> np.ndarray:
+    """
+    Black-Scholes-Merton price of European options with a continuous dividend yield
+
+    All array arguments broadcast against each other.
+
+    Args:
+        spot: Underlying price
+        strike: Strike price
+        t: Time to expiration in years
+        rate: Continuously compounded risk-free rate
+        dividend_yield: Continuous dividend yield
+        sigma: Volatility
+        is_call: True for calls, False for puts
+
+    Returns:
+        Option prices
+    """
+    spot, strike, t, sigma = (np.asarray(a, dtype=float) for a in (spot, strike, t, sigma))
+    d1, d2, _ = _d1_d2(spot, strike, t, rate, dividend_yield, sigma)
+    discounted_spot = spot * np.exp(-dividend_yield * t)
+    discounted_strike = strike * np.exp(-rate * t)
+    call = discounted_spot * norm_cdf(d1) - discounted_strike * norm_cdf(d2)
+    put = discounted_strike * norm_cdf(-d2) - discounted_spot * norm_cdf(-d1)
+    return np.where(is_call, call, put)
+
+
+def bs_greeks(spot: np.ndarray, strike: np.ndarray, t: np.ndarray, rate: float, dividend_yield: float,
+              sigma: np.ndarray, is_call: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Black-Scholes-Merton Greeks for whole arrays of contracts in one pass
+
+    Theta is per calendar day; vega and rho are per percentage point, the
+    way quote vendors report them.
+
+    Returns:
+        Dict of delta, gamma, theta, vega and rho arrays
+    """
+    spot, strike, t, sigma = (np.asarray(a, dtype=float) for a in (spot, strike, t, sigma))
+    d1, d2, sqrt_t = _d1_d2(spot, strike, t, rate, dividend_yield, sigma)
+    q_discount = np.exp(-dividend_yield * t)
+    r_discount = np.exp(-rate * t)
+    pdf_d1 = norm_pdf(d1)
+    sign = np.where(is_call, 1.0, -1.0)
+    cdf_d1 = norm_cdf(sign * d1)
+    cdf_d2 = norm_cdf(sign * d2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = q_discount * pdf_d1 / (spot * sigma * sqrt_t)
+        theta = (-spot * q_discount * pdf_d1 * sigma / (2 * sqrt_t)
+                 - sign * rate * strike * r_discount * cdf_d2
+                 + sign * dividend_yield * spot * q_discount * cdf_d1)
+
+    return {
+        "delta": sign * q_discount * cdf_d1,
+        "gamma": gamma,
+        "theta": theta / 365.0,
+        "vega": spot * q_discount * pdf_d1 * sqrt_t / 100.0,
+        "rho": sign * strike * t * r_discount * cdf_d2 / 100.0
+    }
+
+
+def implied_volatility(price: np.ndarray, spot: np.ndarray, strike: np.ndarray, t: np.ndarray, rate: float,
+                       dividend_yield: float, is_call: np.ndarray, tol: float = 1e-8,
+                       max_iter: int = 100) -> np.ndarray:
+    """
+    Implied volatility of whole arrays of option prices
+
+    Each contract starts from the Corrado-Miller approximation and is refined
+    with Newton steps on vega, safeguarded by a per-contract bisection bracket
+    that shrinks with every evaluation: a Newton step leaving the bracket (or
+    a vanishing vega deep in the wings) falls back to bisection, so every
+    contract converges. All contracts are iterated together as arrays, and
+    converged ones are dropped from the working set.
+
+    Args:
+        price: Option prices
+        spot, strike, t: Underlying price, strike and years to expiration
+        rate: Continuously compounded risk-free rate
+        dividend_yield: Continuous dividend yield
+        is_call: True for calls, False for puts
+        tol: Absolute price tolerance
+        max_iter: Maximum number of iterations
+
+    Returns:
+        Implied volatilities; NaN where the price violates no-arbitrage bounds
+        or inputs are invalid
+    """
+    price, spot, strike, t, is_call = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (price, spot, strike, t)), np.asarray(is_call, dtype=bool))
+    price, spot, strike, t, is_call = (a.ravel() for a in (price, spot, strike, t, is_call))
+    result = np.full(price.shape, np.nan)
+
+    q_discount = np.exp(-dividend_yield * t)
+    r_discount = np.exp(-rate * t)
+    forward_spot = spot * q_discount
+    forward_strike = strike * r_discount
+    lower = np.maximum(np.where(is_call, forward_spot - forward_strike, forward_strike - forward_spot), 0.0)
+    upper = np.where(is_call, forward_spot, forward_strike)
+    valid = (price > lower) & (price < upper) & (t > 0) & (spot > 0) & (strike > 0)
+
+    idx = np.flatnonzero(valid)
+    if len(idx) == 0:
+        return result.reshape(np.shape(price))
+
+    p, s, k, tt, call = price[idx], spot[idx], strike[idx], t[idx], is_call[idx]
+    fs, fk = forward_spot[idx], forward_strike[idx]
+
+    # Corrado-Miller initial guess on the equivalent call price
+    c = np.where(call, p, p + fs - fk)
+    half_gap = (fs - fk) / 2
+    radicand = np.maximum((c - half_gap) ** 2 - (fs - fk) ** 2 / np.pi, 0.0)
+    sigma = np.sqrt(2 * np.pi / tt) / (fs + fk) * (c - half_gap + np.sqrt(radicand))
+    sigma = np.clip(np.nan_to_num(sigma, nan=0.3), 0.01, 3.0)
+
+    lo = np.full(len(idx), 1e-6)
+    hi = np.full(len(idx), 10.0)
+    active = np.arange(len(idx))
+
+    for _ in range(max_iter):
+        sa = sigma[active]
+        model = bs_price(s[active], k[active], tt[active], rate, dividend_yield, sa, call[active])
+        diff = model - p[active]
+
+        done = np.abs(diff) < tol
+        # Price increases with volatility, so the sign of the error moves the bracket
+        hi[active] = np.where(diff > 0, sa, hi[active])
+        lo[active] = np.where(diff < 0, sa, lo[active])
+
+        d1, _, sqrt_t = _d1_d2(s[active], k[active], tt[active], rate, dividend_yield, sa)
+        vega = s[active] * np.exp(-dividend_yield * tt[active]) * norm_pdf(d1) * sqrt_t
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = sa - diff / vega
+        bisect = (hi[active] + lo[active]) / 2
+        inside = np.isfinite(step) & (step > lo[active]) & (step < hi[active])
+        sigma[active] = np.where(done, sa, np.where(inside, step, bisect))
+
+        done |= (hi[active] - lo[active]) < 1e-12
+        active = active[~done]
+        if len(active) == 0:
+            break
+
+    result[idx] = sigma
+    return result.reshape(np.shape(price))
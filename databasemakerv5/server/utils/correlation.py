@@ -0,0 +1,509 @@
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+def output_points(total: int, max_points: int) -> np.ndarray:
+    """
+    Pick at most max_points evenly spaced indices out of range(total), always including the last one
+
+    Args:
+        total: Number of available points
+        max_points: Maximum number of points to return
+
+    Returns:
+        Sorted array of unique indices
+    """
+    if total <= max_points:
+        return np.arange(total)
+    return np.unique(np.linspace(0, total - 1, max_points).round().astype(int))
+
+
+def to_json_list(values: np.ndarray, digits: int) -> list:
+    """Round an array of correlations into nested lists, with None where a correlation is undefined (NaN)"""
+    result = np.round(values, digits).astype(object)
+    result[np.isnan(values)] = None
+    return result.tolist()
+
+
+def _pearson_from_sums(n: float, sx: np.ndarray, sy: np.ndarray, sxx: np.ndarray,
+                       syy: np.ndarray, sxy: np.ndarray) -> np.ndarray:
+    """Pearson correlation from sufficient statistics (broadcasting over any shape)"""
+    cov = n * sxy - sx * sy
+    var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = cov / np.sqrt(var)
+    return np.clip(result, -1.0, 1.0)
+
+
+def rolling_correlation(values: np.ndarray, window: int, ends: np.ndarray,
+                        pairs: Optional[List[Tuple[int, int]]] = None) -> np.ndarray:
+    """
+    Rolling Pearson correlation computed in one pass from running sums
+
+    Instead of calling .corr() once per window, cumulative sums of the
+    values, their squares and their cross products are built once and every
+    window is obtained as a difference of two cumulative sums. For full
+    matrices, cross products are only accumulated at the window boundaries
+    that are actually needed (one matrix product per segment), so memory is
+    O(points * N^2) rather than O(T * N^2).
+
+    Args:
+        values: T x N array of complete observations (no NaN)
+        window: Window length in observations
+        ends: Indices (into the T rows) of the last observation of each window
+              to compute; all must be >= window - 1
+        pairs: Optional column index pairs; if given only these are computed
+
+    Returns:
+        len(ends) x len(pairs) array if pairs are given, else len(ends) x N x N
+    """
+    # Centering keeps the running sums small and the differences accurate
+    x = values - values.mean(axis=0)
+    t, n = x.shape
+
+    stops = ends + 1
+    starts = stops - window
+
+    s1 = np.vstack([np.zeros((1, n)), np.cumsum(x, axis=0)])
+    s2 = np.vstack([np.zeros((1, n)), np.cumsum(x * x, axis=0)])
+    sx = s1[stops] - s1[starts]
+    sxx = s2[stops] - s2[starts]
+
+    if pairs is not None:
+        left = np.array([i for i, _ in pairs], dtype=int)
+        right = np.array([j for _, j in pairs], dtype=int)
+        s12 = np.vstack([np.zeros((1, len(pairs))), np.cumsum(x[:, left] * x[:, right], axis=0)])
+        sxy = s12[stops] - s12[starts]
+        return _pearson_from_sums(window, sx[:, left], sx[:, right], sxx[:, left], sxx[:, right], sxy)
+
+    # Cumulative cross-product matrices at every needed boundary
+    boundaries = np.unique(np.concatenate([starts, stops]))
+    cumulative = np.empty((len(boundaries), n, n))
+    running = np.zeros((n, n))
+    previous = 0
+    for k, boundary in enumerate(boundaries):
+        segment = x[previous:boundary]
+        running = running + segment.T @ segment
+        cumulative[k] = running
+        previous = boundary
+
+    position = {b: k for k, b in enumerate(boundaries)}
+    sxy = cumulative[[position[b] for b in stops]] - cumulative[[position[b] for b in starts]]
+
+    return _pearson_from_sums(window, sx[:, :, None], sx[:, None, :], sxx[:, :, None], sxx[:, None, :], sxy)
+
+
+def pairwise_correlation(values: np.ndarray, min_periods: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pearson correlation of all column pairs using pairwise-complete observations
+
+    Columns are standardized and cast to float32 first. Without missing data
+    the matrix is a single product Z'Z. With missing data, the sufficient
+    statistics of every pair over the rows where both columns are present
+    (counts, sums, sums of squares and cross products) come from four
+    matrix products of the zero-filled values and the presence mask, which
+    matches pandas' pairwise behaviour without a Python loop over pairs.
+
+    Args:
+        values: T x N array, NaN for missing observations
+        min_periods: Minimum number of shared observations for a valid result
+
+    Returns:
+        Tuple of (N x N float32 correlation matrix with NaN where invalid,
+        N x N matrix of shared observation counts)
+    """
+    mask = ~np.isnan(values)
+    counts = mask.sum(axis=0)
+
+    # Standardize each column on its own observations (correlation is invariant to this)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.nansum(values, axis=0) / np.maximum(counts, 1)
+        std = np.sqrt(np.nansum((values - mean) ** 2, axis=0) / np.maximum(counts, 1))
+        z = ((values - mean) / np.where(std > 0, std, 1.0)).astype(np.float32)
+    z[~mask] = 0.0
+
+    if mask.all():
+        t = values.shape[0]
+        corr = (z.T @ z) / np.float32(t)
+        n = np.full(corr.shape, t, dtype=np.int64)
+    else:
+        m = mask.astype(np.float32)
+        n = m.T @ m
+        sx = z.T @ m                # sum of column i over rows shared with column j
+        sxx = (z * z).T @ m
+        sxy = z.T @ z
+        sy = sx.T
+        syy = sxx.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+        n = np.rint(n).astype(np.int64)
+
+    corr = np.clip(corr, -1.0, 1.0).astype(np.float32)
+    corr[n < min_periods] = np.nan
+    corr[:, std == 0] = np.nan
+    corr[std == 0, :] = np.nan
+    np.fill_diagonal(corr, 1.0)
+    return corr, n
+
+
+def top_k_pairs(corr: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k most and k least correlated partners of every column
+
+    Uses argpartition on each row, so the cost is O(N^2) rather than a
+    full O(N^2 log N) sort.
+
+    Args:
+        corr: N x N correlation matrix (NaN = invalid)
+        k: Number of partners per side
+
+    Returns:
+        Tuple of (N x k indices of highest correlations in descending order,
+        N x k indices of lowest correlations in ascending order)
+    """
+    n = corr.shape[0]
+    k = max(1, min(k, n - 1))
+
+    high = np.where(np.isnan(corr), -np.inf, corr)
+    np.fill_diagonal(high, -np.inf)
+    low = np.where(np.isnan(corr), np.inf, corr)
+    np.fill_diagonal(low, np.inf)
+
+    rows = np.arange(n)[:, None]
+    most = np.argpartition(-high, k - 1, axis=1)[:, :k]
+    most = np.take_along_axis(most, np.argsort(-high[rows, most], axis=1), axis=1)
+    least = np.argpartition(low, k - 1, axis=1)[:, :k]
+    least = np.take_along_axis(least, np.argsort(low[rows, least], axis=1), axis=1)
+    return most, least
+
+
+def threshold_pairs(corr: np.ndarray, threshold: float, max_pairs: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find all distinct pairs whose absolute correlation is at least a threshold
+
+    Args:
+        corr: N x N correlation matrix (NaN = invalid)
+        threshold: Minimum absolute correlation
+        max_pairs: Maximum number of pairs returned (strongest first)
+
+    Returns:
+        Tuple of (row indices, column indices) with row < column
+    """
+    upper = np.triu(np.ones(corr.shape, dtype=bool), k=1)
+    with np.errstate(invalid="ignore"):
+        rows, cols = np.nonzero(upper & (np.abs(corr) >= threshold))
+    strength = np.abs(corr[rows, cols])
+    if len(strength) > max_pairs:
+        keep = np.argpartition(-strength, max_pairs - 1)[:max_pairs]
+        rows, cols, strength = rows[keep], cols[keep], strength[keep]
+    order = np.argsort(-strength, kind="stable")
+    return rows[order], cols[order]
+
+
+def rank_columns(values: np.ndarray) -> np.ndarray:
+    """
+    Rank each column independently, giving ties their average rank
+
+    All columns are ranked at once: one argsort along the rows, then tie
+    groups are found on the sorted values and averaged with bincount.
+
+    Args:
+        values: T x N array without missing values
+
+    Returns:
+        T x N array of ranks starting at 1
+    """
+    t, n = values.shape
+    order = np.argsort(values, axis=0, kind="mergesort")
+    sorted_values = np.take_along_axis(values, order, axis=0)
+
+    new_group = np.ones((t, n), dtype=bool)
+    new_group[1:] = sorted_values[1:] != sorted_values[:-1]
+
+    # Number tie groups consecutively across all columns (column-major)
+    groups = np.cumsum(new_group.T.ravel()) - 1
+    positions = np.tile(np.arange(t, dtype=float), n)
+    average = np.bincount(groups, weights=positions) / np.bincount(groups) + 1.0
+
+    ranks = np.empty((t, n))
+    np.put_along_axis(ranks, order, average[groups].reshape(n, t).T, axis=0)
+    return ranks
+
+
+def kendall_tau_matrix(values: np.ndarray, max_block_cells: int = 4_000_000) -> np.ndarray:
+    """
+    Kendall's tau-b for all column pairs via matrix products of pair signs
+
+    For each observation pair (i, j) with i < j the sign of the change in
+    every column is stacked into a row; the product S'S then holds
+    concordant minus discordant counts for every column pair, and its
+    diagonal holds the number of untied pairs per column, which is exactly
+    the tau-b normalization. Rows of S are generated in blocks so memory
+    stays bounded.
+
+    Args:
+        values: T x N array without missing values
+        max_block_cells: Upper bound on the cells of each S block
+
+    Returns:
+        N x N matrix of tau-b coefficients
+    """
+    t, n = values.shape
+    values = values.astype(np.float32)
+    block = max(1, max_block_cells // max(1, t * n))
+    total = np.zeros((n, n))
+
+    for start in range(0, t - 1, block):
+        stop = min(start + block, t - 1)
+        # Only observations after the block start can pair with rows in the block
+        later = values[start + 1:]
+        signs = np.sign(later[None, :, :] - values[start:stop][:, None, :])
+        # Drop pairs (i, j) with j <= i inside the block
+        signs *= (np.arange(start + 1, t)[None, :] > np.arange(start, stop)[:, None])[:, :, None]
+        signs = signs.reshape(-1, n)
+        total += signs.T @ signs
+
+    untied = np.sqrt(np.diag(total))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tau = total / np.outer(untied, untied)
+    return np.clip(tau, -1.0, 1.0)
+
+
+def correlation_matrix(values: np.ndarray, method: str = "pearson") -> np.ndarray:
+    """
+    Correlation matrix of complete observations
+
+    Pearson is one matrix product of standardized columns, Spearman is the
+    same product on column ranks, and Kendall uses pair-sign products.
+
+    Args:
+        values: T x N array without missing values
+        method: 'pearson', 'spearman' or 'kendall'
+
+    Returns:
+        N x N correlation matrix
+    """
+    if method == "kendall":
+        return kendall_tau_matrix(values)
+    if method == "spearman":
+        values = rank_columns(values)
+    elif method != "pearson":
+        raise ValueError(f"Unsupported correlation method: {method}")
+
+    centered = values - values.mean(axis=0)
+    norms = np.sqrt((centered * centered).sum(axis=0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        standardized = centered / norms
+    return np.clip(standardized.T @ standardized, -1.0, 1.0)
+
+
+def moment_sums(values: np.ndarray, shift: np.ndarray) -> Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Sufficient statistics for Pearson correlation of complete observations
+
+    Values are shifted by a fixed reference row before summing so the sums
+    stay small and later differences remain accurate. Sums from disjoint
+    blocks of rows (with the same shift) simply add up, which is what allows
+    a matrix to be maintained incrementally as new rows arrive.
+
+    Args:
+        values: T x N array without missing values
+        shift: Length-N reference values subtracted from every row
+
+    Returns:
+        Tuple of (row count, length-N column sums, N x N cross-product sums;
+        the diagonal holds the sums of squares)
+    """
+    x = values - shift
+    return len(x), x.sum(axis=0), x.T @ x
+
+
+def correlation_from_moments(count: int, sums: np.ndarray, cross: np.ndarray) -> np.ndarray:
+    """
+    Pearson correlation matrix from moment_sums output, in O(N^2)
+
+    Args:
+        count: Number of rows
+        sums: Length-N column sums
+        cross: N x N cross-product sums
+
+    Returns:
+        N x N correlation matrix (NaN for constant columns)
+    """
+    squares = np.diag(cross)
+    return _pearson_from_sums(count, sums[:, None], sums[None, :],
+                              squares[:, None], squares[None, :], cross)
+
+
+LINKAGE_METHODS = ("average", "complete", "single")
+
+
+def correlation_distance(corr: np.ndarray) -> np.ndarray:
+    """
+    Metric distance between series from their correlation, sqrt((1 - r) / 2)
+
+    Invalid correlations (NaN) are treated as zero correlation.
+    """
+    r = np.clip(np.nan_to_num(corr, nan=0.0), -1.0, 1.0)
+    distance = np.sqrt(0.5 * (1.0 - r))
+    np.fill_diagonal(distance, 0.0)
+    return distance
+
+
+def linkage_matrix(distance: np.ndarray, method: str = "average") -> np.ndarray:
+    """
+    Agglomerative hierarchical clustering with the nearest-neighbour chain algorithm
+
+    Average, complete and single linkage are all reducible, so following
+    chains of nearest neighbours until two clusters are mutual nearest
+    neighbours yields the same hierarchy as the greedy algorithm in O(N^2)
+    time, with each step a vectorized Lance-Williams update of one row.
+
+    Args:
+        distance: N x N symmetric distance matrix
+        method: 'average', 'complete' or 'single'
+
+    Returns:
+        (N - 1) x 4 linkage matrix in SciPy's format: each row merges clusters
+        [a, b] at [distance] into a cluster of [size] leaves; ids below N are
+        leaves and merge k creates cluster N + k
+    """
+    if method not in LINKAGE_METHODS:
+        raise ValueError(f"Unsupported linkage method: {method}")
+
+    n = len(distance)
+    d = np.array(distance, dtype=float)
+    np.fill_diagonal(d, np.inf)
+    size = np.ones(n)
+    active = np.ones(n, dtype=bool)
+    merges = []
+    chain: List[int] = []
+
+    while len(merges) < n - 1:
+        if not chain:
+            chain.append(int(np.argmax(active)))
+        a = chain[-1]
+        row = np.where(active, d[a], np.inf)
+        b = int(np.argmin(row))
+        # Prefer the previous chain element on ties so the chain always terminates
+        if len(chain) > 1 and row[chain[-2]] <= row[b]:
+            b = chain[-2]
+
+        if len(chain) < 2 or b != chain[-2]:
+            chain.append(b)
+            continue
+
+        chain = chain[:-2]
+        merges.append((a, b, d[a, b]))
+        if method == "average":
+            merged = (size[a] * d[a] + size[b] * d[b]) / (size[a] + size[b])
+        elif method == "complete":
+            merged = np.maximum(d[a], d[b])
+        else:
+            merged = np.minimum(d[a], d[b])
+
+        # The merged cluster lives on in slot b
+        d[b, :] = merged
+        d[:, b] = merged
+        d[a, :] = np.inf
+        d[:, a] = np.inf
+        d[b, b] = np.inf
+        size[b] += size[a]
+        active[a] = False
+
+    # Order merges by height and label clusters the way SciPy does
+    merges.sort(key=lambda m: m[2])
+    parent = np.arange(n)
+    cluster_id = np.arange(n)
+    cluster_size = np.ones(n, dtype=int)
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    result = np.empty((max(n - 1, 0), 4))
+    for k, (a, b, height) in enumerate(merges):
+        ra, rb = find(a), find(b)
+        ia, ib = sorted((cluster_id[ra], cluster_id[rb]))
+        total = cluster_size[ra] + cluster_size[rb]
+        result[k] = (ia, ib, height, total)
+        parent[ra] = rb
+        cluster_id[rb] = n + k
+        cluster_size[rb] = total
+    return result
+
+
+def leaf_order(linkage: np.ndarray) -> List[int]:
+    """
+    Leaf ids from left to right in the dendrogram of a linkage matrix
+
+    Placing rows and columns of a correlation matrix in this order puts
+    strongly correlated series next to each other.
+    """
+    n = len(linkage) + 1
+    if n == 1:
+        return [0]
+    order = []
+    stack = [2 * n - 2]
+    while stack:
+        node = stack.pop()
+        if node < n:
+            order.append(int(node))
+        else:
+            left, right = linkage[node - n, :2].astype(int)
+            stack.extend((right, left))
+    return order
+
+
+def lagged_cross_correlation(x: np.ndarray, y: np.ndarray, max_lag: int) -> np.ndarray:
+    """
+    Pearson correlation of every x column with every y column at lags -max_lag..max_lag
+
+    The cross-product sums sum_t x[t] * y[t + k] for all lags come from one
+    FFT-based cross-correlation per x column (zero-padded so nothing wraps
+    around); sums and sums of squares over each lag's overlap come from
+    prefix sums. Each lag is then a Pearson correlation over exactly the
+    overlapping observations, as a shift-and-correlate loop would compute.
+
+    Args:
+        x: T x I array without missing values (the candidate leaders)
+        y: T x S array without missing values
+        max_lag: Largest lag in observations; must be below T - 2
+
+    Returns:
+        (2 * max_lag + 1) x I x S array; index max_lag + k holds the
+        correlation of x[t] with y[t + k], so positive k means x leads y
+    """
+    t = x.shape[0]
+    x = x - x.mean(axis=0)
+    y = y - y.mean(axis=0)
+    lags = np.arange(-max_lag, max_lag + 1)
+
+    # Overlap of lag k: x[t] for t in [x_start, x_stop), paired with y[t + k]
+    x_start = np.maximum(0, -lags)
+    x_stop = t - np.maximum(0, lags)
+    y_start = x_start + lags
+    y_stop = x_stop + lags
+    n = (x_stop - x_start).astype(float)
+
+    def window_sums(values: np.ndarray, start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+        prefix = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(values, axis=0)])
+        return prefix[stop] - prefix[start]
+
+    sx = window_sums(x, x_start, x_stop)[:, :, None]
+    sxx = window_sums(x * x, x_start, x_stop)[:, :, None]
+    sy = window_sums(y, y_start, y_stop)[:, None, :]
+    syy = window_sums(y * y, y_start, y_stop)[:, None, :]
+
+    size = 1 << int(np.ceil(np.log2(2 * t - 1)))
+    fy = np.fft.rfft(y, size, axis=0)
+    sxy = np.empty((len(lags), x.shape[1], y.shape[1]))
+    for i in range(x.shape[1]):
+        fx = np.fft.rfft(x[:, i], size)
+        cross = np.fft.irfft(np.conj(fx)[:, None] * fy, size, axis=0)
+        # Non-negative lags sit at the start, negative lags wrap to the end
+        sxy[:, i, :] = cross[lags % size]
+
+    return _pearson_from_sums(n[:, None, None], sx, sy, sxx, syy, sxy)
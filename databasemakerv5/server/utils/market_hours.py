@@ -0,0 +1,51 @@
+from datetime import datetime, time, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+
+def _market_now(now: Optional[datetime] = None) -> datetime:
+    """Current time in the exchange time zone (naive datetimes are taken as local time)"""
+    now = now or datetime.now().astimezone()
+    if now.tzinfo is None:
+        now = now.astimezone()
+    return now.astimezone(MARKET_TIMEZONE)
+
+
+def is_market_open(now: Optional[datetime] = None) -> bool:
+    """
+    Check whether US equity options are in their regular session
+
+    Exchange holidays are not modelled; on those days this errs towards
+    treating the market as open, which only shortens cache lifetimes.
+    """
+    now = _market_now(now)
+    return now.weekday() < 5 and MARKET_OPEN <= now.time() < MARKET_CLOSE
+
+
+def next_market_open(now: Optional[datetime] = None) -> datetime:
+    """Start of the next regular session after now (timezone-aware)"""
+    now = _market_now(now)
+    day = now.date()
+    if now.time() >= MARKET_OPEN:
+        day += timedelta(days=1)
+    while day.weekday() >= 5:
+        day += timedelta(days=1)
+    return datetime.combine(day, MARKET_OPEN, tzinfo=MARKET_TIMEZONE)
+
+
+def quote_ttl(regular_seconds: float, now: Optional[datetime] = None) -> float:
+    """
+    How long quotes taken now stay current, in seconds
+
+    During the regular session quotes move, so they live regular_seconds;
+    outside it they stay current until the next open (but at least
+    regular_seconds).
+    """
+    if is_market_open(now):
+        return regular_seconds
+    until_open = (next_market_open(now) - _market_now(now)).total_seconds()
+    return max(regular_seconds, until_open)
@@ -0,0 +1,754 @@
+import numpy as np
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+from server.models.options_chain import OptionsChain
+from server.utils.black_scholes import bs_price, bs_greeks, implied_volatility
+
+CONTRACT_MULTIPLIER = 100
+
+# Contracts need at least this much open interest to be ranked for income strategies
+MIN_STRATEGY_OPEN_INTEREST = 10
+
+# Minimum total open interest for max pain to be considered meaningful
+MIN_MAX_PAIN_OPEN_INTEREST = 100
+
+# Pricing errors (per share) below this are treated as transaction costs
+ARBITRAGE_THRESHOLD = 0.5
+
+
+def chain_arrays(contracts: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Convert a list of option contracts into column arrays
+
+    Args:
+        contracts: Contracts in the OptionsContractResponse layout
+
+    Returns:
+        Dict of equally long arrays (see OptionsChain.arrays)
+    """
+    return OptionsChain.from_records(contracts).arrays()
+
+
+def select_rows(chain: Dict[str, np.ndarray], mask: np.ndarray) -> Dict[str, np.ndarray]:
+    """Select the same rows from every column of a chain"""
+    return {key: values[mask] for key, values in chain.items()}
+
+
+def build_chain_index(chain: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Index a chain by expiration, then strike
+
+    Returns:
+        Dict with the row order sorting the chain by (expiration, strike), the
+        sorted strikes, and the distinct expirations with the start/end
+        positions of their block in that order
+    """
+    order = np.lexsort((chain["strike"], chain["expiration"]))
+    sorted_expirations = chain["expiration"][order]
+    expirations, starts = np.unique(sorted_expirations, return_index=True)
+    ends = np.append(starts[1:], len(order))
+    return {
+        "order": order,
+        "strikes": chain["strike"][order],
+        "expirations": expirations,
+        "starts": starts,
+        "ends": ends
+    }
+
+
+def query_chain(chain: Dict[str, np.ndarray],
+                index: Dict[str, np.ndarray],
+                expirations: Optional[List[str]] = None,
+                expiration_from: Optional[str] = None,
+                expiration_to: Optional[str] = None,
+                strike_min: Optional[float] = None,
+                strike_max: Optional[float] = None,
+                contract_type: Optional[str] = None,
+                min_volume: float = 0,
+                min_open_interest: float = 0,
+                delta_min: Optional[float] = None,
+                delta_max: Optional[float] = None) -> np.ndarray:
+    """
+    Find the contracts of an indexed chain matching a set of filters
+
+    Expirations and strike bounds are resolved by binary search on the index,
+    so only the matching strike range of each selected expiration is
+    visited; the remaining filters are applied to those rows only.
+
+    Args:
+        chain: Column arrays (see chain_arrays)
+        index: Index of the chain (see build_chain_index)
+        expirations: Exact expiration dates to include
+        expiration_from, expiration_to: Inclusive expiration range (YYYY-MM-DD)
+        strike_min, strike_max: Inclusive strike range
+        contract_type: 'call' or 'put'
+        min_volume, min_open_interest: Liquidity floors
+        delta_min, delta_max: Inclusive delta range (contracts without delta are excluded)
+
+    Returns:
+        Row positions into the chain, ordered by expiration then strike
+    """
+    all_expirations = index["expirations"]
+    lo = np.searchsorted(all_expirations, expiration_from, "left") if expiration_from else 0
+    hi = np.searchsorted(all_expirations, expiration_to, "right") if expiration_to else len(all_expirations)
+    blocks = np.arange(lo, hi)
+    if expirations is not None:
+        blocks = blocks[np.isin(all_expirations[blocks], expirations)]
+
+    strikes = index["strikes"]
+    positions = []
+    for block in blocks:
+        block_start = index["starts"][block]
+        block_strikes = strikes[block_start:index["ends"][block]]
+        start = block_start + (np.searchsorted(block_strikes, strike_min, "left") if strike_min is not None else 0)
+        end = block_start + (np.searchsorted(block_strikes, strike_max, "right")
+                             if strike_max is not None else len(block_strikes))
+        if end > start:
+            positions.append(index["order"][start:end])
+
+    rows = np.concatenate(positions) if positions else np.empty(0, dtype=int)
+    keep = np.ones(len(rows), dtype=bool)
+    if contract_type:
+        keep &= chain["is_call"][rows] == (contract_type.lower() == "call")
+    if min_volume:
+        keep &= chain["volume"][rows] >= min_volume
+    if min_open_interest:
+        keep &= chain["open_interest"][rows] >= min_open_interest
+    if delta_min is not None:
+        keep &= chain["delta"][rows] >= delta_min
+    if delta_max is not None:
+        keep &= chain["delta"][rows] <= delta_max
+    return rows[keep]
+
+
+def days_to_expiration(expiration: str, today: Optional[date] = None) -> int:
+    """Calendar days until expiration (at least 1, so annualizing never divides by zero)"""
+    today = today or datetime.now().date()
+    return max(1, (datetime.strptime(expiration, "%Y-%m-%d").date() - today).days)
+
+
+def years_to_expiration(expirations: np.ndarray, today: Optional[date] = None) -> np.ndarray:
+    """Years until each expiration, with the same one-day floor as days_to_expiration"""
+    today = np.datetime64(today or datetime.now().date(), "D")
+    parsed = np.array([e if e else "NaT" for e in expirations], dtype="datetime64[D]")
+    days = (parsed - today).astype(float)
+    return np.maximum(days, 1.0) / 365.0
+
+
+def option_prices(chain: Dict[str, np.ndarray]) -> np.ndarray:
+    """Mid price where both sides are quoted, otherwise the last trade"""
+    quoted = (chain["bid"] > 0) & (chain["ask"] >= chain["bid"])
+    return np.where(quoted, (chain["bid"] + chain["ask"]) / 2, chain["last"])
+
+
+def chain_greeks(chain: Dict[str, np.ndarray], spot: float, rate: float = 0.05, dividend_yield: float = 0.0,
+                 today: Optional[date] = None) -> Dict[str, np.ndarray]:
+    """
+    Implied volatility and Greeks of every contract of a chain in one pass
+
+    Quoted implied volatilities are kept; the rest are solved from the option
+    prices. Greeks are computed locally for every contract.
+
+    Args:
+        chain: Column arrays (see chain_arrays), any mix of expirations
+        spot: Underlying price
+        rate: Risk-free rate
+        dividend_yield: Dividend yield
+        today: Valuation date (defaults to today)
+
+    Returns:
+        Dict of implied_volatility, delta, gamma, theta, vega and rho arrays
+        (NaN where the price admits no volatility)
+    """
+    t = years_to_expiration(chain["expiration"], today)
+    iv = chain["implied_volatility"]
+    missing = np.isnan(iv) | (iv <= 0)
+    if missing.any():
+        solved = implied_volatility(option_prices(chain)[missing], spot, chain["strike"][missing], t[missing],
+                                    rate, dividend_yield, chain["is_call"][missing])
+        iv = iv.copy()
+        iv[missing] = solved
+
+    greeks = bs_greeks(spot, chain["strike"], t, rate, dividend_yield, iv, chain["is_call"])
+    return dict(greeks, implied_volatility=iv)
+
+
+def closest_strike(strikes: np.ndarray, price: float) -> Optional[float]:
+    """Strike closest to a price (the lower one on ties)"""
+    if len(strikes) == 0:
+        return None
+    strikes = np.sort(strikes)
+    return float(strikes[np.argmin(np.abs(strikes - price))])
+
+
+def _round(value: float, digits: int = 4) -> float:
+    return round(float(value), digits)
+
+
+def max_pain(chain: Dict[str, np.ndarray], spot: float) -> Optional[Dict[str, Any]]:
+    """
+    Strike at which expiring options pay their holders the least
+
+    The payout at every candidate strike P is
+        sum over calls OI * max(0, P - K) + sum over puts OI * max(0, K - P)
+    which is computed for all candidates at once from prefix sums of open
+    interest and of OI * strike over the sorted strikes, in O(S log S)
+    instead of O(strikes x contracts).
+    """
+    is_call = chain["is_call"]
+    if not is_call.any() or is_call.all():
+        return None
+
+    strikes, inverse = np.unique(chain["strike"], return_inverse=True)
+    oi = chain["open_interest"]
+    call_oi = np.bincount(inverse, weights=np.where(is_call, oi, 0.0), minlength=len(strikes))
+    put_oi = np.bincount(inverse, weights=np.where(is_call, 0.0, oi), minlength=len(strikes))
+
+    # Calls with K <= P pay P - K: P * sum(OI) - sum(OI * K) over lower strikes
+    call_payout = strikes * np.cumsum(call_oi) - np.cumsum(call_oi * strikes)
+    # Puts with K >= P pay K - P: sum(OI * K) - P * sum(OI) over higher strikes
+    put_cum_oi = np.cumsum(put_oi[::-1])[::-1]
+    put_cum_value = np.cumsum((put_oi * strikes)[::-1])[::-1]
+    put_payout = put_cum_value - strikes * put_cum_oi
+
+    pain = (call_payout + put_payout) * CONTRACT_MULTIPLIER
+    best = int(np.argmin(pain))
+    total_call_oi = float(call_oi.sum())
+    total_put_oi = float(put_oi.sum())
+
+    return {
+        "strike": float(strikes[best]),
+        "distance_pct": _round((strikes[best] - spot) / spot * 100, 2),
+        "reliable": total_call_oi + total_put_oi >= MIN_MAX_PAIN_OPEN_INTEREST,
+        "call_open_interest": int(total_call_oi),
+        "put_open_interest": int(total_put_oi),
+        "call_put_oi_ratio": _round(total_call_oi / total_put_oi, 4) if total_put_oi > 0 else None,
+        "pain_by_strike": [{"strike": float(k), "pain": float(p)} for k, p in zip(strikes, pain)]
+    }
+
+
+def interpret_skew(skew: float) -> str:
+    """Describe what a volatility skew (OTM put IV minus OTM call IV) implies"""
+    if skew > 0.1:
+        return "Strong bearish sentiment - significantly more expensive downside protection"
+    if skew > 0.05:
+        return "Moderate bearish sentiment - more expensive downside protection"
+    if skew > 0.02:
+        return "Slight bearish sentiment - somewhat more expensive downside protection"
+    if skew < -0.1:
+        return "Strong bullish sentiment - upside calls relatively expensive"
+    if skew < -0.05:
+        return "Moderate bullish sentiment - upside calls more expensive"
+    if skew < -0.02:
+        return "Slight bullish sentiment - upside calls somewhat more expensive"
+    return "Neutral sentiment - similar pricing for upside and downside options"
+
+
+def volatility_skew(chain: Dict[str, np.ndarray], spot: float) -> Optional[Dict[str, Any]]:
+    """
+    ATM implied volatility and the skew between OTM puts and calls (up to 20% OTM)
+    """
+    iv = chain["implied_volatility"]
+    strike = chain["strike"]
+    valid = ~np.isnan(iv) & (iv > 0)
+    calls = valid & chain["is_call"]
+    puts = valid & ~chain["is_call"]
+    if not calls.any() or not puts.any():
+        return None
+
+    def atm_iv(mask: np.ndarray) -> float:
+        k = closest_strike(strike[mask], spot)
+        return float(iv[mask & (strike == k)][0])
+
+    atm = (atm_iv(calls) + atm_iv(puts)) / 2
+    otm_calls = calls & (strike > spot) & (strike <= spot * 1.2)
+    otm_puts = puts & (strike < spot) & (strike >= spot * 0.8)
+    otm_call_iv = float(iv[otm_calls].mean()) if otm_calls.any() else 0.0
+    otm_put_iv = float(iv[otm_puts].mean()) if otm_puts.any() else 0.0
+    skew = otm_put_iv - otm_call_iv
+
+    return {
+        "atm_iv": _round(atm),
+        "otm_call_iv": _round(otm_call_iv),
+        "otm_put_iv": _round(otm_put_iv),
+        "skew": _round(skew),
+        "interpretation": interpret_skew(skew)
+    }
+
+
+def _top(values: np.ndarray, k: int = 5) -> np.ndarray:
+    """Indices of the k largest values, largest first"""
+    return np.argsort(-values, kind="stable")[:k]
+
+
+def covered_calls(chain: Dict[str, np.ndarray], spot: float, days: int, top: int = 5) -> Optional[Dict[str, Any]]:
+    """
+    Rank OTM calls for selling against stock held
+
+    Static return is the premium (bid) over the stock price; the if-assigned
+    return adds the gain up to the strike. The overall score weights the
+    if-assigned return more heavily the longer the time to expiration.
+    """
+    mask = chain["is_call"] & (chain["strike"] > spot) & (chain["bid"] > 0) & \
+        (chain["open_interest"] > MIN_STRATEGY_OPEN_INTEREST)
+    if not mask.any():
+        return None
+
+    strike = chain["strike"][mask]
+    premium = chain["bid"][mask]
+    annual = 365.0 / days
+    static = premium / spot
+    assigned = (strike - spot + premium) / spot
+    weight = min(1.0, days / 30.0)
+    score = static * annual * (1 - weight) + assigned * annual * weight
+
+    def rows(indices: np.ndarray) -> List[Dict[str, Any]]:
+        return [{
+            "strike": float(strike[i]),
+            "premium": float(premium[i]),
+            "static_return": _round(static[i]),
+            "assigned_return": _round(assigned[i]),
+            "annualized_static_return": _round(static[i] * annual),
+            "annualized_assigned_return": _round(assigned[i] * annual),
+            "score": _round(score[i])
+        } for i in indices]
+
+    return {
+        "best": rows(_top(score, 1))[0],
+        "by_static_return": rows(_top(static, top)),
+        "by_assigned_return": rows(_top(assigned, top))
+    }
+
+
+def cash_secured_puts(chain: Dict[str, np.ndarray], spot: float, days: int,
+                      top: int = 5) -> Optional[Dict[str, Any]]:
+    """
+    Rank OTM puts for selling against cash
+
+    Return on capital is the premium (bid) over the strike; the discount is
+    how far below the stock price the effective purchase price (strike minus
+    premium) lies. Lower strikes weight the discount more heavily.
+    """
+    mask = ~chain["is_call"] & (chain["strike"] < spot) & (chain["bid"] > 0) & \
+        (chain["open_interest"] > MIN_STRATEGY_OPEN_INTEREST)
+    if not mask.any():
+        return None
+
+    strike = chain["strike"][mask]
+    premium = chain["bid"][mask]
+    annual = 365.0 / days
+    return_on_capital = premium / strike
+    discount = (spot - (strike - premium)) / spot
+    discount_weight = np.clip(2 - 2 * strike / spot, 0.0, 1.0)
+    score = return_on_capital * annual * (1 - discount_weight) + discount * discount_weight * 5
+
+    def rows(indices: np.ndarray) -> List[Dict[str, Any]]:
+        return [{
+            "strike": float(strike[i]),
+            "premium": float(premium[i]),
+            "return_on_capital": _round(return_on_capital[i]),
+            "annualized_return_on_capital": _round(return_on_capital[i] * annual),
+            "discount_if_assigned": _round(discount[i]),
+            "effective_price": _round(strike[i] - premium[i]),
+            "score": _round(score[i])
+        } for i in indices]
+
+    return {
+        "best": rows(_top(score, 1))[0],
+        "by_return": rows(_top(return_on_capital, top)),
+        "by_discount": rows(_top(discount, top))
+    }
+
+
+def _paired_strikes(chain: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Match each call with the put at the same strike (first contract per strike and side)"""
+    strike = chain["strike"]
+    is_call = chain["is_call"]
+    call_idx = np.flatnonzero(is_call)
+    put_idx = np.flatnonzero(~is_call)
+    call_strikes, first_call = np.unique(strike[call_idx], return_index=True)
+    put_strikes, first_put = np.unique(strike[put_idx], return_index=True)
+    common, in_calls, in_puts = np.intersect1d(call_strikes, put_strikes, return_indices=True)
+    return {
+        "strike": common,
+        "call": call_idx[first_call[in_calls]],
+        "put": put_idx[first_put[in_puts]]
+    }
+
+
+def put_call_parity(chain: Dict[str, np.ndarray], spot: float, days: int, rate: float,
+                    dividend_yield: float, band: float = 100.0) -> Optional[Dict[str, Any]]:
+    """
+    Check c + K e^{-rT} = p + S e^{-qT} at every strike with both a call and a put
+
+    Mid prices are compared with each other and with Black-Scholes prices at
+    the contract's implied volatility (30% when none is available). Strikes
+    within +/- band of the spot price are analysed.
+    """
+    pairs = _paired_strikes(chain)
+    keep = np.abs(pairs["strike"] - spot) <= band
+    strike = pairs["strike"][keep]
+    if len(strike) == 0:
+        return None
+    call, put = pairs["call"][keep], pairs["put"][keep]
+
+    t = days / 365.0
+    call_mid = (chain["bid"][call] + chain["ask"][call]) / 2
+    put_mid = (chain["bid"][put] + chain["ask"][put]) / 2
+    left = call_mid + strike * np.exp(-rate * t)
+    right = put_mid + spot * np.exp(-dividend_yield * t)
+    difference = left - right
+    difference_pct = difference / right * 100
+    significant = np.abs(difference_pct) > 0.5
+
+    iv = np.where(np.isnan(chain["implied_volatility"][call]) | (chain["implied_volatility"][call] <= 0),
+                  chain["implied_volatility"][put], chain["implied_volatility"][call])
+    iv = np.where(np.isnan(iv) | (iv <= 0), 0.3, iv)
+    theoretical_call = bs_price(spot, strike, t, rate, dividend_yield, iv, True)
+    theoretical_put = bs_price(spot, strike, t, rate, dividend_yield, iv, False)
+
+    strategy = np.where(~significant, "None", np.where(difference > 0, "Conversion", "Reversal"))
+    atm = int(np.argmin(np.abs(strike - spot)))
+
+    rows = [{
+        "strike": float(strike[i]),
+        "call_price": _round(call_mid[i]),
+        "put_price": _round(put_mid[i]),
+        "theoretical_call": _round(theoretical_call[i]),
+        "theoretical_put": _round(theoretical_put[i]),
+        "call_diff": _round(call_mid[i] - theoretical_call[i]),
+        "put_diff": _round(put_mid[i] - theoretical_put[i]),
+        "parity_difference": _round(difference[i]),
+        "parity_difference_pct": _round(difference_pct[i]),
+        "strategy": str(strategy[i]),
+        "significant": bool(significant[i])
+    } for i in range(len(strike))]
+
+    return {
+        "rate": rate,
+        "dividend_yield": dividend_yield,
+        "atm": rows[atm],
+        "strikes": rows
+    }
+
+
+def arbitrage_opportunities(chain: Dict[str, np.ndarray], spot: float, days: int, rate: float,
+                            top: int = 3) -> List[Dict[str, Any]]:
+    """
+    Conversions and reversals whose parity error (c - p vs S - K e^{-rT}) exceeds transaction costs
+    """
+    pairs = _paired_strikes(chain)
+    if len(pairs["strike"]) == 0:
+        return []
+    call, put = pairs["call"], pairs["put"]
+    t = days / 365.0
+    call_mid = (chain["bid"][call] + chain["ask"][call]) / 2
+    put_mid = (chain["bid"][put] + chain["ask"][put]) / 2
+    error = (call_mid - put_mid) - (spot - pairs["strike"] * np.exp(-rate * t))
+
+    candidates = np.flatnonzero(np.abs(error) > ARBITRAGE_THRESHOLD)
+    candidates = candidates[_top(np.abs(error[candidates]), top)]
+    return [{
+        "strike": float(pairs["strike"][i]),
+        "type": "Conversion" if error[i] > 0 else "Reversal",
+        "strategy": "Short call, long put, long stock" if error[i] > 0 else "Long call, short put, short stock",
+        "expected_profit": _round(abs(error[i]) * CONTRACT_MULTIPLIER, 2)
+    } for i in candidates]
+
+
+def _interpret_ratio(ratio: float, labels: List[str]) -> str:
+    for threshold, label in zip((1.5, 1.0, 0.7, 0.5), labels):
+        if ratio > threshold:
+            return label
+    return labels[-1]
+
+
+def put_call_ratio(chain: Dict[str, np.ndarray]) -> Optional[Dict[str, Any]]:
+    """Put/call ratios of volume and open interest"""
+    is_call = chain["is_call"]
+    if not is_call.any() or is_call.all():
+        return None
+    call_volume = float(chain["volume"][is_call].sum())
+    put_volume = float(chain["volume"][~is_call].sum())
+    call_oi = float(chain["open_interest"][is_call].sum())
+    put_oi = float(chain["open_interest"][~is_call].sum())
+    volume_ratio = put_volume / (call_volume or 1)
+    oi_ratio = put_oi / (call_oi or 1)
+
+    return {
+        "call_volume": int(call_volume),
+        "put_volume": int(put_volume),
+        "call_open_interest": int(call_oi),
+        "put_open_interest": int(put_oi),
+        "volume_ratio": _round(volume_ratio),
+        "open_interest_ratio": _round(oi_ratio),
+        "volume_interpretation": _interpret_ratio(volume_ratio, [
+            "Strongly bearish - Recent high put buying activity",
+            "Moderately bearish - More put than call activity",
+            "Neutral to slightly bearish",
+            "Neutral to slightly bullish",
+            "Bullish - Significantly more call than put activity"
+        ]),
+        "open_interest_interpretation": _interpret_ratio(oi_ratio, [
+            "Strongly bearish sentiment",
+            "Moderately bearish sentiment",
+            "Neutral to slightly bearish sentiment",
+            "Neutral to slightly bullish sentiment",
+            "Bullish sentiment"
+        ])
+    }
+
+
+def notable_activity(chain: Dict[str, np.ndarray], top: int = 3) -> Dict[str, List[Dict[str, Any]]]:
+    """Contracts with the highest volume, highest open interest and highest volume/OI ratio"""
+    volume = chain["volume"]
+    oi = chain["open_interest"]
+
+    def rows(indices: np.ndarray, extra: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        result = []
+        for i in indices:
+            row = {
+                "type": "call" if chain["is_call"][i] else "put",
+                "strike": float(chain["strike"][i]),
+                "volume": int(volume[i]),
+                "open_interest": int(oi[i])
+            }
+            if extra is not None:
+                row["volume_oi_ratio"] = _round(extra[i])
+            result.append(row)
+        return result
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(oi > MIN_STRATEGY_OPEN_INTEREST, volume / oi, 0.0)
+
+    by_volume = np.flatnonzero(volume > 0)
+    by_oi = np.flatnonzero(oi > 0)
+    unusual = np.flatnonzero(ratio > 0.5)
+    return {
+        "highest_volume": rows(by_volume[_top(volume[by_volume], top)]),
+        "highest_open_interest": rows(by_oi[_top(oi[by_oi], top)]),
+        "unusual_activity": rows(unusual[_top(ratio[unusual], top)], ratio)
+    }
+
+
+def summary_stats(chain: Dict[str, np.ndarray], spot: float) -> Dict[str, Any]:
+    """Premium totals and averages, and the move implied by the ATM straddle"""
+    is_call = chain["is_call"]
+    bid = chain["bid"]
+    premium = bid * chain["open_interest"] * CONTRACT_MULTIPLIER
+
+    implied_move = 0.0
+    if is_call.any() and (~is_call).any():
+        call_k = closest_strike(chain["strike"][is_call], spot)
+        put_k = closest_strike(chain["strike"][~is_call], spot)
+        call_bid = bid[is_call & (chain["strike"] == call_k)][0]
+        put_bid = bid[~is_call & (chain["strike"] == put_k)][0]
+        implied_move = (call_bid + put_bid) / spot
+
+    return {
+        "total_call_premium": _round(premium[is_call].sum(), 2),
+        "total_put_premium": _round(premium[~is_call].sum(), 2),
+        "average_call_premium": _round(bid[is_call].mean(), 4) if is_call.any() else 0.0,
+        "average_put_premium": _round(bid[~is_call].mean(), 4) if (~is_call).any() else 0.0,
+        "implied_move": _round(implied_move)
+    }
+
+
+def analyze_chain(chain: Dict[str, np.ndarray], spot: float, expiration: str, rate: float = 0.05,
+                  dividend_yield: float = 0.0, today: Optional[date] = None) -> Dict[str, Any]:
+    """
+    Run all analytics on the contracts of one expiration
+
+    Args:
+        chain: Column arrays (see chain_arrays) of a single expiration
+        spot: Underlying price
+        expiration: Expiration date in YYYY-MM-DD format
+        rate: Risk-free rate for parity checks
+        dividend_yield: Dividend yield for parity checks
+        today: Valuation date (defaults to today)
+
+    Returns:
+        Dict with one entry per analysis (None where the chain lacks the data)
+    """
+    days = days_to_expiration(expiration, today)
+    return {
+        "expiration": expiration,
+        "stock_price": spot,
+        "days_to_expiration": days,
+        "contracts": int(len(chain["strike"])),
+        "volatility_skew": volatility_skew(chain, spot),
+        "covered_calls": covered_calls(chain, spot, days),
+        "cash_secured_puts": cash_secured_puts(chain, spot, days),
+        "max_pain": max_pain(chain, spot),
+        "put_call_parity": put_call_parity(chain, spot, days, rate, dividend_yield),
+        "arbitrage": arbitrage_opportunities(chain, spot, days, rate),
+        "put_call_ratio": put_call_ratio(chain),
+        "notable_activity": notable_activity(chain),
+        "summary": summary_stats(chain, spot)
+    }
+
+
+def calculation_results(analytics: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Condense analyze_chain output into the title/label/value list the options
+    prompt in OpenAIOptionsService is built from
+    """
+    results = [{
+        "type": "basicInfo",
+        "title": "Expiration Information",
+        "data": [
+            {"label": "Days to Expiration", "value": analytics["days_to_expiration"]},
+            {"label": "Annual Factor", "value": f"{365 / analytics['days_to_expiration']:.2f}"}
+        ]
+    }]
+
+    skew = analytics["volatility_skew"]
+    if skew:
+        results.append({"type": "volatilitySkew", "title": "Volatility Analysis", "data": [
+            {"label": "ATM Implied Volatility", "value": f"{skew['atm_iv'] * 100:.2f}%"},
+            {"label": "OTM Calls Average IV", "value": f"{skew['otm_call_iv'] * 100:.2f}%"},
+            {"label": "OTM Puts Average IV", "value": f"{skew['otm_put_iv'] * 100:.2f}%"},
+            {"label": "Volatility Skew", "value": f"{skew['skew'] * 100:.2f}%"},
+            {"label": "IV Interpretation", "value": skew["interpretation"]}
+        ]})
+
+    calls = analytics["covered_calls"]
+    if calls:
+        best = calls["best"]
+        results.append({"type": "coveredCalls", "title": "Best Covered Call Opportunities", "data": [
+            {"label": "Highest Premium Yield", "value": f"${calls['by_static_return'][0]['strike']} strike: "
+                                                        f"{calls['by_static_return'][0]['annualized_static_return'] * 100:.2f}% annualized"},
+            {"label": "Highest If Assigned Return", "value": f"${calls['by_assigned_return'][0]['strike']} strike: "
+                                                             f"{calls['by_assigned_return'][0]['annualized_assigned_return'] * 100:.2f}% annualized"},
+            {"label": "Best Overall Opportunity", "value": f"${best['strike']} strike - {analytics['days_to_expiration']} DTE"}
+        ]})
+
+    puts = analytics["cash_secured_puts"]
+    if puts:
+        best = puts["best"]
+        results.append({"type": "cashSecuredPuts", "title": "Best Cash Secured Put Opportunities", "data": [
+            {"label": "Highest Premium Return", "value": f"${puts['by_return'][0]['strike']} strike: "
+                                                         f"{puts['by_return'][0]['annualized_return_on_capital'] * 100:.2f}% annualized"},
+            {"label": "Largest Discount If Assigned", "value": f"${puts['by_discount'][0]['strike']} strike: "
+                                                               f"{puts['by_discount'][0]['discount_if_assigned'] * 100:.2f}% below current price"},
+            {"label": "Best Overall Opportunity", "value": f"${best['strike']} strike - {analytics['days_to_expiration']} DTE"}
+        ]})
+
+    pain = analytics["max_pain"]
+    if pain:
+        ratio = pain["call_put_oi_ratio"]
+        results.append({"type": "maxPain", "title": "Maximum Pain Analysis", "data": [
+            {"label": "Max Pain Point", "value": f"${pain['strike']:.2f}"},
+            {"label": "Distance from Current Price", "value": f"{pain['distance_pct']:.2f}%"},
+            {"label": "Reliability", "value": "High" if pain["reliable"] else "Low"},
+            {"label": "Call/Put OI Ratio", "value": f"{ratio:.2f}" if ratio is not None else "N/A"}
+        ]})
+
+    parity = analytics["put_call_parity"]
+    if parity:
+        atm = parity["atm"]
+        results.append({"type": "putCallParity", "title": "Put-Call Parity Analysis", "data": [
+            {"label": "Strike Price", "value": f"{atm['strike']:.2f}"},
+            {"label": "Parity Difference", "value": f"{atm['parity_difference']:.2f} ({atm['parity_difference_pct']:.2f}%)"},
+            {"label": "BS Theoretical Call", "value": f"{atm['theoretical_call']:.2f}"},
+            {"label": "BS Theoretical Put", "value": f"{atm['theoretical_put']:.2f}"},
+            {"label": "Arbitrage Strategy", "value": atm["strategy"]}
+        ]})
+
+    results.append({"type": "arbitrage", "title": "Potential Arbitrage Opportunities", "data": [
+        {"label": f"{a['type']} at ${a['strike']}", "value": f"${a['expected_profit']:.2f} per contract"}
+        for a in analytics["arbitrage"]
+    ] or [{"label": "No significant arbitrage detected", "value": "Market appears efficient"}]})
+
+    ratio = analytics["put_call_ratio"]
+    if ratio:
+        results.append({"type": "putCallRatio", "title": "Put-Call Ratio Analysis", "data": [
+            {"label": "Volume P/C Ratio", "value": f"{ratio['volume_ratio']:.2f}"},
+            {"label": "Open Interest P/C Ratio", "value": f"{ratio['open_interest_ratio']:.2f}"},
+            {"label": "Volume Interpretation", "value": ratio["volume_interpretation"]},
+            {"label": "OI Interpretation", "value": ratio["open_interest_interpretation"]}
+        ]})
+
+    summary = analytics["summary"]
+    results.append({"type": "summaryStats", "title": "Options Summary Statistics", "data": [
+        {"label": "Total Call Premium", "value": f"${summary['total_call_premium']:,.0f}"},
+        {"label": "Total Put Premium", "value": f"${summary['total_put_premium']:,.0f}"},
+        {"label": "Implied Move", "value": f"{summary['implied_move'] * 100:.2f}%"}
+    ]})
+    return results
+
+
+def volatility_surface(chain: Dict[str, np.ndarray], spot: float, moneyness_points: int = 25,
+                       tenor_points: int = 20, moneyness_min: float = 0.7, moneyness_max: float = 1.3,
+                       min_quotes: int = 3, today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+    """
+    Implied volatility on a fixed (moneyness, time to expiry) grid
+
+    Out-of-the-money contracts with a quoted bid are used (calls at or above
+    spot, puts below). For each expiration, total variance (IV^2 * t) is
+    interpolated linearly in log-moneyness onto the grid; between expirations
+    it is interpolated linearly in time, which keeps the surface free of
+    calendar arbitrage wherever the quotes are. Grid points outside the quoted
+    strikes of an expiration, or outside the first and last expiration, are
+    left empty rather than extrapolated.
+
+    Args:
+        chain: Column arrays (see chain_arrays) with implied volatility filled
+        spot: Underlying price
+        moneyness_points, tenor_points: Grid size
+        moneyness_min, moneyness_max: Moneyness (strike / spot) range of the grid
+        min_quotes: Expirations with fewer usable quotes are skipped
+        today: Valuation date (defaults to today)
+
+    Returns:
+        Dict with the moneyness, strike and tenor (days) axes, the expirations
+        used, and the IV grid (one row per tenor, NaN where empty); None if
+        fewer than two expirations are usable
+    """
+    iv = chain["implied_volatility"]
+    strike = chain["strike"]
+    out_of_money = np.where(chain["is_call"], strike >= spot, strike < spot)
+    usable = out_of_money & (chain["bid"] > 0) & np.isfinite(iv) & (iv > 0) & (iv < 5)
+
+    t = years_to_expiration(chain["expiration"], today)
+    grid_x = np.log(np.linspace(moneyness_min, moneyness_max, moneyness_points))
+
+    times, variances, used = [], [], []
+    for expiration in np.unique(chain["expiration"][usable]):
+        rows = usable & (chain["expiration"] == expiration)
+        # Expirations within a day of each other share the one-day time floor
+        if rows.sum() < min_quotes or (times and t[rows][0] <= times[-1]):
+            continue
+        x = np.log(strike[rows] / spot)
+        w = iv[rows] ** 2 * t[rows]
+        # Average duplicate strikes, since np.interp needs increasing abscissae
+        x_unique, inverse = np.unique(x, return_inverse=True)
+        w_unique = np.bincount(inverse, weights=w) / np.bincount(inverse)
+        inside = (grid_x >= x_unique[0]) & (grid_x <= x_unique[-1])
+        times.append(t[rows][0])
+        variances.append(np.where(inside, np.interp(grid_x, x_unique, w_unique), np.nan))
+        used.append(str(expiration))
+
+    if len(times) < 2:
+        return None
+
+    times = np.array(times)
+    variances = np.vstack(variances)
+    grid_t = np.linspace(times[0], times[-1], tenor_points)
+
+    # Bracketing expirations and linear weights of every grid tenor
+    upper = np.clip(np.searchsorted(times, grid_t, "left"), 1, len(times) - 1)
+    lower = upper - 1
+    weight = ((grid_t - times[lower]) / (times[upper] - times[lower]))[:, None]
+    total_variance = (1 - weight) * variances[lower] + weight * variances[upper]
+    with np.errstate(invalid="ignore"):
+        surface = np.sqrt(np.maximum(total_variance, 0.0) / grid_t[:, None])
+    surface[np.isnan(total_variance)] = np.nan
+
+    return {
+        "moneyness": np.exp(grid_x),
+        "strikes": np.exp(grid_x) * spot,
+        "tenors": grid_t * 365.0,
+        "expirations": used,
+        "iv": surface
+    }
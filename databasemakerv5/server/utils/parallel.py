@@ -0,0 +1,59 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_worker_count(configured: int = 0) -> int:
+    """Get the number of worker processes to use (0 = one per core)"""
+    return configured if configured > 0 else (os.cpu_count() or 1)
+
+
+def get_process_pool(max_workers: int = 0) -> ProcessPoolExecutor:
+    """
+    Get the shared process pool for CPU-bound work
+
+    The pool is created on first use and reused for the lifetime of the
+    process, so worker start-up cost is only paid once.
+
+    Args:
+        max_workers: Number of worker processes (0 = one per core)
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=get_worker_count(max_workers))
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Shut down the shared process pool"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+
+def partition(items: Sequence[T], parts: int) -> List[List[T]]:
+    """
+    Split items into at most `parts` contiguous chunks of near-equal size
+
+    Args:
+        items: Items to split
+        parts: Maximum number of chunks
+
+    Returns:
+        List of non-empty chunks
+    """
+    parts = max(1, min(parts, len(items)))
+    size, extra = divmod(len(items), parts)
+    chunks = []
+    start = 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            chunks.append(list(items[start:end]))
+        start = end
+    return chunks
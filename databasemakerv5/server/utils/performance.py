@@ -0,0 +1,84 @@
+import numpy as np
+from typing import Dict, Optional
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def signal_positions(entry: np.ndarray, exit: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Turn entry/exit signals into a 0/1 position held after each bar
+
+    With only an entry signal the position is held while the signal is true.
+    With an exit signal too, a position opened on an entry bar is held until
+    the next exit bar (exit wins when both fire on the same bar). The state
+    machine is resolved without a Python loop by forward-filling the index of
+    the last signal.
+
+    Args:
+        entry: Boolean entry signal per bar
+        exit: Optional boolean exit signal per bar
+
+    Returns:
+        Float array of positions (1.0 = long, 0.0 = flat)
+    """
+    if exit is None:
+        return entry.astype(float)
+
+    enter = entry & ~exit
+    events = enter | exit
+    # Index of the most recent bar with any signal, -1 before the first one
+    last_event = np.where(events, np.arange(len(entry)), -1)
+    last_event = np.maximum.accumulate(last_event)
+    positions = np.where(last_event >= 0, enter[np.maximum(last_event, 0)], False)
+    return positions.astype(float)
+
+
+def drawdown(equity: np.ndarray) -> np.ndarray:
+    """Drawdown from the running peak for each point of an equity curve"""
+    peak = np.maximum.accumulate(equity, axis=0)
+    return equity / peak - 1.0
+
+
+def performance_metrics(returns: np.ndarray, positions: np.ndarray,
+                        periods_per_year: int = TRADING_DAYS_PER_YEAR) -> Dict[str, float]:
+    """
+    Compute summary statistics for a strategy return series
+
+    Args:
+        returns: Per-period strategy returns (after costs)
+        positions: Position held during each period
+        periods_per_year: Number of periods in a year, for annualization
+
+    Returns:
+        Dict of total return, CAGR, volatility, Sharpe, max drawdown,
+        turnover, exposure and number of trades
+    """
+    n = len(returns)
+    if n == 0:
+        return {
+            "total_return": 0.0, "cagr": 0.0, "volatility": 0.0, "sharpe": 0.0,
+            "max_drawdown": 0.0, "turnover": 0.0, "exposure": 0.0, "trades": 0
+        }
+
+    equity = np.cumprod(1.0 + returns)
+    total_return = equity[-1] - 1.0
+    years = n / periods_per_year
+    cagr = equity[-1] ** (1.0 / years) - 1.0 if equity[-1] > 0 else -1.0
+
+    std = returns.std(ddof=1) if n > 1 else 0.0
+    volatility = std * np.sqrt(periods_per_year)
+    sharpe = returns.mean() / std * np.sqrt(periods_per_year) if std > 0 else 0.0
+
+    changes = np.abs(np.diff(positions, prepend=0.0))
+    turnover = changes.sum() / years
+
+    return {
+        "total_return": round(float(total_return), 6),
+        "cagr": round(float(cagr), 6),
+        "volatility": round(float(volatility), 6),
+        "sharpe": round(float(sharpe), 4),
+        "max_drawdown": round(float(drawdown(equity).min()), 6),
+        "turnover": round(float(turnover), 4),
+        "exposure": round(float(np.mean(positions != 0)), 4),
+        "trades": int(np.count_nonzero(np.diff(positions, prepend=0.0) > 0))
+    }
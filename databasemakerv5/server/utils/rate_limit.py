@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    """
+    Async limiter spacing requests evenly within a per-minute budget
+
+    Each caller reserves the next free slot and sleeps until it comes up.
+    Reserving doesn't await, so concurrent tasks on the event loop share one
+    budget without bursting past it and without needing a lock.
+    """
+
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+
+    async def acquire(self) -> None:
+        """Wait until the next request is allowed"""
+        if self.interval <= 0:
+            return
+
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
@@ -0,0 +1,99 @@
+import os
+import pickle
+import tempfile
+import numpy as np
+from typing import Any, Dict, Optional
+
+
+def safe_filename(name: str) -> str:
+    """
+    Make a symbol or series name safe for use as a file name
+
+    Args:
+        name: Symbol or series name
+
+    Returns:
+        File-system safe name
+    """
+    return "".join(c if c.isalnum() or c in "-_.^" else "_" for c in name.strip())
+
+
+def write_pickle(path: str, obj: Any) -> None:
+    """
+    Atomically write an object to disk as a pickle
+
+    The object is written to a temporary file in the same directory and then
+    moved into place, so readers never see a partially written file.
+
+    Args:
+        path: Destination file path
+        obj: Object to store
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_pickle(path: str) -> Optional[Any]:
+    """
+    Read a pickled object from disk
+
+    Args:
+        path: File path
+
+    Returns:
+        The stored object, or None if the file does not exist
+    """
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def write_npz(path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """
+    Atomically write named arrays to disk as a compressed .npz file
+
+    Args:
+        path: Destination file path
+        arrays: Arrays to store, by name
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_npz(path: str) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Read named arrays written by write_npz
+
+    Args:
+        path: File path
+
+    Returns:
+        Dict of arrays, or None if the file does not exist
+    """
+    if not os.path.exists(path):
+        return None
+
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
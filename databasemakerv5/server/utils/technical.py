@@ -0,0 +1,438 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+# Price columns that can be referenced directly in an expression
+PRICE_FIELDS = ("open", "high", "low", "close", "adjusted_close", "volume")
+
+COMPARISON_OPERATORS = ("<", "<=", ">", ">=", "==", "!=")
+
+# Operators comparing a bar with the previous one, e.g. "SMA(50) crosses_above SMA(200)"
+CROSS_OPERATORS = ("crosses_above", "crosses_below")
+
+
+# ---------------------------------------------------------------------------
+# Vectorized indicator implementations
+# ---------------------------------------------------------------------------
+
+def _wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's smoothing (an EMA with alpha = 1 / period)"""
+    return pd.Series(values).ewm(alpha=1.0 / period, adjust=False, min_periods=period).mean().to_numpy()
+
+
+def sma(close: pd.Series, period: int = 20) -> np.ndarray:
+    """Simple moving average"""
+    values = close.to_numpy(dtype=float)
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        cumsum = np.cumsum(np.insert(values, 0, 0.0))
+        result[period - 1:] = (cumsum[period:] - cumsum[:-period]) / period
+    return result
+
+
+def ema(close: pd.Series, period: int = 20) -> np.ndarray:
+    """Exponential moving average"""
+    return close.ewm(span=period, adjust=False, min_periods=period).mean().to_numpy()
+
+
+def wma(close: pd.Series, period: int = 20) -> np.ndarray:
+    """Linearly weighted moving average"""
+    values = close.to_numpy(dtype=float)
+    weights = np.arange(1, period + 1, dtype=float)
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        windows = np.lib.stride_tricks.sliding_window_view(values, period)
+        result[period - 1:] = windows @ weights / weights.sum()
+    return result
+
+
+def rsi(close: pd.Series, period: int = 14) -> np.ndarray:
+    """Relative strength index using Wilder's smoothing"""
+    # The first bar has no change, so smoothing starts from the second one
+    delta = np.diff(close.to_numpy(dtype=float))
+    gain = np.insert(_wilder(np.where(delta > 0, delta, 0.0), period), 0, np.nan)
+    loss = np.insert(_wilder(np.where(delta < 0, -delta, 0.0), period), 0, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = 100.0 - 100.0 / (1.0 + gain / loss)
+    # No losses over the window means maximum strength
+    result[(loss == 0) & (gain > 0)] = 100.0
+    return result
+
+
+def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, np.ndarray]:
+    """Moving average convergence/divergence"""
+    line = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+    line.iloc[:slow - 1] = np.nan
+    signal_line = line.ewm(span=signal, adjust=False, min_periods=signal).mean()
+    return {
+        "macd": line.to_numpy(),
+        "signal": signal_line.to_numpy(),
+        "hist": (line - signal_line).to_numpy()
+    }
+
+
+def bbands(close: pd.Series, period: int = 20, num_std: float = 2.0) -> Dict[str, np.ndarray]:
+    """Bollinger bands"""
+    rolling = close.rolling(period, min_periods=period)
+    middle = rolling.mean()
+    std = rolling.std(ddof=0)
+    return {
+        "upper": (middle + num_std * std).to_numpy(),
+        "middle": middle.to_numpy(),
+        "lower": (middle - num_std * std).to_numpy()
+    }
+
+
+def _true_range(df: pd.DataFrame) -> pd.Series:
+    prev_close = df["close"].shift(1)
+    return pd.concat([
+        df["high"] - df["low"],
+        (df["high"] - prev_close).abs(),
+        (df["low"] - prev_close).abs()
+    ], axis=1).max(axis=1, skipna=False)
+
+
+def atr(df: pd.DataFrame, period: int = 14) -> np.ndarray:
+    """Average true range using Wilder's smoothing"""
+    return _wilder(_true_range(df).to_numpy(), period)
+
+
+def roc(close: pd.Series, period: int = 10) -> np.ndarray:
+    """Rate of change in percent"""
+    return (close.pct_change(period, fill_method=None) * 100.0).to_numpy()
+
+
+def mom(close: pd.Series, period: int = 10) -> np.ndarray:
+    """Momentum"""
+    return close.diff(period).to_numpy()
+
+
+def willr(df: pd.DataFrame, period: int = 14) -> np.ndarray:
+    """Williams' %R"""
+    highest = df["high"].rolling(period, min_periods=period).max()
+    lowest = df["low"].rolling(period, min_periods=period).min()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (-100.0 * (highest - df["close"]) / (highest - lowest)).to_numpy()
+
+
+def stoch(df: pd.DataFrame, k_period: int = 14, k_smooth: int = 3, d_period: int = 3) -> Dict[str, np.ndarray]:
+    """Slow stochastic oscillator"""
+    highest = df["high"].rolling(k_period, min_periods=k_period).max()
+    lowest = df["low"].rolling(k_period, min_periods=k_period).min()
+    fast_k = 100.0 * (df["close"] - lowest) / (highest - lowest)
+    slow_k = fast_k.rolling(k_smooth, min_periods=k_smooth).mean()
+    slow_d = slow_k.rolling(d_period, min_periods=d_period).mean()
+    return {"k": slow_k.to_numpy(), "d": slow_d.to_numpy()}
+
+
+def obv(df: pd.DataFrame) -> np.ndarray:
+    """On balance volume"""
+    direction = np.sign(df["close"].diff().fillna(0.0).to_numpy())
+    return np.cumsum(direction * df["volume"].to_numpy(dtype=float))
+
+
+# name -> (function, takes full frame, default args, output names)
+INDICATORS = {
+    "SMA": (sma, False, (20,), None),
+    "EMA": (ema, False, (20,), None),
+    "WMA": (wma, False, (20,), None),
+    "RSI": (rsi, False, (14,), None),
+    "MACD": (macd, False, (12, 26, 9), ("macd", "signal", "hist")),
+    "BBANDS": (bbands, False, (20, 2.0), ("upper", "middle", "lower")),
+    "ATR": (atr, True, (14,), None),
+    "ROC": (roc, False, (10,), None),
+    "MOM": (mom, False, (10,), None),
+    "WILLR": (willr, True, (14,), None),
+    "STOCH": (stoch, True, (14, 3, 3), ("k", "d")),
+    "OBV": (obv, True, (), None),
+}
+
+
+# ---------------------------------------------------------------------------
+# Condition expressions, e.g. "RSI(14) < 30 and close > SMA(200)"
+# ---------------------------------------------------------------------------
+
+class Term(NamedTuple):
+    """A value referenced in an expression: a number, a price field or an indicator"""
+    kind: str  # 'number', 'field' or 'indicator'
+    name: str
+    args: Tuple[float, ...] = ()
+    output: Optional[str] = None
+    value: float = 0.0
+
+    @property
+    def text(self) -> str:
+        if self.kind == "number":
+            return f"{self.value:g}"
+        if self.kind == "field":
+            return self.name
+        text = f"{self.name}({','.join(f'{a:g}' for a in self.args)})"
+        return f"{text}.{self.output}" if self.output else text
+
+
+class Comparison(NamedTuple):
+    """A single comparison between two terms"""
+    left: Term
+    op: str
+    right: Term
+
+
+# An expression is a list of OR-ed groups, each a list of AND-ed comparisons
+Expression = List[List[Comparison]]
+
+_TOKEN_RE = re.compile(r"\s*(?:(-?\d+(?:\.\d*)?|-?\.\d+)|([A-Za-z_][A-Za-z_0-9]*)|(<=|>=|==|!=|<|>)|([(),.]))")
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise ValueError(f"Invalid expression near '{text[pos:pos + 10]}'")
+        number, name, op, punct = match.groups()
+        if number is not None:
+            tokens.append(("number", number))
+        elif name is not None:
+            tokens.append(("name", name))
+        elif op is not None:
+            tokens.append(("op", op))
+        else:
+            tokens.append(("punct", punct))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, kind: Optional[str] = None, value: Optional[str] = None) -> Tuple[str, str]:
+        token = self.peek()
+        if token is None or (kind and token[0] != kind) or (value and token[1] != value):
+            expected = value or kind or "token"
+            found = token[1] if token else "end of expression"
+            raise ValueError(f"Expected {expected} but found {found}")
+        self.pos += 1
+        return token
+
+    def parse_expression(self) -> Expression:
+        groups = [self.parse_group()]
+        while self.peek() and self.peek()[1].lower() == "or":
+            self.take()
+            groups.append(self.parse_group())
+        if self.peek():
+            raise ValueError(f"Unexpected '{self.peek()[1]}' in expression")
+        return groups
+
+    def parse_group(self) -> List[Comparison]:
+        comparisons = [self.parse_comparison()]
+        while self.peek() and self.peek()[1].lower() == "and":
+            self.take()
+            comparisons.append(self.parse_comparison())
+        return comparisons
+
+    def parse_comparison(self) -> Comparison:
+        left = self.parse_term()
+        token = self.peek()
+        if token and token[0] == "name" and token[1].lower() in CROSS_OPERATORS:
+            op = self.take()[1].lower()
+        else:
+            op = self.take("op")[1]
+        right = self.parse_term()
+        return Comparison(left, op, right)
+
+    def parse_term(self) -> Term:
+        kind, value = self.take()
+        if kind == "number":
+            return Term("number", "", value=float(value))
+        if kind != "name":
+            raise ValueError(f"Unexpected '{value}' in expression")
+
+        name = value.lower()
+        if name in PRICE_FIELDS and not (self.peek() and self.peek()[1] == "("):
+            return Term("field", name)
+
+        name = value.upper()
+        if name not in INDICATORS:
+            raise ValueError(f"Unknown field or indicator: {value}")
+        _, _, defaults, outputs = INDICATORS[name]
+
+        args: List[float] = []
+        if self.peek() and self.peek()[1] == "(":
+            self.take()
+            while self.peek() and self.peek()[1] != ")":
+                args.append(float(self.take("number")[1]))
+                if self.peek() and self.peek()[1] == ",":
+                    self.take()
+            self.take("punct", ")")
+
+        if len(args) > len(defaults):
+            raise ValueError(f"{name} takes at most {len(defaults)} arguments")
+        args = tuple(args) + tuple(defaults[len(args):])
+        if any(a <= 0 for a in args):
+            raise ValueError(f"{name} arguments must be positive")
+        # Periods (integer defaults) must be whole numbers; multipliers such as BBANDS' may not be
+        if any(isinstance(d, int) and not float(a).is_integer() for a, d in zip(args, defaults)):
+            raise ValueError(f"{name} periods must be whole numbers")
+
+        output = None
+        if outputs:
+            output = outputs[0]
+            if self.peek() and self.peek()[1] == ".":
+                self.take()
+                output = self.take("name")[1].lower()
+                if output not in outputs:
+                    raise ValueError(f"{name} has no output '{output}' (available: {', '.join(outputs)})")
+
+        return Term("indicator", name, args, output)
+
+
+def parse_expression(text: str) -> Expression:
+    """
+    Parse a condition expression
+
+    Comparisons are joined with 'and' / 'or' ('and' binds tighter). Terms are
+    numbers, price fields (open, high, low, close, adjusted_close, volume) or
+    indicators such as RSI(14), SMA(200), BBANDS(20,2).lower or MACD().signal.
+    Besides the usual comparison operators, 'crosses_above' and 'crosses_below'
+    are true on the bar where the left term crosses the right one.
+
+    Args:
+        text: Expression text, e.g. "RSI(14) < 30 and close > SMA(200)"
+
+    Returns:
+        Parsed expression
+
+    Raises:
+        ValueError: If the expression is invalid
+    """
+    if not text or not text.strip():
+        raise ValueError("Expression must not be empty")
+    return _Parser(text).parse_expression()
+
+
+def parse_term(text: str) -> Term:
+    """Parse a single term, e.g. "RSI(14)" or "close" """
+    parser = _Parser(text)
+    term = parser.parse_term()
+    if parser.peek():
+        raise ValueError(f"Unexpected '{parser.peek()[1]}' in term")
+    return term
+
+
+def expression_terms(expression: Expression) -> List[Term]:
+    """Get the distinct non-numeric terms of an expression, in order of appearance"""
+    terms: List[Term] = []
+    for group in expression:
+        for comparison in group:
+            for term in (comparison.left, comparison.right):
+                if term.kind != "number" and term not in terms:
+                    terms.append(term)
+    return terms
+
+
+def max_lookback(expression: Expression) -> int:
+    """Get the largest indicator period used in an expression"""
+    periods = [int(max(t.args)) for t in expression_terms(expression) if t.args]
+    return max(periods, default=1)
+
+
+def evaluate_term(df: pd.DataFrame, term: Term,
+                  memo: Optional[Dict[Term, np.ndarray]] = None) -> np.ndarray:
+    """
+    Evaluate a term over all bars of a DataFrame
+
+    Args:
+        df: OHLCV DataFrame indexed by date
+        term: Term to evaluate
+        memo: Optional cache of already evaluated terms
+
+    Returns:
+        Float array with one value per bar
+    """
+    if term.kind == "number":
+        return np.full(len(df), term.value)
+
+    if memo is not None and term in memo:
+        return memo[term]
+
+    if term.kind == "field":
+        if term.name not in df.columns:
+            raise ValueError(f"Field '{term.name}' not available")
+        result = df[term.name].to_numpy(dtype=float)
+    else:
+        fn, takes_frame, _, outputs = INDICATORS[term.name]
+        args = [int(a) if float(a).is_integer() else a for a in term.args]
+        value = fn(df if takes_frame else df["close"], *args)
+        if memo is not None and outputs:
+            for output in outputs:
+                memo[term._replace(output=output)] = value[output]
+        result = value[term.output] if outputs else value
+
+    if memo is not None:
+        memo[term] = result
+    return result
+
+
+def evaluate_expression(df: pd.DataFrame, expression: Expression,
+                        memo: Optional[Dict[Term, np.ndarray]] = None) -> np.ndarray:
+    """
+    Evaluate an expression over all bars of a DataFrame
+
+    Comparisons involving missing values (e.g. during an indicator warm-up
+    period) evaluate to False.
+
+    Returns:
+        Boolean array with one value per bar
+    """
+    memo = {} if memo is None else memo
+    result = np.zeros(len(df), dtype=bool)
+
+    for group in expression:
+        group_mask = np.ones(len(df), dtype=bool)
+        for comparison in group:
+            left = evaluate_term(df, comparison.left, memo)
+            right = evaluate_term(df, comparison.right, memo)
+            group_mask &= _compare(left, comparison.op, right)
+        result |= group_mask
+
+    return result
+
+
+def _compare(left: np.ndarray, op: str, right: np.ndarray) -> np.ndarray:
+    if op in CROSS_OPERATORS:
+        above = _compare(left, ">", right) if op == "crosses_above" else _compare(left, "<", right)
+        not_above_before = np.zeros(len(left), dtype=bool)
+        not_above_before[1:] = _compare(left[:-1], "<=" if op == "crosses_above" else ">=", right[:-1])
+        return above & not_above_before
+
+    with np.errstate(invalid="ignore"):
+        if op == "<":
+            return left < right
+        if op == "<=":
+            return left <= right
+        if op == ">":
+            return left > right
+        if op == ">=":
+            return left >= right
+        if op == "==":
+            return left == right
+        return (left != right) & ~np.isnan(left) & ~np.isnan(right)
+
+
+def term_values(df: pd.DataFrame, terms: List[Union[Term, str]],
+                memo: Optional[Dict[Term, np.ndarray]] = None) -> Dict[str, float]:
+    """Get the last value of each term, keyed by term text"""
+    values = {}
+    for term in terms:
+        term = parse_term(term) if isinstance(term, str) else term
+        value = evaluate_term(df, term, memo)[-1] if len(df) else np.nan
+        values[term.text] = None if np.isnan(value) else round(float(value), 4)
+    return values